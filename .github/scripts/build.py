@@ -1,6 +1,6 @@
 # /// script
 # requires-python = ">=3.12"
-# dependencies = []
+# dependencies = ["pillow"]
 # ///
 
 """
@@ -10,12 +10,44 @@ Builds both stable and beta versions from main branch.
 URLs:
 - steakwhistletv.github.io/penance_hunter/ -> stable (penance_hunter.py)
 - steakwhistletv.github.io/penance_hunter/beta/ -> beta (penance_hunter_v2.py)
+
+Both notebooks share one asset root, steakwhistletv.github.io/penance_hunter/public/,
+which holds the sample export, penance_core.zip and the achievement icon atlases.
 """
 
+import json
+import math
+import os
+import re
 import subprocess
 import shutil
+import urllib.request
+import zipfile
 from pathlib import Path
 
+from PIL import Image
+
+# Achievement icon atlases: ICON_CELL px tiles, ATLAS_COLUMNS x ATLAS_COLUMNS per sheet,
+# so a tracked list only pulls the few sheets its icons live on
+ICON_CELL = 128
+ATLAS_COLUMNS = 8
+
+# Pyodide release the exported apps load packages from (marimo's bundled default)
+PYODIDE_VERSION = os.environ.get("PYODIDE_VERSION", "v314.0.0")
+PYODIDE_CDN = f"https://cdn.jsdelivr.net/pyodide/{PYODIDE_VERSION}/full/"
+
+# What the browser fetches before the first cell renders (marimo's own boot set) vs what the
+# notebooks install on demand from their first data/chart cells
+STARTUP_PACKAGES = ["micropip", "msgspec", "markdown", "pymdown-extensions", "narwhals", "packaging"]
+DEFERRED_PACKAGES = ["numpy", "pandas", "pyarrow", "altair"]
+
+# Per-package budget: download size (KB) and CPython import time (ms, a proxy for init in Pyodide).
+# The report fetches from the Pyodide CDN/PyPI and times imports with uv, so it only runs when
+# BUDGET_REPORT is set (the deploy workflow does)
+BUDGET_KB = 6000
+BUDGET_IMPORT_MS = 1500
+BUDGET_REPORT = os.environ.get("BUDGET_REPORT", "").strip().lower() not in ("", "0", "false", "no")
+
 def export_notebook(notebook_path: Path, output_file: Path):
     """Export a marimo notebook to HTML-WASM."""
     output_file.parent.mkdir(parents=True, exist_ok=True)
@@ -32,6 +64,142 @@ def export_notebook(notebook_path: Path, output_file: Path):
     print(f"Running: {' '.join(cmd)}")
     subprocess.run(cmd, check=True)
 
+def pack_core(core_dir: Path, output_file: Path):
+    """Zip the shared penance_core package so the WASM notebooks can import it."""
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    with zipfile.ZipFile(output_file, "w", zipfile.ZIP_DEFLATED) as zf:
+        for path in sorted(core_dir.rglob("*.py")):
+            zf.write(path, path.relative_to(core_dir.parent))
+    print(f"Packed {core_dir} -> {output_file}")
+
+def pack_icons(icon_dir: Path, output_dir: Path):
+    """Pack the achievement PNGs into AVIF + WebP sprite atlases with a JSON index.
+
+    The index maps each icon name (the last segment of the export's Icon path,
+    e.g. achievement_icon_0124) to [sheet, column, row] - see penance_core.icons.
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    icons = sorted(icon_dir.glob("*.png"))
+    per_sheet = ATLAS_COLUMNS * ATLAS_COLUMNS
+    index = {"cell": ICON_CELL, "columns": ATLAS_COLUMNS, "sheets": [], "icons": {}}
+
+    for sheet, start in enumerate(range(0, len(icons), per_sheet)):
+        chunk = icons[start:start + per_sheet]
+        rows = math.ceil(len(chunk) / ATLAS_COLUMNS)
+        atlas = Image.new("RGBA", (ATLAS_COLUMNS * ICON_CELL, rows * ICON_CELL))
+        for i, path in enumerate(chunk):
+            col, row = i % ATLAS_COLUMNS, i // ATLAS_COLUMNS
+            with Image.open(path) as icon:
+                icon = icon.convert("RGBA")
+                icon.thumbnail((ICON_CELL, ICON_CELL), Image.LANCZOS)
+                atlas.paste(icon, (col * ICON_CELL + (ICON_CELL - icon.width) // 2,
+                                   row * ICON_CELL + (ICON_CELL - icon.height) // 2))
+            index["icons"][path.stem] = [sheet, col, row]
+
+        name = f"achievements_{sheet:02d}"
+        atlas.save(output_dir / f"{name}.avif", "AVIF", quality=60)
+        atlas.save(output_dir / f"{name}.webp", "WEBP", quality=80, method=4)
+        index["sheets"].append({"avif": f"{name}.avif", "webp": f"{name}.webp", "width": atlas.width, "height": atlas.height})
+
+    (output_dir / "achievements.json").write_text(json.dumps(index, separators=(",", ":")), encoding="utf-8")
+    print(f"Packed {len(icons)} icons from {icon_dir} into {len(index['sheets'])} atlas(es) in {output_dir}")
+
+def _fetch(url: str, method: str = "GET"):
+    request = urllib.request.Request(url, method=method, headers={"User-Agent": "penance-hunter-build"})
+    return urllib.request.urlopen(request, timeout=30)
+
+def _download_kb(name: str, lock: dict) -> float | None:
+    """Wheel size from the Pyodide CDN, or PyPI for pure-Python packages micropip pulls from there."""
+    entry = lock["packages"].get(name)
+    if entry is not None:
+        with _fetch(PYODIDE_CDN + entry["file_name"], method="HEAD") as resp:
+            length = resp.headers.get("Content-Length")
+        return int(length) / 1024 if length else None
+    with _fetch(f"https://pypi.org/pypi/{name}/json") as resp:
+        files = json.load(resp).get("urls") or []
+    wheels = [f for f in files if f.get("filename", "").endswith("-none-any.whl") and f.get("size")]
+    return wheels[0]["size"] / 1024 if wheels else None
+
+def _import_ms(package: str) -> float | None:
+    """Cumulative `python -X importtime` of a package in a throwaway uv environment."""
+    module = package.replace("-", "_")
+    result = subprocess.run(
+        ["uv", "run", "--no-project", "--quiet", "--with", package, "python", "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, timeout=600,
+    )
+    for line in result.stderr.splitlines():
+        match = re.match(r"import time:\s+\d+\s+\|\s+(\d+)\s+\|\s+(\S+)$", line)
+        if match and match.group(2) == module:
+            return int(match.group(1)) / 1000
+    return None
+
+def _closure(names: list[str], lock: dict) -> list[str]:
+    seen = []
+    stack = list(reversed(names))
+    while stack:
+        name = stack.pop()
+        if name in seen:
+            continue
+        seen.append(name)
+        stack.extend(reversed(lock["packages"].get(name, {}).get("depends", [])))
+    return seen
+
+def report_budget(output_file: Path):
+    """Per-package download/initialization budget for the WASM apps, printed and written as JSON."""
+    try:
+        with _fetch(PYODIDE_CDN + "pyodide-lock.json") as resp:
+            lock = json.load(resp)
+    except (OSError, ValueError) as e:
+        print(f"Budget report skipped: cannot fetch the Pyodide lock file ({e!r})")
+        return
+    if not isinstance(lock.get("packages"), dict):
+        print("Budget report skipped: the Pyodide lock file has no package list")
+        return
+    has_uv = shutil.which("uv") is not None
+    if not has_uv:
+        print("Budget report: uv not found, import times skipped")
+
+    # A package whose size or import time can't be measured is reported as unknown,
+    # it never fails the build
+    rows = []
+    startup = _closure(STARTUP_PACKAGES, lock)
+    deferred = [name for name in _closure(DEFERRED_PACKAGES, lock) if name not in startup]
+    for phase, names in (("startup", startup), ("deferred", deferred)):
+        for name in names:
+            try:
+                kb = _download_kb(name, lock)
+            except (OSError, ValueError, KeyError, TypeError, IndexError) as e:
+                print(f"Budget report: no download size for {name} ({e!r})")
+                kb = None
+            import_ms = None
+            if has_uv and name in DEFERRED_PACKAGES:
+                try:
+                    import_ms = _import_ms(name)
+                except (OSError, subprocess.SubprocessError) as e:
+                    print(f"Budget report: no import time for {name} ({e!r})")
+            over = (kb or 0) > BUDGET_KB or (import_ms or 0) > BUDGET_IMPORT_MS
+            rows.append({"package": name, "phase": phase, "download_kb": kb, "import_ms": import_ms, "over_budget": over})
+
+    totals = {
+        phase: round(sum(r["download_kb"] or 0 for r in rows if r["phase"] == phase), 1)
+        for phase in ("startup", "deferred")
+    }
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    output_file.write_text(json.dumps({
+        "pyodide": PYODIDE_VERSION,
+        "budget": {"download_kb": BUDGET_KB, "import_ms": BUDGET_IMPORT_MS},
+        "total_kb": totals,
+        "packages": rows,
+    }, indent=2), encoding="utf-8")
+
+    print(f"{'package':<24}{'phase':<10}{'download KB':>12}{'import ms':>11}")
+    for r in rows:
+        kb = f"{r['download_kb']:.0f}" if r["download_kb"] is not None else "?"
+        ms = f"{r['import_ms']:.0f}" if r["import_ms"] is not None else "-"
+        print(f"{r['package']:<24}{r['phase']:<10}{kb:>12}{ms:>11}{'  OVER BUDGET' if r['over_budget'] else ''}")
+    print(f"Before first render: {totals['startup']:.0f} KB; installed on demand: {totals['deferred']:.0f} KB")
+    print(f"Budget report written to {output_file}")
+
 def main():
     output_dir = Path("_site")
     output_dir.mkdir(parents=True, exist_ok=True)
@@ -48,12 +216,24 @@ def main():
     beta_output = output_dir / "beta" / "penance_hunter.html"
     export_notebook(beta_notebook, beta_output)
 
-    # Copy public assets to both locations
+    # One shared asset root for both apps - drop the per-app copies marimo export makes
+    for app_dir in ("apps", "beta"):
+        shutil.rmtree(output_dir / app_dir / "public", ignore_errors=True)
+    shared_public = output_dir / "public"
     public_dir = Path("apps/public")
     if public_dir.exists():
-        shutil.copytree(public_dir, output_dir / "apps" / "public", dirs_exist_ok=True)
-        shutil.copytree(public_dir, output_dir / "beta" / "public", dirs_exist_ok=True)
-        print(f"Copied apps/public/ to _site/apps/public/ and _site/beta/public/")
+        # The per-icon PNGs stay alongside the atlases below: they're only fetched when an
+        # atlas or achievements.json fails to load and the notebooks fall back to <img> paths
+        shutil.copytree(public_dir, shared_public, dirs_exist_ok=True)
+        print(f"Copied apps/public/ to {shared_public}/")
+        pack_icons(public_dir / "icons" / "achievements", shared_public / "icons" / "atlas")
+
+    # Ship penance_core next to the public assets (imported from a zip in WASM)
+    pack_core(Path("apps/penance_core"), shared_public / "penance_core.zip")
+
+    # Download/initialization budget of the WASM apps (opt-in, see BUDGET_REPORT)
+    if BUDGET_REPORT:
+        report_budget(output_dir / "budget.json")
 
     # Create root index with app cards
     index_html = output_dir / "index.html"
@@ -75,7 +255,7 @@ def main():
       margin: 0;
       padding: 0;
       min-height: 100vh;
-      background: url('apps/public/penances_background.png') center center / cover no-repeat fixed;
+      background: url('public/penances_background.png') center center / cover no-repeat fixed;
     }
     body::before {
       content: '';
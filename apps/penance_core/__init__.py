@@ -0,0 +1,168 @@
+"""
+Shared data logic for the penance_hunter notebooks.
+
+Both `penance_hunter.py` and `penance_hunter_beta.py` import this package so
+reactive re-runs reuse the same vectorized code instead of per-row applies.
+"""
+
+from .cache import (
+    CACHE_MAX_BYTES,
+    ExportCache,
+    default_cache_dir,
+    mount_browser_storage,
+    persist_browser_storage,
+)
+from .cards import TRACKED_CARD_CSS, TRACKED_PAGE_SIZE, TrackedCards, card_status
+from .classification import (
+    CATEGORIES,
+    CATEGORY_MAP,
+    CLASS_CATEGORIES,
+    CLASS_MAPPING,
+    CLASSES,
+    EXPLORATION_REGEX,
+    EXPLORATION_TERMS,
+    classify,
+    penance_category,
+    penance_class,
+)
+from .diff import DIFF_HEADER_FIELDS, ExportDiff, diff_characters, diff_exports
+from .display import progress_bar, progress_text
+from .export import (
+    ACCOUNT_ID_RE,
+    EXPORT_FILENAME_RE,
+    CharacterInfo,
+    ExportFile,
+    ExportKey,
+    ExportMetadata,
+    check_account_id,
+    export_file,
+    export_key,
+    parse_export_filename,
+    parse_header,
+    read_export,
+    read_export_table,
+    read_metadata,
+    split_export,
+)
+from .filters import FILTER_COLUMNS, FilterIndex
+from .forecast import ETA_COLUMNS, forecast_eta
+from .history import EXPORT_COLUMNS, ROW_COLUMNS, HistoryStore, default_history_dir
+from .icons import ATLAS_INDEX, FALLBACK_ICON, IconAtlas, icon_name
+from .leaderboard import LEADERBOARD_COLUMNS, latest_exports, leaderboard, leaderboard_table, penance_rarity
+from .lookup import PenanceIndex
+from .mastery import MASTERY_COLUMNS, MASTERY_MAX_LEVEL, RATE_COLUMNS, mastery_rates, mastery_table
+from .profiling import PROFILE_COLUMNS, PROFILE_MAX_RECORDS, CellProfiler, CellRun
+from .rarity import RarityIndex, default_rarity_dir
+from .search import PREFIX_WEIGHT, SEARCH_COLUMNS, SearchIndex, tokenize
+from .stats import STAT_PATTERN, STATS_COLUMNS, WEAKEST_COLUMNS, stats_table, weakest_stats
+from .stream import EXPORT_BATCH_BYTES, ExportPart, export_parts, iter_exports
+from .summary import SUMMARY_GROUPS, SummaryAccumulator, category_summary, class_summary, export_summary, group_masks
+from .schema import CSV_COLUMNS, EXPORT_SCHEMA, SCHEMA_VERSION, read_batches, read_table
+from .timeline import CHART_COLUMNS, CHART_MAX_POINTS, COUNT_COLUMN, TIMELINE_COLUMNS, Timeline, chart_points, lttb
+from .views import VIEW_MEMORY_COLUMNS, ExportViews, memory_table
+
+__all__ = [
+    "ACCOUNT_ID_RE",
+    "ATLAS_INDEX",
+    "CACHE_MAX_BYTES",
+    "CATEGORIES",
+    "CATEGORY_MAP",
+    "CHART_COLUMNS",
+    "CHART_MAX_POINTS",
+    "CLASSES",
+    "CLASS_CATEGORIES",
+    "CLASS_MAPPING",
+    "COUNT_COLUMN",
+    "CSV_COLUMNS",
+    "DIFF_HEADER_FIELDS",
+    "ETA_COLUMNS",
+    "EXPLORATION_REGEX",
+    "EXPLORATION_TERMS",
+    "EXPORT_BATCH_BYTES",
+    "EXPORT_COLUMNS",
+    "EXPORT_FILENAME_RE",
+    "EXPORT_SCHEMA",
+    "FALLBACK_ICON",
+    "FILTER_COLUMNS",
+    "LEADERBOARD_COLUMNS",
+    "MASTERY_COLUMNS",
+    "MASTERY_MAX_LEVEL",
+    "PREFIX_WEIGHT",
+    "PROFILE_COLUMNS",
+    "PROFILE_MAX_RECORDS",
+    "RATE_COLUMNS",
+    "ROW_COLUMNS",
+    "SCHEMA_VERSION",
+    "SEARCH_COLUMNS",
+    "STATS_COLUMNS",
+    "STAT_PATTERN",
+    "SUMMARY_GROUPS",
+    "TIMELINE_COLUMNS",
+    "TRACKED_CARD_CSS",
+    "TRACKED_PAGE_SIZE",
+    "VIEW_MEMORY_COLUMNS",
+    "WEAKEST_COLUMNS",
+    "CellProfiler",
+    "CellRun",
+    "CharacterInfo",
+    "ExportCache",
+    "ExportDiff",
+    "ExportFile",
+    "ExportKey",
+    "ExportMetadata",
+    "ExportPart",
+    "ExportViews",
+    "FilterIndex",
+    "HistoryStore",
+    "IconAtlas",
+    "PenanceIndex",
+    "RarityIndex",
+    "SearchIndex",
+    "SummaryAccumulator",
+    "Timeline",
+    "TrackedCards",
+    "card_status",
+    "category_summary",
+    "chart_points",
+    "check_account_id",
+    "class_summary",
+    "classify",
+    "default_cache_dir",
+    "default_history_dir",
+    "default_rarity_dir",
+    "diff_characters",
+    "diff_exports",
+    "export_file",
+    "export_key",
+    "export_parts",
+    "export_summary",
+    "forecast_eta",
+    "group_masks",
+    "icon_name",
+    "iter_exports",
+    "latest_exports",
+    "leaderboard",
+    "leaderboard_table",
+    "lttb",
+    "mastery_rates",
+    "mastery_table",
+    "memory_table",
+    "mount_browser_storage",
+    "parse_export_filename",
+    "parse_header",
+    "penance_category",
+    "penance_class",
+    "penance_rarity",
+    "persist_browser_storage",
+    "progress_bar",
+    "progress_text",
+    "read_batches",
+    "read_export",
+    "read_export_table",
+    "read_metadata",
+    "read_table",
+    "split_export",
+    "stats_table",
+    "tokenize",
+    "weakest_stats",
+]
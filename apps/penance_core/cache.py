@@ -0,0 +1,198 @@
+"""
+Persistent, size-bounded cache of parsed exports, so a revisit restores the
+last viewed export (and its tracked list) without downloading or parsing a
+CSV again.
+
+Each export is stored as an Arrow IPC file of its typed EXPORT_SCHEMA table,
+with the header metadata in the schema metadata, keyed by Account ID +
+export timestamp. When the files exceed the size budget, the least recently
+viewed exports are evicted first. Tracked Achievement_IDs are kept per
+account in the index.
+
+In the WASM build the cache directory is an IDBFS mount, i.e. backed by the
+browser's IndexedDB: `mount_browser_storage` loads it on startup and
+`persist_browser_storage` flushes writes back.
+
+Layout:
+    <root>/index.json                     entries (LRU order) + tracked IDs per account
+    <root>/<account_id>_<stamp>.arrow     one parsed export
+"""
+
+import json
+import os
+import sys
+from pathlib import Path
+
+import pyarrow as pa
+
+from .export import ACCOUNT_ID_RE, ExportKey, ExportMetadata, check_account_id
+
+CACHE_VERSION = 1
+CACHE_MAX_BYTES = 64 * 2**20
+
+INDEX = 'index.json'
+META_KEY = b'penance_hunter.metadata'
+SOURCE_KEY = b'penance_hunter.source'
+
+_MOUNTED = set()
+
+
+def default_cache_dir() -> Path:
+    """Where the notebooks cache parsed exports: an IndexedDB-backed mount under WASM, ~/.penance_hunter otherwise."""
+    if "pyodide" in sys.modules:
+        return Path("/penance_hunter/cache")
+    return Path(os.environ.get("PENANCE_HUNTER_CACHE", Path.home() / ".penance_hunter" / "cache"))
+
+
+def _syncfs(populate: bool):
+    """Run FS.syncfs between the IDBFS mounts and IndexedDB; returns a future for its completion."""
+    import asyncio
+
+    import pyodide_js
+    from pyodide.ffi import create_once_callable
+
+    done = asyncio.get_event_loop().create_future()
+
+    def finished(err=None):
+        if not done.done():
+            done.set_exception(OSError(f"IndexedDB sync failed: {err}")) if err else done.set_result(None)
+
+    pyodide_js.FS.syncfs(populate, create_once_callable(finished))
+    return done
+
+
+async def mount_browser_storage(path) -> bool:
+    """Mount IDBFS at `path` and load what earlier visits persisted. No-op (False) outside Pyodide."""
+    if "pyodide" not in sys.modules:
+        return False
+    path = str(path)
+    if path not in _MOUNTED:
+        import pyodide_js
+        from js import Object
+
+        pyodide_js.FS.mkdirTree(path)
+        pyodide_js.FS.mount(pyodide_js.FS.filesystems.IDBFS, Object.new(), path)
+        _MOUNTED.add(path)
+    await _syncfs(True)
+    return True
+
+
+def persist_browser_storage():
+    """Start flushing IDBFS mounts to IndexedDB (fire and forget). No-op outside Pyodide."""
+    if "pyodide" in sys.modules:
+        return _syncfs(False)
+    return None
+
+
+class ExportCache:
+    """Parsed exports as Arrow IPC files, least recently viewed evicted past `max_bytes`."""
+
+    def __init__(self, root, max_bytes: int = CACHE_MAX_BYTES):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        index = self.root / INDEX
+        try:
+            self.index = json.loads(index.read_text(encoding="utf-8")) if index.exists() else {}
+        except (OSError, ValueError):
+            self.index = {}
+        if self.index.get('version') != CACHE_VERSION:
+            self.index = {'version': CACHE_VERSION, 'entries': {}, 'tracked': {}}
+
+    @staticmethod
+    def _name(key: ExportKey) -> str:
+        return f"{check_account_id(key.account_id)}_{key.stamp}"
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(e['bytes'] for e in self.index['entries'].values())
+
+    def __contains__(self, key: ExportKey) -> bool:
+        # An ID that isn't a safe file name can't have been stored
+        return key is not None and bool(ACCOUNT_ID_RE.match(key.account_id)) and self._name(key) in self.index['entries']
+
+    def __len__(self) -> int:
+        return len(self.index['entries'])
+
+    def _touch(self, name: str):
+        # Entries are kept in LRU order: most recently viewed last
+        self.index['entries'][name] = self.index['entries'].pop(name)
+
+    def last(self) -> ExportKey | None:
+        """Most recently viewed export."""
+        if not self.index['entries']:
+            return None
+        entry = next(reversed(self.index['entries'].values()))
+        return ExportKey(entry['account_id'], entry['stamp'])
+
+    def get(self, key: ExportKey | None) -> tuple[ExportMetadata, pa.Table, str] | None:
+        """(metadata, table, source filename) of a cached export, marking it most recently viewed."""
+        if key not in self:
+            return None
+        name = self._name(key)
+        entry = self.index['entries'][name]
+        try:
+            # Memory-mapped locally, so a restore doesn't copy the columns; MEMFS/IDBFS files are read
+            path = str(self.root / entry['file'])
+            table = pa.ipc.open_file(pa.OSFile(path) if "pyodide" in sys.modules else pa.memory_map(path)).read_all()
+        except (OSError, pa.ArrowInvalid):
+            del self.index['entries'][name]
+            self._save()
+            return None
+        metadata = table.schema.metadata or {}
+        meta = ExportMetadata.from_dict(json.loads(metadata.get(META_KEY, b'{}')))
+        source_name = metadata.get(SOURCE_KEY, b'').decode('utf-8') or f"{name}.csv"
+        self._touch(name)
+        self._save()
+        return meta, table.replace_schema_metadata(None), source_name
+
+    def put(self, key: ExportKey, meta: ExportMetadata, table: pa.Table, source=None):
+        """Store a parsed export as the most recently viewed, evicting old ones past the size budget."""
+        name = self._name(key)
+        self.root.mkdir(parents=True, exist_ok=True)
+        schema = table.schema.with_metadata({
+            META_KEY: json.dumps(meta.to_dict()).encode('utf-8'),
+            SOURCE_KEY: Path(str(source or f"{name}.csv")).name.encode('utf-8'),
+        })
+        path = self.root / f"{name}.arrow"
+        tmp = path.with_suffix('.arrow.tmp')
+        with pa.OSFile(str(tmp), 'wb') as sink, pa.ipc.new_file(sink, schema) as writer:
+            # The IPC file format takes one dictionary per column, shared by every chunk
+            writer.write_table(table.unify_dictionaries().replace_schema_metadata(schema.metadata))
+        os.replace(tmp, path)
+        self.index['entries'].pop(name, None)
+        self.index['entries'][name] = {
+            'account_id': key.account_id,
+            'stamp': key.stamp,
+            'file': path.name,
+            'bytes': path.stat().st_size,
+        }
+        self._evict(keep=name)
+        self._save()
+
+    def _evict(self, keep: str):
+        entries = self.index['entries']
+        while self.total_bytes > self.max_bytes and len(entries) > 1:
+            name = next(n for n in entries if n != keep)
+            (self.root / entries.pop(name)['file']).unlink(missing_ok=True)
+
+    def tracked(self, account_id: str | None) -> list[str]:
+        """Tracked Achievement_IDs saved for an account."""
+        return list(self.index['tracked'].get(account_id, [])) if account_id else []
+
+    def set_tracked(self, account_id: str | None, ids: list[str]) -> bool:
+        """Save an account's tracked Achievement_IDs; returns whether anything changed."""
+        ids = list(ids)
+        if not account_id or self.index['tracked'].get(account_id, []) == ids:
+            return False
+        if ids:
+            self.index['tracked'][account_id] = ids
+        else:
+            self.index['tracked'].pop(account_id, None)
+        self._save()
+        return True
+
+    def _save(self):
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = self.root / f"{INDEX}.tmp"
+        tmp.write_text(json.dumps(self.index, indent=2), encoding="utf-8")
+        os.replace(tmp, self.root / INDEX)
@@ -0,0 +1,101 @@
+"""
+Tracked-penance cards, rendered once per Achievement_ID and shown a page at
+a time.
+
+Every card uses the classes of one shared stylesheet (TRACKED_CARD_CSS)
+instead of its own inline CSS; only the bar width and colour vary per card.
+TrackedCards keeps each card's markup keyed by Achievement_ID together with
+the values it was drawn from, so a re-run rebuilds only the cards that were
+added or whose progress/ETA changed, and only the visible page is shipped.
+"""
+
+import html
+import math
+
+TRACKED_PAGE_SIZE = 25
+
+TRACKED_CARD_CSS = """<style>
+.ph-tracked { display: flex; flex-direction: column; gap: 8px; }
+.ph-card {
+    display: flex; align-items: center; gap: 12px; padding: 12px;
+    border: 1px solid var(--border-color, #333); border-radius: 8px;
+    background: linear-gradient(135deg, rgba(0,0,0,0.6) 0%, rgba(20,20,20,0.8) 100%);
+    content-visibility: auto; contain-intrinsic-size: auto 90px;
+}
+.ph-card-body { flex: 1; min-width: 0; }
+.ph-card-title { font-weight: bold; margin-bottom: 4px; }
+.ph-card-desc {
+    font-size: 0.8rem; color: var(--text-muted, #888); margin-bottom: 8px;
+    white-space: nowrap; overflow: hidden; text-overflow: ellipsis;
+}
+.ph-card-progress { display: flex; align-items: center; gap: 8px; }
+.ph-card-track { flex: 1; height: 8px; background: #333; border-radius: 4px; overflow: hidden; }
+.ph-card-bar { height: 100%; transition: width 0.3s; }
+.ph-card-status { font-size: 0.75rem; color: var(--text-muted, #888); min-width: 60px; text-align: right; }
+</style>"""
+
+# Bar colours: completed, at least half way, below half
+_COLORS = ("#22c55e", "#f97316", "#ef4444")
+
+
+def card_status(progress, goal, eta_days=None) -> tuple[float, str, str]:
+    """(percent, bar colour, status text) of one tracked penance."""
+    pct = min((progress / goal) * 100, 100) if goal > 0 else 0
+    if pct >= 100:
+        return pct, _COLORS[0], "Completed"
+    text = f"{progress}/{goal}"
+    if eta_days is not None and eta_days == eta_days:
+        text += f" · ETA {eta_days:.0f}d" if eta_days >= 1 else " · ETA <1d"
+    return pct, _COLORS[1] if pct >= 50 else _COLORS[2], text
+
+
+class TrackedCards:
+    """Card markup per tracked Achievement_ID, reused until the penance changes."""
+
+    def __init__(self, icon_atlas, page_size: int = TRACKED_PAGE_SIZE):
+        self.icon_atlas = icon_atlas
+        self.page_size = page_size
+        self._cards = {}  # Achievement_ID -> (values the card was drawn from, markup)
+        self.built = 0  # cards (re)built by the last render
+
+    def pages(self, count: int) -> int:
+        """Pages needed for `count` cards (at least one)."""
+        return max(1, math.ceil(count / self.page_size))
+
+    def card(self, penance: dict, eta_days=None) -> str:
+        """Markup of one card, built only if this penance is new or its values changed."""
+        title = penance.get('Title', 'Unknown')
+        pct, color, status = card_status(penance.get('Progress', 0), penance.get('Goal', 1), eta_days)
+        values = (str(title), str(penance.get('Icon', '')), str(penance.get('Description', '')), f"{pct:g}", status)
+        cached = self._cards.get(penance.get('Achievement_ID'))
+        if cached is not None and cached[0] == values:
+            return cached[1]
+
+        # Sprite from the icon atlas (lazy <img> when running without one); NaN/missing
+        # icons get the fallback icon
+        icon_html = self.icon_atlas.html(penance.get('Icon', ''), size=64, title=title)
+        markup = (
+            f'<div class="ph-card">{icon_html}<div class="ph-card-body">'
+            f'<div class="ph-card-title">{html.escape(values[0])}</div>'
+            f'<div class="ph-card-desc">{html.escape(values[2])}</div>'
+            f'<div class="ph-card-progress"><div class="ph-card-track">'
+            f'<div class="ph-card-bar" style="width: {pct:g}%; background: {color};"></div></div>'
+            f'<div class="ph-card-status">{status}</div></div></div></div>'
+        )
+        self._cards[penance.get('Achievement_ID')] = (values, markup)
+        self.built += 1
+        return markup
+
+    def render(self, penances: list[dict], eta_by_id=None, page: int = 1) -> str:
+        """Stylesheet + the cards of `page` (1-based, clamped to the last page)."""
+        self.built = 0
+        tracked = {p.get('Achievement_ID') for p in penances}
+        for aid in [aid for aid in self._cards if aid not in tracked]:
+            del self._cards[aid]
+        page = min(max(int(page), 1), self.pages(len(penances)))
+        visible = penances[(page - 1) * self.page_size:page * self.page_size]
+        cards = [
+            self.card(p, eta_by_id.get(p.get('Achievement_ID')) if eta_by_id is not None else None)
+            for p in visible
+        ]
+        return f'{TRACKED_CARD_CSS}<div class="ph-tracked">{"".join(cards)}</div>'
@@ -0,0 +1,95 @@
+"""
+Vectorized Penance_Class / Penance_Category derivation for penance exports.
+
+Replaces the per-row `_extract_class` / `_map_category` helpers that the
+notebooks used to run through `DataFrame.apply`.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Substrings in Achievement_ID -> display class. Order matters: the first
+# matching key wins, same as the old dict-iteration lookup.
+CLASS_MAPPING = {
+    'veteran': 'Veteran',
+    'zealot': 'Zealot',
+    'zelot': 'Zealot',
+    'psyker': 'Psyker',
+    'ogryn': 'Ogryn',
+    'adamant': 'Arbitrator',
+    'broker': 'Hive Scum',
+}
+
+# Only these categories are treated as class penances
+CLASS_CATEGORIES = ['loc_class_abilities_title', 'loc_class_progression_title']
+
+# Raw Category -> friendly category name
+CATEGORY_MAP = {
+    'loc_achievement_category_account_label': 'Account',
+    'loc_class_abilities_title': 'Class',
+    'loc_class_progression_title': 'Class',
+    'loc_achievement_category_offensive_label': 'Tactical',
+    'loc_achievement_category_defensive_label': 'Tactical',
+    'loc_achievement_category_teamplay_label': 'Tactical',
+    'loc_achievement_category_heretics_label': 'Heretical',
+    'loc_achievement_subcategory_missions_general_label': 'Missions - General',
+    'loc_achievement_subcategory_missions_auric_label': 'Missions - General',
+    'loc_achievement_subcategory_missions_havoc_label': 'Missions - Havoc',
+    'loc_achievement_subcategory_missions_survival_label': 'Missions - General',
+    'loc_achievement_subcategory_twins_mission_label': 'Exploration',
+    'loc_weapon_progression_mastery': 'Weapons',
+    'loc_achievement_category_weapons_label': 'Weapons',
+}
+
+# Exploration detection via Achievement_ID patterns
+EXPLORATION_TERMS = ['group_mission_zone_wide', 'collectible', 'destructible', 'mission_zone_',
+                     'mission_scavenge_samples', 'mission_propaganda_fan_kills', 'mission_raid_bottles']
+EXPLORATION_REGEX = '|'.join(EXPLORATION_TERMS)
+
+CLASSES = ['General', 'Arbitrator', 'Hive Scum', 'Ogryn', 'Psyker', 'Veteran', 'Zealot']
+CATEGORIES = ['Account', 'Class', 'Tactical', 'Heretical', 'Missions - General', 'Missions - Havoc',
+              'Exploration', 'Endeavours', 'Weapons']
+
+CLASS_DTYPE = pd.CategoricalDtype(CLASSES)
+CATEGORY_DTYPE = pd.CategoricalDtype(CATEGORIES)
+
+
+def _lower_ids(df: pd.DataFrame) -> pd.Series:
+    # pyarrow-backed strings keep the substring scans below in native code
+    return df['Achievement_ID'].astype('string[pyarrow]').str.lower()
+
+
+def penance_class(df: pd.DataFrame, class_categories_only: bool = True, ids: pd.Series | None = None) -> pd.Categorical:
+    """Derive Penance_Class for every row in one pass.
+
+    With `class_categories_only` (beta behaviour) only class ability/progression
+    penances get a class; everything else is 'General'.
+    """
+    ids = _lower_ids(df) if ids is None else ids
+    conditions = [ids.str.contains(key, regex=False).fillna(False).to_numpy(dtype=bool) for key in CLASS_MAPPING]
+    result = np.select(conditions, list(CLASS_MAPPING.values()), default='General')
+    if class_categories_only:
+        is_class = df['Category'].isin(CLASS_CATEGORIES).to_numpy()
+        result = np.where(is_class, result, 'General')
+    return pd.Categorical(result, dtype=CLASS_DTYPE)
+
+
+def penance_category(df: pd.DataFrame, ids: pd.Series | None = None) -> pd.Categorical:
+    """Map raw Category to the friendly Penance_Category for every row in one pass."""
+    ids = _lower_ids(df) if ids is None else ids
+    mapped = df['Category'].map(CATEGORY_MAP)
+    exploration = ids.str.contains(EXPLORATION_REGEX).fillna(False).to_numpy(dtype=bool)
+    result = np.select(
+        [mapped.notna().to_numpy(), exploration],
+        [mapped.to_numpy(dtype=object), 'Exploration'],
+        default='Endeavours',
+    )
+    return pd.Categorical(result, dtype=CATEGORY_DTYPE)
+
+
+def classify(df: pd.DataFrame, class_categories_only: bool = True) -> pd.DataFrame:
+    """Add categorical Penance_Class and Penance_Category columns to `df` (in place) and return it."""
+    ids = _lower_ids(df)
+    df['Penance_Class'] = penance_class(df, class_categories_only=class_categories_only, ids=ids)
+    df['Penance_Category'] = penance_category(df, ids=ids)
+    return df
@@ -0,0 +1,163 @@
+"""
+Headless batch processing of penance exports: `penance-hunter <dir>`.
+
+Runs the same read/classify/summary code as the notebooks over every
+`<account_id>_<YYYYMMDD>_<HHMMSS>.csv` in a directory, in a process pool,
+and writes:
+
+    <out>/accounts/<account_id>.json   latest summary + per-export history
+    <out>/exports.parquet              one row per export
+    <out>/accounts.parquet             one row per account (latest export)
+
+Files are streamed in bounded record batches, so their size doesn't matter,
+and a file may hold several exports concatenated one after another.
+"""
+
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+
+from .classification import classify
+from .export import EXPORT_FILENAME_RE
+from .history import HistoryStore
+from .rarity import RarityIndex
+from .stream import export_parts, iter_exports
+from .summary import SummaryAccumulator
+
+# Per-export fields kept in the account history timeline
+HISTORY_FIELDS = ['stamp', 'export_date', 'completed', 'total', 'completion_pct', 'score',
+                  'account_level', 'account_true_level', 'account_prestige']
+
+
+def find_exports(directory: Path) -> list[Path]:
+    """Export CSVs in `directory`, oldest first."""
+    paths = [p for p in directory.glob("*.csv") if EXPORT_FILENAME_RE.match(p.name)]
+    return sorted(paths, key=lambda p: EXPORT_FILENAME_RE.match(p.name).group('date', 'time'))
+
+
+def summarize_file(path: Path) -> list[dict]:
+    """Stream, classify and summarize every export in one file. Runs in a worker process."""
+    summaries = []
+    try:
+        with open(path, 'rb') as f:
+            for part in iter_exports(f):
+                summary = SummaryAccumulator()
+                for batch in part.batches:
+                    df = batch.to_pandas()
+                    classify(df)
+                    summary.add(df)
+                summaries.append(summary.summary(part.meta, part.key(path.name)) | {'source': path.name})
+    except Exception as e:  # one bad file shouldn't sink the batch
+        summaries.append({'source': path.name, 'error': f"{type(e).__name__}: {e}"})
+    return summaries
+
+
+def summarize_all(paths: list[Path], jobs: int) -> list[dict]:
+    if jobs == 1 or len(paths) <= 1:
+        return [s for p in paths for s in summarize_file(p)]
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        results = pool.map(summarize_file, paths, chunksize=max(1, len(paths) // (jobs * 4)))
+        return [s for summaries in results for s in summaries]
+
+
+def write_outputs(summaries: list[dict], out_dir: Path, formats: set[str]):
+    accounts = {}
+    for summary in summaries:
+        accounts.setdefault(summary['account_id'], []).append(summary)
+    for entries in accounts.values():
+        entries.sort(key=lambda s: s['stamp'] or '')
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    if 'json' in formats:
+        account_dir = out_dir / "accounts"
+        account_dir.mkdir(exist_ok=True)
+        for account_id, entries in accounts.items():
+            doc = {
+                'account_id': account_id,
+                'account': entries[-1]['account'],
+                'exports': len(entries),
+                'latest': entries[-1],
+                'history': [{k: s[k] for k in HISTORY_FIELDS} for s in entries],
+            }
+            (account_dir / f"{account_id}.json").write_text(json.dumps(doc, indent=2), encoding="utf-8")
+
+    if 'parquet' in formats:
+        flat = pd.json_normalize([{k: v for k, v in s.items() if k != 'characters'} for s in summaries], sep='.')
+        flat = flat.sort_values(['account_id', 'stamp'])
+        flat.to_parquet(out_dir / "exports.parquet", index=False)
+        flat.groupby('account_id').tail(1).to_parquet(out_dir / "accounts.parquet", index=False)
+
+
+def rarity_parts(index: RarityIndex, paths: list[Path], summaries: list[dict]):
+    """(filename, contents) per export for `index.update`, reading only files that hold an export
+    newer than what is indexed for its account (judged from the summaries' keys)."""
+    keys = {}
+    for s in summaries:
+        keys.setdefault(s['source'], []).append((s['account_id'], s['stamp']))
+    for path in paths:
+        indexed = index.accounts
+        if any(stamp > indexed.get(account_id, '') for account_id, stamp in keys.get(path.name, [])):
+            yield from export_parts(path.read_bytes(), path.name)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="penance-hunter",
+        description="Summarize a directory of penance_exporter CSVs without starting marimo.",
+    )
+    parser.add_argument("directory", type=Path, help="directory containing <account_id>_<YYYYMMDD>_<HHMMSS>.csv exports")
+    parser.add_argument("-o", "--output", type=Path, default=Path("penance_summaries"), help="output directory (default: %(default)s)")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1, help="worker processes (default: CPU count)")
+    parser.add_argument("--format", choices=["json", "parquet", "both"], default="both", help="output format (default: %(default)s)")
+    parser.add_argument("--history", type=Path, help="also ingest the exports into a history store at this path")
+    parser.add_argument("--rarity", type=Path, help="also update the rarity index at this path")
+    args = parser.parse_args(argv)
+
+    paths = find_exports(args.directory)
+    if not paths:
+        print(f"~ no exports found in {args.directory}", file=sys.stderr)
+        return 1
+    print(f"~ summarizing {len(paths)} file(s) with {args.jobs} worker(s)")
+
+    results = summarize_all(paths, max(1, args.jobs))
+    failed = [r for r in results if 'error' in r]
+    summaries = [r for r in results if 'error' not in r]
+    for r in failed:
+        print(f"~ skipped {r['source']}: {r['error']}", file=sys.stderr)
+
+    formats = {"json", "parquet"} if args.format == "both" else {args.format}
+    write_outputs(summaries, args.output, formats)
+    print(f"~ wrote {len({s['account_id'] for s in summaries})} account summary(ies) to {args.output}")
+
+    ok = {r['source'] for r in summaries} - {r['source'] for r in failed}
+    if args.history:
+        store = HistoryStore(args.history)
+        added = []
+        for path in paths:
+            if path.name in ok:
+                try:
+                    with open(path, 'rb') as f:
+                        added += store.ingest_stream(f, path.name)
+                except ValueError as e:  # e.g. rewritten history; the other files still go in
+                    failed.append({'source': path.name, 'error': f"history: {e}"})
+                    print(f"~ skipped {path.name} for history: {e}", file=sys.stderr)
+        print(f"~ added {len(added)} new snapshot(s) to {args.history}")
+
+    if args.rarity:
+        index = RarityIndex(args.rarity)
+        used, skipped = index.update(rarity_parts(index, [p for p in paths if p.name in ok], summaries))
+        for name, reason in skipped:
+            failed.append({'source': name, 'error': f"rarity: {reason}"})
+            print(f"~ skipped {name} for the rarity index: {reason}", file=sys.stderr)
+        print(f"~ rarity index: {used} new export(s), {len(index.accounts)} account(s) in {args.rarity}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,111 @@
+"""
+What changed between two exports of the same account, computed with one
+keyed merge on Achievement_ID.
+"""
+
+from dataclasses import asdict, dataclass, field
+
+import pandas as pd
+
+from .export import ExportMetadata
+
+_DIFF_COLUMNS = ['Achievement_ID', 'Title', 'Category', 'Status', 'Progress', 'Goal', 'Score',
+                 'Completion_Time', 'Mastery_Level', 'Mastery_XP']
+
+# Header fields compared between the two exports
+DIFF_HEADER_FIELDS = ['account_level', 'account_true_level', 'account_prestige']
+
+
+@dataclass
+class ExportDiff:
+    """Changes from an older export to a newer one."""
+    newly_completed: pd.DataFrame
+    progress: pd.DataFrame
+    mastery: pd.DataFrame
+    added: pd.DataFrame
+    removed: pd.DataFrame
+    header: dict = field(default_factory=dict)       # field -> (old, new), changed fields only
+    characters: pd.DataFrame = field(default_factory=pd.DataFrame)
+
+    @property
+    def score_gained(self) -> int:
+        return int(self.newly_completed['Score'].sum()) if len(self.newly_completed) else 0
+
+    @property
+    def is_empty(self) -> bool:
+        return not (len(self.newly_completed) or len(self.progress) or len(self.mastery)
+                    or len(self.added) or len(self.removed) or self.header or len(self.characters))
+
+
+def _project(df: pd.DataFrame) -> pd.DataFrame:
+    out = df.reindex(columns=_DIFF_COLUMNS)
+    for col in ('Category', 'Status'):
+        out[col] = out[col].astype(object)
+    return out
+
+
+def diff_characters(old: ExportMetadata, new: ExportMetadata) -> pd.DataFrame:
+    """Level / true level / prestige changes per character, matched by name and archetype."""
+    cols = ['name', 'archetype', 'level', 'true_level', 'prestige']
+    old_df = pd.DataFrame([asdict(c) for c in old.characters], columns=['slot', *cols])
+    new_df = pd.DataFrame([asdict(c) for c in new.characters], columns=['slot', *cols])
+    merged = old_df.merge(new_df, on=['name', 'archetype'], how='right', suffixes=('_old', '_new'))
+    changed = pd.Series(False, index=merged.index)
+    for col in ('level', 'true_level', 'prestige'):
+        a, b = merged[f'{col}_old'], merged[f'{col}_new']
+        changed |= (a != b) & ~(a.isna() & b.isna())
+    return merged.loc[changed, ['name', 'archetype', 'level_old', 'level_new', 'true_level_old',
+                                'true_level_new', 'prestige_old', 'prestige_new']].reset_index(drop=True)
+
+
+def diff_exports(old_df: pd.DataFrame, new_df: pd.DataFrame,
+                 old_meta: ExportMetadata | None = None, new_meta: ExportMetadata | None = None) -> ExportDiff:
+    """Diff two exports of the same account (old -> new)."""
+    merged = _project(old_df).merge(
+        _project(new_df), on='Achievement_ID', how='outer', suffixes=('_old', '_new'), indicator=True
+    )
+    both = merged['_merge'] == 'both'
+
+    completed_now = both & (merged['Status_new'] == 'Completed') & (merged['Status_old'] != 'Completed')
+    newly_completed = merged.loc[completed_now, ['Achievement_ID', 'Title_new', 'Category_new', 'Score_new', 'Completion_Time_new']]
+    newly_completed.columns = ['Achievement_ID', 'Title', 'Category', 'Score', 'Completion_Time']
+    newly_completed = newly_completed.sort_values('Completion_Time').reset_index(drop=True)
+
+    progress_changed = both & ((merged['Progress_new'] != merged['Progress_old']) | (merged['Goal_new'] != merged['Goal_old']))
+    progress = merged.loc[progress_changed, ['Achievement_ID', 'Title_new', 'Status_new', 'Progress_old', 'Progress_new', 'Goal_old', 'Goal_new']]
+    progress = progress.rename(columns={'Title_new': 'Title', 'Status_new': 'Status'})
+    progress['Progress_Delta'] = progress['Progress_new'] - progress['Progress_old']
+    progress = progress.sort_values('Progress_Delta', ascending=False).reset_index(drop=True)
+
+    level_changed = (merged['Mastery_Level_new'] != merged['Mastery_Level_old']) & merged['Mastery_Level_new'].notna()
+    xp_changed = (merged['Mastery_XP_new'] != merged['Mastery_XP_old']) & merged['Mastery_XP_new'].notna()
+    mastery = merged.loc[both & (level_changed | xp_changed),
+                         ['Achievement_ID', 'Title_new', 'Mastery_Level_old', 'Mastery_Level_new', 'Mastery_XP_old', 'Mastery_XP_new']]
+    mastery = mastery.rename(columns={'Title_new': 'Title'})
+    mastery['Mastery_Level_Delta'] = mastery['Mastery_Level_new'] - mastery['Mastery_Level_old']
+    mastery['Mastery_XP_Delta'] = mastery['Mastery_XP_new'] - mastery['Mastery_XP_old']
+    mastery = mastery.sort_values('Mastery_XP_Delta', ascending=False).reset_index(drop=True)
+
+    added = merged.loc[merged['_merge'] == 'right_only', ['Achievement_ID', 'Title_new', 'Status_new']]
+    added.columns = ['Achievement_ID', 'Title', 'Status']
+    removed = merged.loc[merged['_merge'] == 'left_only', ['Achievement_ID', 'Title_old', 'Status_old']]
+    removed.columns = ['Achievement_ID', 'Title', 'Status']
+
+    header = {}
+    characters = pd.DataFrame()
+    if old_meta is not None and new_meta is not None:
+        for name in DIFF_HEADER_FIELDS:
+            a, b = getattr(old_meta, name), getattr(new_meta, name)
+            if a != b:
+                header[name] = (a, b)
+        characters = diff_characters(old_meta, new_meta)
+
+    return ExportDiff(
+        newly_completed=newly_completed,
+        progress=progress,
+        mastery=mastery,
+        added=added.reset_index(drop=True),
+        removed=removed.reset_index(drop=True),
+        header=header,
+        characters=characters,
+    )
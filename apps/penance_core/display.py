@@ -0,0 +1,20 @@
+"""
+Vectorized display columns for the penance table.
+"""
+
+import numpy as np
+import pandas as pd
+
+BAR_WIDTH = 10
+_BARS = np.array(["█" * n + "░" * (BAR_WIDTH - n) for n in range(BAR_WIDTH + 1)], dtype=object)
+
+
+def progress_text(pct: pd.Series) -> pd.Series:
+    """'200%' style labels from a fractional Progress_Percentage column."""
+    return (pct.fillna(0) * 100).round().astype(int).astype(str) + '%'
+
+
+def progress_bar(pct: pd.Series) -> pd.Series:
+    """Ten-block text progress bars, capped at full."""
+    blocks = np.floor(pct.fillna(0).clip(0, 1).to_numpy() * BAR_WIDTH).astype(int)
+    return pd.Series(_BARS[blocks], index=pct.index)
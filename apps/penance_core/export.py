@@ -0,0 +1,249 @@
+"""
+Reading penance_exporter CSVs as written by `perform_export`: a `#` comment
+header with account metadata, then the penance rows, saved as
+`<account_id>_<YYYYMMDD>_<HHMMSS>.csv`.
+"""
+
+import hashlib
+import re
+from dataclasses import asdict, dataclass, field
+from functools import cached_property
+from pathlib import PurePath
+
+import pandas as pd
+import pyarrow as pa
+
+from .schema import read_table
+
+# Account IDs as the exporter writes them (UUIDs); they become file and directory names in the stores
+ACCOUNT_ID_RE = re.compile(r'^[A-Za-z0-9-]+$')
+EXPORT_FILENAME_RE = re.compile(r'^(?P<account_id>[A-Za-z0-9-]+)_(?P<date>[0-9]{8})_(?P<time>[0-9]{6})\.csv$')
+
+
+@dataclass(frozen=True)
+class ExportKey:
+    """Account ID + filename timestamp identifying one export."""
+    account_id: str
+    stamp: str  # "YYYYMMDD_HHMMSS", sorts chronologically
+
+    @property
+    def timestamp(self) -> pd.Timestamp:
+        return pd.to_datetime(self.stamp, format='%Y%m%d_%H%M%S', errors='coerce')
+
+    @property
+    def date(self) -> str:
+        return self.stamp.split('_')[0]
+
+
+def parse_export_filename(filename) -> ExportKey | None:
+    """Parse an export filename into an ExportKey, or None if it doesn't match."""
+    match = EXPORT_FILENAME_RE.match(PurePath(str(filename)).name)
+    if not match:
+        return None
+    return ExportKey(match.group('account_id'), f"{match.group('date')}_{match.group('time')}")
+
+
+def check_account_id(account_id: str) -> str:
+    """`account_id` if it matches ACCOUNT_ID_RE, so it is safe as a path component; ValueError otherwise."""
+    if not isinstance(account_id, str) or not ACCOUNT_ID_RE.match(account_id):
+        raise ValueError(f"invalid account ID {account_id!r}")
+    return account_id
+
+
+# "1. gern (Zealot) - Level 30 (True: 169, Prestige: 4)" or "2. Zek (Hive Scum) - Level 30"
+CHARACTER_RE = re.compile(
+    r'(\d+)\.\s*(.+?)\s*\(([^)]+)\)\s*-\s*Level\s*(\d+)(?:\s*\(True:\s*(\d+),\s*Prestige:\s*(\d+)\))?'
+)
+
+
+@dataclass(frozen=True)
+class CharacterInfo:
+    """One line of the header's "All Characters" list."""
+    slot: int
+    name: str
+    archetype: str
+    level: int
+    true_level: int | None = None
+    prestige: int | None = None
+
+
+def _int(value: str) -> int | None:
+    try:
+        return int(value)
+    except ValueError:
+        return None
+
+
+def _percent(value: str) -> float | None:
+    try:
+        return float(value.rstrip('%'))
+    except ValueError:
+        return None
+
+
+# Header label -> (ExportMetadata field, converter)
+HEADER_FIELDS = {
+    'Mod Version': ('mod_version', str),
+    'Account': ('account', str),
+    'Account ID': ('account_id', str),
+    'Platform': ('platform', str),
+    'Number of Characters': ('num_characters', _int),
+    'Account Level': ('account_level', _int),
+    'Account True Level': ('account_true_level', _int),
+    'Account Prestige': ('account_prestige', _int),
+    'Export Character': ('export_character', str),
+    'Export Archetype': ('export_archetype', str),
+    'Export Character Level': ('export_character_level', _int),
+    'Export Character True Level': ('export_character_true_level', _int),
+    'Export Additional Levels': ('export_additional_levels', _int),
+    'Export Character Prestige': ('export_character_prestige', _int),
+    'Export Date': ('export_date', str),
+    'Export Timezone': ('timezone', str),
+    'Total Penances': ('total_penances', _int),
+    'Completed Penances': ('completed_penances', _int),
+    'Completion Rate': ('completion_rate', _percent),
+}
+
+
+@dataclass
+class ExportMetadata:
+    """Typed view of the `#` comment header written by perform_export."""
+    mod_version: str | None = None
+    account: str | None = None
+    account_id: str | None = None
+    platform: str | None = None
+    num_characters: int | None = None
+    account_level: int | None = None
+    account_true_level: int | None = None
+    account_prestige: int | None = None
+    characters: list[CharacterInfo] = field(default_factory=list)
+    export_character: str | None = None
+    export_archetype: str | None = None
+    export_character_level: int | None = None
+    export_character_true_level: int | None = None
+    export_additional_levels: int | None = None
+    export_character_prestige: int | None = None
+    export_date: str | None = None
+    timezone: str | None = None
+    total_penances: int | None = None
+    completed_penances: int | None = None
+    completion_rate: float | None = None
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ExportMetadata":
+        data = dict(data)
+        data['characters'] = [CharacterInfo(**c) for c in data.get('characters', [])]
+        return cls(**{k: v for k, v in data.items() if k in cls.__dataclass_fields__})
+
+
+def split_export(contents: bytes) -> int:
+    """Return the byte offset where the `#` header block ends and the CSV body starts."""
+    pos = 0
+    while contents.startswith(b'#', pos):
+        end = contents.find(b'\n', pos)
+        if end == -1:
+            return len(contents)
+        pos = end + 1
+    return pos
+
+
+def parse_header(header: bytes) -> ExportMetadata:
+    """Parse the `#` header block into an ExportMetadata record."""
+    meta = ExportMetadata()
+    in_characters = False
+    for raw in header.decode('utf-8', 'replace').splitlines():
+        line = raw.lstrip('#').strip()
+        if not line:
+            in_characters = False
+            continue
+        if in_characters and line[0].isdigit():
+            match = CHARACTER_RE.match(line)
+            if match:
+                slot, name, archetype, level, true_level, prestige = match.groups()
+                meta.characters.append(CharacterInfo(
+                    int(slot), name, archetype, int(level),
+                    int(true_level) if true_level else None,
+                    int(prestige) if prestige else None,
+                ))
+            continue
+        label, sep, value = line.partition(':')
+        if not sep:
+            continue
+        if label == 'All Characters':
+            in_characters = True
+            continue
+        in_characters = False
+        spec = HEADER_FIELDS.get(label)
+        if spec:
+            name, convert = spec
+            setattr(meta, name, convert(value.strip()))
+    return meta
+
+
+def export_key(meta: ExportMetadata, filename=None) -> ExportKey | None:
+    """Key from the filename, falling back to the header's Account ID and Export Date."""
+    key = parse_export_filename(filename) if filename is not None else None
+    if key is None and meta.account_id and ACCOUNT_ID_RE.match(meta.account_id) and meta.export_date:
+        stamp = pd.to_datetime(meta.export_date, errors='coerce')
+        if pd.notna(stamp):
+            key = ExportKey(meta.account_id, stamp.strftime('%Y%m%d_%H%M%S'))
+    return key
+
+
+def read_metadata(contents: bytes) -> ExportMetadata:
+    """Parse just the header block, without touching the CSV body."""
+    return parse_header(contents[:split_export(contents)])
+
+
+def read_export_table(contents: bytes) -> tuple[ExportMetadata, pa.Table]:
+    """Read an export in one pass: parse the header, hand only the data slice to the CSV engine."""
+    body_start = split_export(contents)
+    meta = parse_header(contents[:body_start])
+    table = read_table(pa.py_buffer(contents)[body_start:])  # zero-copy slice
+    return meta, table
+
+
+def read_export(contents: bytes) -> tuple[ExportMetadata, pd.DataFrame]:
+    """Like read_export_table, as a DataFrame (dictionary columns become categoricals)."""
+    meta, table = read_export_table(contents)
+    return meta, table.to_pandas()
+
+
+class ExportFile:
+    """One export's bytes with its header and key, parsed into a table at most once.
+
+    The notebooks build one per upload and hand the same objects to the
+    history, rarity index and leaderboard, so each export's body goes through
+    the CSV reader once per run. `table` may be given up front (e.g. restored
+    from the export cache) to skip the parse entirely.
+    """
+
+    def __init__(self, filename, contents: bytes, table: pa.Table | None = None):
+        self.filename = filename
+        self.contents = contents
+        self.meta = read_metadata(contents)
+        self.key = export_key(self.meta, filename)
+        if table is not None:
+            self.table = table
+
+    @cached_property
+    def sha256(self) -> str:
+        return hashlib.sha256(self.contents).hexdigest()
+
+    @cached_property
+    def table(self) -> pa.Table:
+        """The typed EXPORT_SCHEMA table of the body."""
+        return read_table(pa.py_buffer(self.contents)[split_export(self.contents):])
+
+    @property
+    def parsed(self) -> bool:
+        """Whether `table` is already available."""
+        return 'table' in self.__dict__
+
+
+def export_file(export) -> ExportFile:
+    """`export` as an ExportFile; (filename, contents) pairs are wrapped."""
+    return export if isinstance(export, ExportFile) else ExportFile(*export)
@@ -0,0 +1,57 @@
+"""
+Precomputed filter masks for the penance table.
+
+Each filterable column is factorized once when the table is built; every
+value gets a boolean row mask. Toggling a dropdown then ANDs a few masks and
+takes the matching rows, instead of copying and re-scanning the whole frame.
+"""
+
+import numpy as np
+import pandas as pd
+
+FILTER_COLUMNS = ['Status', 'Penance_Category', 'Penance_Class']
+
+
+class FilterIndex:
+    """Per-value row masks for FILTER_COLUMNS of one table frame."""
+
+    def __init__(self, df: pd.DataFrame, columns=FILTER_COLUMNS):
+        self.frame = df
+        self.masks = {}  # column -> {value: bool ndarray}
+        for col in columns:
+            codes, uniques = pd.factorize(df[col], use_na_sentinel=True)
+            self.masks[col] = {value: codes == i for i, value in enumerate(uniques)}
+
+    def mask(self, **selected) -> np.ndarray:
+        """Rows matching every column=value pair; None (or "All") leaves a column unfiltered."""
+        mask = np.ones(len(self.frame), dtype=bool)
+        for col, value in selected.items():
+            if value is None or value == "All":
+                continue
+            value_mask = self.masks[col].get(value)
+            if value_mask is None:
+                return np.zeros(len(self.frame), dtype=bool)
+            mask &= value_mask
+        return mask
+
+    def rows(self, **selected) -> np.ndarray:
+        """Positional row numbers for `mask(**selected)`."""
+        return np.flatnonzero(self.mask(**selected))
+
+    def counts(self, column: str, **selected) -> dict:
+        """Rows per value of `column` among the rows matching `selected`."""
+        base = self.mask(**selected)
+        return {value: int(np.count_nonzero(value_mask & base)) for value, value_mask in self.masks[column].items()}
+
+    def select(self, columns: list[str], order: np.ndarray | None = None, **selected) -> pd.DataFrame:
+        """Matching rows projected onto `columns`, in one positional take.
+
+        `order` (e.g. ranked search hits) restricts the result to those row
+        positions, in that order.
+        """
+        if order is None:
+            rows = self.rows(**selected)
+        else:
+            rows = order[self.mask(**selected)[order]]
+        col_idx = self.frame.columns.get_indexer(columns)
+        return self.frame.iloc[rows, col_idx].reset_index(drop=True)
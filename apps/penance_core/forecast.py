@@ -0,0 +1,43 @@
+"""
+Completion ETAs for in-progress penances from two snapshots of one account.
+
+The rate model is progress gained between the two exports divided by the
+wall-clock time between them, computed for every penance at once on arrays
+aligned by Achievement_ID. Penances that made no progress get no ETA.
+"""
+
+import numpy as np
+import pandas as pd
+
+ETA_COLUMNS = ['Rate_Per_Day', 'Remaining', 'ETA_Days', 'ETA']
+
+# ETAs further out than this are left as NaT (and are not worth a date anyway)
+MAX_ETA_DAYS = 100 * 365
+
+
+def forecast_eta(old_df: pd.DataFrame, new_df: pd.DataFrame, old_time, new_time) -> pd.DataFrame:
+    """ETA_COLUMNS for every In Progress penance of `new_df`, indexed by Achievement_ID."""
+    new = new_df.loc[new_df['Status'] == 'In Progress', ['Achievement_ID', 'Progress', 'Goal']]
+    new = new[~new['Achievement_ID'].duplicated(keep='last')]
+    old = old_df[~old_df['Achievement_ID'].duplicated(keep='last')]
+    old_time, new_time = pd.Timestamp(old_time), pd.Timestamp(new_time)
+    elapsed = (new_time - old_time) / pd.Timedelta(days=1) if pd.notna(old_time) and pd.notna(new_time) else np.nan
+
+    positions = pd.Index(old['Achievement_ID']).get_indexer(new['Achievement_ID'])
+    old_progress = np.where(positions >= 0, old['Progress'].to_numpy(dtype=float)[positions], np.nan)
+    progress = new['Progress'].to_numpy(dtype=float)
+    remaining = np.maximum(new['Goal'].to_numpy(dtype=float) - progress, 0)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rate = (progress - old_progress) / elapsed if elapsed > 0 else np.full(len(new), np.nan)
+        eta_days = np.where(rate > 0, remaining / rate, np.nan)
+    in_range = eta_days <= MAX_ETA_DAYS
+    seconds = np.where(in_range, np.round(eta_days * 86400), 0).astype(np.int64)
+    eta = (new_time + pd.to_timedelta(seconds, unit='s')).where(in_range)
+
+    return pd.DataFrame({
+        'Rate_Per_Day': rate,
+        'Remaining': remaining,
+        'ETA_Days': eta_days,
+        'ETA': eta,
+    }, index=pd.Index(new['Achievement_ID'].to_numpy(dtype=object), name='Achievement_ID'))
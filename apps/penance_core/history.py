@@ -0,0 +1,347 @@
+"""
+Append-only history of penance exports, one directory per Account ID.
+
+Each ingested export becomes a snapshot keyed by the `_YYYYMMDD_HHMMSS`
+filename timestamp. Only rows that changed since the previous snapshot are
+written (as Parquet), so a month of near-identical ~1000-row exports costs a
+few hundred rows on disk. Loading a snapshot replays the deltas up to it.
+Streamed exports (`ingest_stream`) are diffed and written batch by batch.
+
+Layout:
+    <root>/<account_id>/manifest.json
+    <root>/<account_id>/<YYYYMMDD_HHMMSS>.parquet
+"""
+
+import json
+import os
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from .export import ACCOUNT_ID_RE, ExportFile, ExportKey, ExportMetadata, check_account_id, export_file
+from .forecast import ETA_COLUMNS, forecast_eta
+from .mastery import mastery_rates, mastery_table
+from .schema import EXPORT_SCHEMA, SCHEMA_VERSION
+from .stream import EXPORT_BATCH_BYTES, ExportPart, iter_exports
+
+# Per-export constants - kept once in the manifest instead of on every row
+EXPORT_COLUMNS = ['Export_Account', 'Export_Platform', 'Export_Character', 'Export_Archetype', 'Export_Mod_Date']
+
+# Per-penance columns stored in snapshot deltas
+ROW_SCHEMA = pa.schema([f for f in EXPORT_SCHEMA if f.name not in EXPORT_COLUMNS])
+ROW_COLUMNS = ROW_SCHEMA.names
+DELETED = '_deleted'
+DELTA_SCHEMA = ROW_SCHEMA.append(pa.field(DELETED, pa.bool_()))
+
+MANIFEST = 'manifest.json'
+
+
+def default_history_dir() -> Path:
+    """Where the notebooks keep history: in-memory FS under WASM, ~/.penance_hunter otherwise."""
+    if "pyodide" in sys.modules:
+        return Path("/tmp/penance_history")
+    return Path(os.environ.get("PENANCE_HUNTER_HISTORY", Path.home() / ".penance_hunter" / "history"))
+
+
+def _normalize_rows(df: pd.DataFrame) -> pd.DataFrame:
+    """Project an export frame onto ROW_SCHEMA, indexed by Achievement_ID."""
+    rows = df.reindex(columns=ROW_COLUMNS)
+    rows = rows[~rows['Achievement_ID'].duplicated(keep='last')]
+    return rows.set_index('Achievement_ID', drop=False)
+
+
+def _changed_mask(new: pd.DataFrame, prev: pd.DataFrame) -> pd.Series:
+    """True for rows of `new` that are missing from `prev` or differ in any column."""
+    prev = prev.reindex(new.index)
+    same = pd.Series(True, index=new.index)
+    for col in ROW_COLUMNS:
+        a, b = new[col], prev[col]
+        if isinstance(a.dtype, pd.CategoricalDtype) or isinstance(b.dtype, pd.CategoricalDtype):
+            a, b = a.astype(object), b.astype(object)
+        same &= (a == b).fillna(False).astype(bool) | (a.isna() & b.isna())
+    return ~same
+
+
+class HistoryStore:
+    """Deduplicated, append-only snapshots of penance exports."""
+
+    def __init__(self, root):
+        self.root = Path(root)
+        self._states = {}  # (account_id, stamp) -> reconstructed rows
+        self._forecasts = {}  # (account_id, old stamp, new stamp) -> forecast_eta frame
+        self._mastery = {}  # (account_id, stamp) -> mastery_rates frame
+
+    def _account_dir(self, account_id: str) -> Path:
+        return self.root / check_account_id(account_id)
+
+    def _manifest(self, account_id: str) -> list[dict]:
+        if not ACCOUNT_ID_RE.match(account_id or ''):
+            return []  # nothing can have been stored under it
+        path = self._account_dir(account_id) / MANIFEST
+        if not path.exists():
+            return []
+        return json.loads(path.read_text(encoding="utf-8"))
+
+    def _write_manifest(self, account_id: str, entries: list[dict]):
+        path = self._account_dir(account_id) / MANIFEST
+        tmp = path.with_suffix('.json.tmp')
+        tmp.write_text(json.dumps(entries, indent=2), encoding="utf-8")
+        os.replace(tmp, path)
+
+    def accounts(self) -> list[str]:
+        """Account IDs with at least one snapshot."""
+        if not self.root.exists():
+            return []
+        return sorted(p.name for p in self.root.iterdir() if (p / MANIFEST).exists())
+
+    def snapshots(self, account_id: str) -> pd.DataFrame:
+        """Manifest of an account's snapshots, oldest first."""
+        entries = self._manifest(account_id)
+        df = pd.DataFrame(entries, columns=['stamp', 'source', 'sha256', 'rows', 'changed', 'deleted', 'file', 'export', 'metadata'])
+        df['timestamp'] = pd.to_datetime(df['stamp'], format='%Y%m%d_%H%M%S', errors='coerce')
+        return df
+
+    def latest(self, account_id: str) -> ExportKey | None:
+        entries = self._manifest(account_id)
+        return ExportKey(account_id, entries[-1]['stamp']) if entries else None
+
+    def metadata(self, account_id: str, stamp: str | None = None) -> ExportMetadata:
+        """Header metadata of the snapshot at `stamp` (default: latest)."""
+        entries = [e for e in self._manifest(account_id) if stamp is None or e['stamp'] <= stamp]
+        if not entries:
+            raise KeyError(f"no snapshots for {account_id}")
+        return ExportMetadata.from_dict(entries[-1]['metadata'])
+
+    def ingest(self, contents: bytes, filename) -> ExportKey | None:
+        """Add one export. Returns its key, or None if it was already ingested.
+
+        The key comes from the filename, or from the header's Account ID and
+        Export Date for renamed files. Raises ValueError if neither is usable or
+        the export is older than the account's latest snapshot (the store is
+        append-only; use `ingest_many` to ingest a batch in timestamp order).
+        """
+        return self.ingest_file(ExportFile(filename, contents))
+
+    def ingest_file(self, export: ExportFile) -> ExportKey | None:
+        """`ingest` an ExportFile, reusing its table if it was already parsed."""
+        # Duplicates are recognized from the header and the file digest, before the body is parsed
+        key, meta, filename = export.key, export.meta, export.filename
+        if key is None:
+            raise ValueError(f"cannot identify account/timestamp for {filename}")
+
+        entries = self._manifest(key.account_id)
+        digest = export.sha256
+        if any(e['stamp'] == key.stamp or e['sha256'] == digest for e in entries):
+            return None
+        self._check_append(key, entries, filename)
+
+        df = export.table.to_pandas()
+        rows = _normalize_rows(df)
+        prev = self.load(key.account_id) if entries else rows.iloc[:0]
+        prev = prev.set_index('Achievement_ID', drop=False)
+
+        changed = rows[_changed_mask(rows, prev)].copy()
+        changed[DELETED] = False
+        gone = prev.index.difference(rows.index)
+        deleted = pd.DataFrame({'Achievement_ID': gone, DELETED: True})
+        delta = pd.concat([changed, deleted], ignore_index=True).reindex(columns=DELTA_SCHEMA.names)
+
+        account_dir = self._account_dir(key.account_id)
+        account_dir.mkdir(parents=True, exist_ok=True)
+        delta_file = None
+        if len(delta):
+            delta_file = f"{key.stamp}.parquet"
+            pq.write_table(pa.Table.from_pandas(delta, schema=DELTA_SCHEMA, preserve_index=False), account_dir / delta_file)
+
+        export_info = {col: str(df[col].iloc[0]) for col in EXPORT_COLUMNS if col in df.columns and len(df)}
+        self._append_entry(key, entries, filename, digest, meta, export_info,
+                           rows=len(rows), changed=len(changed), deleted=len(gone), delta_file=delta_file)
+        self._states[(key.account_id, key.stamp)] = self._attach_export(rows.reset_index(drop=True), export_info)
+        return key
+
+    def _check_append(self, key: ExportKey, entries: list[dict], filename):
+        if entries and entries[-1].get('schema_version') != SCHEMA_VERSION:
+            raise ValueError(f"history for {key.account_id} uses an older schema; re-ingest it into a fresh store")
+        if entries and key.stamp < entries[-1]['stamp']:
+            raise ValueError(f"{filename} is older than the latest snapshot ({entries[-1]['stamp']})")
+
+    def _append_entry(self, key: ExportKey, entries: list[dict], filename, digest: str, meta: ExportMetadata,
+                      export_info: dict, rows: int, changed: int, deleted: int, delta_file: str | None):
+        entries.append({
+            'stamp': key.stamp,
+            'source': Path(str(filename)).name,
+            'sha256': digest,
+            'schema_version': SCHEMA_VERSION,
+            'rows': rows,
+            'changed': changed,
+            'deleted': deleted,
+            'file': delta_file,
+            'export': export_info,
+            'metadata': meta.to_dict(),
+        })
+        self._write_manifest(key.account_id, entries)
+
+    def ingest_part(self, part: ExportPart, filename=None) -> ExportKey | None:
+        """Add one streamed export (see `iter_exports`), diffing and writing it batch by batch.
+
+        Same keying and append-only rules as `ingest`. Only the previous
+        snapshot and one batch are in memory at a time; neither snapshot is
+        cached, they are replayed from disk when loaded.
+        """
+        key = part.key(filename)
+        if key is None:
+            raise ValueError(f"cannot identify account/timestamp for {filename}")
+        entries = self._manifest(key.account_id)
+        if any(e['stamp'] == key.stamp for e in entries):
+            return None
+        self._check_append(key, entries, filename)
+
+        prev = self.load(key.account_id) if entries else ROW_SCHEMA.empty_table().to_pandas()
+        prev = prev.set_index('Achievement_ID', drop=False)
+        # Not kept for the next export in the stream, so memory doesn't grow with the number of exports
+        if entries:
+            self._states.pop((key.account_id, entries[-1]['stamp']), None)
+        account_dir = self._account_dir(key.account_id)
+        account_dir.mkdir(parents=True, exist_ok=True)
+        tmp = account_dir / f"{key.stamp}.parquet.tmp"
+        writer = None
+        seen = set()
+        changed = 0
+        export_info = None
+        try:
+            for batch in part.batches:
+                df = batch.to_pandas()
+                if export_info is None and len(df):
+                    export_info = {col: str(df[col].iloc[0]) for col in EXPORT_COLUMNS}
+                rows = _normalize_rows(df)
+                # A penance repeated from an earlier batch is always written, so the last row wins on replay
+                mask = _changed_mask(rows, prev) | rows.index.isin(list(seen))
+                seen.update(rows.index)
+                delta = rows[mask.to_numpy()].assign(**{DELETED: False})
+                if len(delta):
+                    writer = writer or pq.ParquetWriter(tmp, DELTA_SCHEMA)
+                    writer.write_table(pa.Table.from_pandas(delta, schema=DELTA_SCHEMA, preserve_index=False))
+                    changed += len(delta)
+            gone = prev.index.difference(pd.Index(list(seen), dtype=object))
+            if len(gone):
+                writer = writer or pq.ParquetWriter(tmp, DELTA_SCHEMA)
+                deleted = pd.DataFrame({'Achievement_ID': gone, DELETED: True}).reindex(columns=DELTA_SCHEMA.names)
+                writer.write_table(pa.Table.from_pandas(deleted, schema=DELTA_SCHEMA, preserve_index=False))
+        finally:
+            if writer is not None:
+                writer.close()
+
+        digest = part.sha256
+        if any(e['sha256'] == digest for e in entries):
+            tmp.unlink(missing_ok=True)
+            return None
+        delta_file = None
+        if writer is not None:
+            delta_file = f"{key.stamp}.parquet"
+            os.replace(tmp, account_dir / delta_file)
+        self._append_entry(key, entries, filename, digest, part.meta, export_info or {},
+                           rows=len(seen), changed=changed, deleted=len(gone), delta_file=delta_file)
+        return key
+
+    def ingest_stream(self, source, filename=None, block_size: int = EXPORT_BATCH_BYTES) -> list[ExportKey]:
+        """`ingest_part` every export in a binary file object, in file order, skipping duplicates."""
+        added = []
+        for part in iter_exports(source, block_size):
+            key = self.ingest_part(part, filename)
+            if key is not None:
+                added.append(key)
+        return added
+
+    def ingest_many(self, exports) -> tuple[list[ExportKey], list[tuple[str, str]]]:
+        """Ingest ExportFiles or (filename, contents) pairs oldest-first, skipping duplicates.
+
+        Returns (added keys, skipped files). A file that can't be ingested (no
+        usable key, older than the account's latest snapshot, ...) is skipped
+        as (filename, reason) without stopping the rest of the batch.
+        """
+        files = sorted((export_file(e) for e in exports), key=lambda f: f.key.stamp if f.key else '')
+        added = []
+        skipped = []
+        for export in files:
+            if export.key is None:
+                skipped.append((export.filename, f"cannot identify account/timestamp for {export.filename}"))
+                continue
+            try:
+                new_key = self.ingest_file(export)
+            except ValueError as e:
+                skipped.append((export.filename, str(e)))
+                continue
+            if new_key is not None:
+                added.append(new_key)
+        return added, skipped
+
+    def load(self, account_id: str, stamp: str | None = None) -> pd.DataFrame:
+        """Reconstruct the full export rows at `stamp` (default: latest snapshot)."""
+        entries = self._manifest(account_id)
+        if stamp is not None:
+            entries = [e for e in entries if e['stamp'] <= stamp]
+        if not entries:
+            raise KeyError(f"no snapshots for {account_id}" + (f" at or before {stamp}" if stamp else ""))
+        if any(e.get('schema_version') != SCHEMA_VERSION for e in entries):
+            raise ValueError(f"history for {account_id} uses an older schema; re-ingest it into a fresh store")
+
+        cache_key = (account_id, entries[-1]['stamp'])
+        if cache_key in self._states:
+            return self._states[cache_key]
+
+        files = [self._account_dir(account_id) / e['file'] for e in entries if e['file']]
+        # Snapshots without a delta file (nothing changed) contribute no rows
+        if files:
+            table = pa.concat_tables([pq.read_table(f, schema=DELTA_SCHEMA) for f in files])
+        else:
+            table = DELTA_SCHEMA.empty_table()
+        rows = table.to_pandas()
+        rows = rows.drop_duplicates('Achievement_ID', keep='last')
+        rows = rows[~rows[DELETED]].drop(columns=DELETED).reset_index(drop=True)
+        rows = self._attach_export(rows, entries[-1]['export'])
+        self._states[cache_key] = rows
+        return rows
+
+    def forecast(self, account_id: str, stamp: str | None = None) -> pd.DataFrame:
+        """Completion ETAs at snapshot `stamp` (default: latest), from the progress made since
+        the snapshot before it. Cached per snapshot pair; empty when `stamp` isn't a snapshot
+        (the ETAs would describe other exports) or has none before it."""
+        stamps = [e['stamp'] for e in self._manifest(account_id)]
+        if stamp is not None:
+            stamps = stamps[:stamps.index(stamp) + 1] if stamp in stamps else []
+        if len(stamps) < 2:
+            return pd.DataFrame(columns=ETA_COLUMNS, index=pd.Index([], name='Achievement_ID', dtype=object))
+        old, new = stamps[-2], stamps[-1]
+        cache_key = (account_id, old, new)
+        if cache_key not in self._forecasts:
+            self._forecasts[cache_key] = forecast_eta(
+                self.load(account_id, old), self.load(account_id, new),
+                ExportKey(account_id, old).timestamp, ExportKey(account_id, new).timestamp,
+            )
+        return self._forecasts[cache_key]
+
+    def mastery(self, account_id: str, stamp: str | None = None) -> pd.DataFrame:
+        """Per-pattern weapon mastery at snapshot `stamp` (default: latest), with XP/day averaged
+        since the account's first snapshot. Cached per snapshot (i.e. per ingested export file)."""
+        stamps = [e['stamp'] for e in self._manifest(account_id) if stamp is None or e['stamp'] <= stamp]
+        if not stamps:
+            raise KeyError(f"no snapshots for {account_id}" + (f" at or before {stamp}" if stamp else ""))
+        cache_key = (account_id, stamps[-1])
+        if cache_key not in self._mastery:
+            first, last = stamps[0], stamps[-1]
+            self._mastery[cache_key] = mastery_rates(
+                mastery_table(self.load(account_id, first)), mastery_table(self.load(account_id, last)),
+                ExportKey(account_id, first).timestamp, ExportKey(account_id, last).timestamp,
+            )
+        return self._mastery[cache_key]
+
+    @staticmethod
+    def _attach_export(rows: pd.DataFrame, export_info: dict) -> pd.DataFrame:
+        rows = rows.copy()
+        for i, col in enumerate(EXPORT_COLUMNS):
+            if col in export_info:
+                rows.insert(i, col, pd.Series(export_info[col], index=rows.index, dtype='category'))
+        return rows
@@ -0,0 +1,67 @@
+"""
+Achievement icon markup for the notebooks.
+
+The site build packs the per-icon PNGs into a few AVIF/WebP sprite sheets
+plus a JSON index (see `.github/scripts/build.py`). With the index loaded an
+icon is a CSS sprite on one of those sheets; without it (local runs, or a site
+whose index failed to load - the PNGs are deployed next to the sheets) every
+icon is its own lazily loaded <img>.
+"""
+
+import html
+
+# Relative to the public/ asset root
+ATLAS_INDEX = 'icons/atlas/achievements.json'
+ATLAS_DIR = 'icons/atlas'
+PNG_DIR = 'icons/achievements'
+
+# Shown for icons missing from the atlas / PNG folder
+FALLBACK_ICON = 'achievement_icon_0001'
+
+
+def icon_name(icon) -> str:
+    """Index key for an export Icon path: its last segment (the PNGs are stored flat)."""
+    if not isinstance(icon, str) or not icon:
+        return ''
+    return icon.rsplit('/', 1)[-1]
+
+
+class IconAtlas:
+    """Renders export Icon paths as sprite-sheet <div>s, or lazy <img>s without an index."""
+
+    def __init__(self, root: str = 'public', index: dict | None = None):
+        self.root = root.rstrip('/')
+        self.index = index
+
+    def __contains__(self, icon) -> bool:
+        return self.index is not None and icon_name(icon) in self.index['icons']
+
+    def url(self, icon) -> str:
+        """URL of the icon's individual PNG."""
+        return f"{self.root}/{PNG_DIR}/{icon_name(icon) or FALLBACK_ICON}.png"
+
+    def html(self, icon, size: int = 64, title: str = '') -> str:
+        """Markup for one icon at `size` px."""
+        label = html.escape(title, quote=True)
+        if self.index is None:
+            fallback = f"{self.root}/{PNG_DIR}/{FALLBACK_ICON}.png"
+            return (
+                f'<img src="{self.url(icon)}" alt="{label}" width="{size}" height="{size}" loading="lazy" decoding="async" '
+                f'style="width: {size}px; height: {size}px; border-radius: 4px; flex: none;" '
+                f"onerror=\"this.onerror=null; this.src='{fallback}'\">"
+            )
+
+        icons = self.index['icons']
+        sheet, col, row = icons.get(icon_name(icon)) or icons[FALLBACK_ICON]
+        sheet = self.index['sheets'][sheet]
+        scale = size / self.index['cell']
+        avif = f"{self.root}/{ATLAS_DIR}/{sheet['avif']}"
+        webp = f"{self.root}/{ATLAS_DIR}/{sheet['webp']}"
+        # Plain WebP first for browsers without image-set() type() support
+        return (
+            f'<div role="img" aria-label="{label}" style="width: {size}px; height: {size}px; border-radius: 4px; flex: none; '
+            f"background-image: url('{webp}'); "
+            f"background-image: image-set(url('{avif}') type('image/avif'), url('{webp}') type('image/webp')); "
+            f"background-size: {sheet['width'] * scale:g}px {sheet['height'] * scale:g}px; "
+            f'background-position: -{col * size}px -{row * size}px;"></div>'
+        )
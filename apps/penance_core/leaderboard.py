@@ -0,0 +1,113 @@
+"""
+Multi-account leaderboard: the latest export of every account concatenated
+into one Arrow table, aggregated per account on a dictionary-encoded
+Account_ID column. Display names (Export_Account) are not unique and change
+over time, so they are only shown: each account is listed under the name of
+its latest export.
+
+Per-penance work (class derivation) runs once per distinct Achievement_ID
+rather than once per account row, so 100+ accounts aggregate in well under
+a second.
+"""
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from .classification import CLASS_CATEGORIES, CLASSES, penance_class
+from .export import ExportFile, export_file
+from .mastery import MASTERY_MAX_LEVEL
+from .schema import EXPORT_SCHEMA
+
+LEADERBOARD_COLUMNS = ['Export_Account', 'Achievement_ID', 'Category', 'Title', 'Status', 'Score', 'Mastery_Level']
+ACCOUNT_ID_FIELD = pa.field('Account_ID', pa.dictionary(pa.int32(), pa.string()))
+
+
+def latest_exports(exports) -> dict[str, ExportFile]:
+    """Newest export per Account ID among ExportFiles or (filename, contents) pairs."""
+    latest = {}
+    for export in map(export_file, exports):
+        key = export.key
+        if key is None:
+            continue
+        if key.account_id not in latest or key.stamp > latest[key.account_id].key.stamp:
+            latest[key.account_id] = export
+    return latest
+
+
+def leaderboard_table(exports) -> pa.Table:
+    """Latest export of each account as one table of LEADERBOARD_COLUMNS + Account_ID, the
+    dictionary columns sharing a single dictionary each. An export that isn't a readable
+    penance export leaves its account out rather than failing the table."""
+    tables = []
+    for account_id, export in latest_exports(exports).items():
+        try:
+            table = export.table.select(LEADERBOARD_COLUMNS)
+        except ValueError:
+            continue
+        ids = pa.repeat(account_id, table.num_rows).dictionary_encode().cast(ACCOUNT_ID_FIELD.type)
+        tables.append(table.append_column(ACCOUNT_ID_FIELD, ids))
+    if not tables:
+        return pa.schema([*(EXPORT_SCHEMA.field(c) for c in LEADERBOARD_COLUMNS), ACCOUNT_ID_FIELD]).empty_table()
+    return pa.concat_tables(tables).unify_dictionaries().combine_chunks()
+
+
+def _frame(table: pa.Table) -> pd.DataFrame:
+    df = table.to_pandas()
+    # Class from the first row of each distinct penance, broadcast back by factorized code
+    codes, _ = pd.factorize(df['Achievement_ID'])
+    _, first = np.unique(codes, return_index=True)
+    classes = np.asarray(penance_class(df.iloc[first]))
+    df['Penance_Class'] = pd.Categorical(classes[codes], categories=CLASSES)
+    df['_penance'] = codes
+    df['_completed'] = (df['Status'] == 'Completed').to_numpy()
+    return df
+
+
+def leaderboard(table: pa.Table) -> pd.DataFrame:
+    """One ranked row per Account_ID, under its latest name: completion, score, completed class
+    penances and weapon mastery."""
+    df = _frame(table)
+    completed = df['_completed']
+    account = df['Account_ID']
+    per_account = pd.DataFrame({
+        'Completed': completed,
+        'Score': df['Score'].where(completed, 0),
+        'Weapons Mastered': df['Mastery_Level'].to_numpy() >= MASTERY_MAX_LEVEL,
+        'Mastery Levels': df['Mastery_Level'].fillna(0),
+    }).groupby(account, observed=True)
+    board = per_account.sum().astype(int)
+    board.insert(1, 'Total', per_account.size())
+    board.insert(2, 'Completion %', (board['Completed'] / board['Total'] * 100).round(1))
+
+    is_class = df['Category'].isin(CLASS_CATEGORIES).to_numpy() & completed.to_numpy()
+    class_counts = (df[is_class].groupby([account[is_class], df['Penance_Class'][is_class]], observed=True)
+                    .size().unstack(fill_value=0))
+    class_counts = class_counts.reindex(columns=[c for c in CLASSES if c in class_counts.columns])
+    board = board.join(class_counts).fillna({c: 0 for c in class_counts.columns})
+    board = board.astype({c: int for c in class_counts.columns})
+
+    names = df['Export_Account'].astype(object).groupby(account, observed=True).last()
+    board.insert(0, 'Account', names)
+    board = board.sort_values(['Completion %', 'Score'], ascending=False, kind='stable').rename_axis('Account ID').reset_index()
+    board.insert(0, 'Rank', np.arange(1, len(board) + 1))
+    board.insert(1, 'Account', board.pop('Account'))
+    return board
+
+
+def penance_rarity(table: pa.Table) -> pd.DataFrame:
+    """Share of accounts that completed each penance, rarest first.
+
+    Accounts whose export lacks a penance count as not having completed it.
+    """
+    df = _frame(table)
+    accounts = df['Account_ID'].nunique()
+    codes = df['_penance'].to_numpy()
+    _, first = np.unique(codes, return_index=True)
+    counts = np.bincount(codes, minlength=len(first))
+    completed = np.bincount(codes, weights=df['_completed'].to_numpy(), minlength=len(first)).astype(int)
+    rarity = df.iloc[first][['Achievement_ID', 'Title', 'Category', 'Penance_Class']].reset_index(drop=True)
+    rarity['Accounts'] = counts
+    rarity['Completed By'] = completed
+    rarity['Rarity'] = completed / accounts if accounts else np.nan
+    return rarity.sort_values(['Rarity', 'Achievement_ID'], kind='stable').reset_index(drop=True)
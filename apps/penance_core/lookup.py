@@ -0,0 +1,50 @@
+"""
+Achievement_ID-indexed view of an export, built once per load and shared by
+tracking, profile loading and any other by-ID lookups.
+
+Per-export derived tables (the exploded Stats_Detail sub-stats) are cached
+on the index, so they are parsed once per load rather than on every re-run.
+"""
+
+from functools import cached_property
+
+import pandas as pd
+
+from .stats import stats_table, weakest_stats
+
+
+class PenanceIndex:
+    """Rows of one export keyed by Achievement_ID."""
+
+    def __init__(self, df: pd.DataFrame):
+        rows = df[~df['Achievement_ID'].duplicated(keep='first')]
+        self.frame = rows.set_index('Achievement_ID', drop=False)
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    def __contains__(self, achievement_id) -> bool:
+        return achievement_id in self.frame.index
+
+    @cached_property
+    def stats(self) -> pd.DataFrame:
+        """Long sub-stat table (STATS_COLUMNS) of this export."""
+        return stats_table(self.frame.reset_index(drop=True))
+
+    @cached_property
+    def weakest(self) -> pd.DataFrame:
+        """WEAKEST_COLUMNS per multi-stat penance, indexed by Achievement_ID."""
+        return weakest_stats(self.stats)
+
+    def lookup(self, ids) -> tuple[pd.DataFrame, list[str]]:
+        """Rows for `ids` in the given order (duplicates dropped), plus the IDs not in this export."""
+        ids = list(dict.fromkeys(str(aid) for aid in ids))
+        positions = self.frame.index.get_indexer(ids)
+        found = positions >= 0
+        missing = [aid for aid, ok in zip(ids, found) if not ok]
+        return self.frame.iloc[positions[found]].reset_index(drop=True), missing
+
+    def records(self, ids) -> tuple[list[dict], list[str]]:
+        """`lookup` as a list of row dicts, the shape the tracked list keeps."""
+        rows, missing = self.lookup(ids)
+        return rows.to_dict('records'), missing
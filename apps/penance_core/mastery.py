@@ -0,0 +1,49 @@
+"""
+Weapon mastery from the Mastery_* columns the mod writes on
+`loc_weapon_progression_mastery` rows: one compact row per weapon pattern.
+
+XP/day compares the pattern's total XP between two snapshots of the account,
+aligned on the pattern ID for all weapons at once.
+"""
+
+import numpy as np
+import pandas as pd
+
+MASTERY_CATEGORY = 'loc_weapon_progression_mastery'
+MASTERY_MAX_LEVEL = 20
+
+MASTERY_COLUMNS = ['Weapon', 'Level', 'Levels_To_Max', 'XP', 'XP_Next_Level', 'XP_To_Next', 'Level_Progress']
+RATE_COLUMNS = ['XP_Per_Day', 'Days_To_Next']
+
+
+def mastery_table(df: pd.DataFrame) -> pd.DataFrame:
+    """MASTERY_COLUMNS per weapon pattern (e.g. 'chainaxe_p1'), highest level first."""
+    rows = df[(df['Category'] == MASTERY_CATEGORY).to_numpy() & df['Mastery_Level'].notna().to_numpy()]
+    rows = rows[~rows['Achievement_ID'].duplicated(keep='last')]
+    level = rows['Mastery_Level'].to_numpy(dtype=float)
+    xp = rows['Mastery_XP'].to_numpy(dtype=float)
+    next_xp = rows['Mastery_XP_Next_Level'].to_numpy(dtype=float)
+    maxed = level >= MASTERY_MAX_LEVEL
+
+    table = pd.DataFrame({
+        'Weapon': rows['Title'].astype(str).str.replace(r'\s*Mastery$', '', regex=True).to_numpy(),
+        'Level': level.astype(int),
+        'Levels_To_Max': np.maximum(MASTERY_MAX_LEVEL - level, 0).astype(int),
+        'XP': xp,
+        'XP_Next_Level': next_xp,
+        'XP_To_Next': np.where(maxed, 0, np.maximum(next_xp - xp, 0)),
+        'Level_Progress': np.where(maxed, 1.0, rows['Mastery_Progress_Percent'].to_numpy(dtype=float) / 100),
+    }, index=pd.Index(rows['Achievement_ID'].str.replace('mastery_complete_', '', regex=False).to_numpy(dtype=object),
+                      name='Pattern'))
+    return table.sort_values(['Level', 'Level_Progress'], ascending=False, kind='stable')
+
+
+def mastery_rates(old: pd.DataFrame, new: pd.DataFrame, old_time, new_time) -> pd.DataFrame:
+    """`new` (a mastery_table) plus RATE_COLUMNS: XP gained per day since `old` and days to the next level."""
+    old_time, new_time = pd.Timestamp(old_time), pd.Timestamp(new_time)
+    elapsed = (new_time - old_time) / pd.Timedelta(days=1) if pd.notna(old_time) and pd.notna(new_time) else np.nan
+    gained = new['XP'].to_numpy() - old['XP'].reindex(new.index).to_numpy()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rate = gained / elapsed if elapsed > 0 else np.full(len(new), np.nan)
+        days = np.where((rate > 0) & (new['Levels_To_Max'].to_numpy() > 0), new['XP_To_Next'].to_numpy() / rate, np.nan)
+    return new.assign(XP_Per_Day=rate, Days_To_Next=days)
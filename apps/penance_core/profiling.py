@@ -0,0 +1,143 @@
+"""
+Opt-in profiling of the notebooks' reactive runs.
+
+Instrumented cells run their body in `with profiler.cell(name) as run:` and
+set `run.rows`. Each run records the cell's wall time, the rows it processed
+and the bytes Python allocated meanwhile: peak and retained, from
+tracemalloc, which sees numpy/pandas buffers but not Arrow's memory pool.
+The run is recorded even when the body raises (including `mo.stop`).
+A disabled profiler records nothing and never starts tracemalloc.
+
+Turned on with PENANCE_HUNTER_PROFILE=1 (any other value is a path the JSON
+is also written to after every cell), or `?profile` in the notebook URL.
+"""
+
+import contextlib
+import json
+import os
+import time
+import tracemalloc
+from collections import deque
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+import pandas as pd
+
+PROFILE_COLUMNS = ['Runs', 'Last_ms', 'Mean_ms', 'Max_ms', 'Total_ms', 'Rows', 'Peak_Bytes', 'Net_Bytes']
+PROFILE_MAX_RECORDS = 1000
+
+_ON = {'1', 'true', 'yes', 'on'}
+_OFF = {'', '0', 'false', 'no', 'off'}
+
+
+@dataclass(frozen=True)
+class CellRun:
+    """One profiled run of one cell."""
+    cell: str
+    run: int
+    started: float  # epoch seconds
+    wall_ms: float
+    rows: int | None
+    peak_bytes: int
+    net_bytes: int
+
+
+class _Run:
+    """Handed out by `CellProfiler.cell`: set `rows` inside the block, `run` is filled in after it."""
+
+    def __init__(self):
+        self.rows = None
+        self.run = None
+
+
+class CellProfiler:
+    """Per-cell wall time, rows and allocations of the last `max_records` cell runs."""
+
+    def __init__(self, enabled: bool = False, path=None, max_records: int = PROFILE_MAX_RECORDS):
+        self.enabled = enabled
+        self.path = Path(path) if path else None
+        self.runs = deque(maxlen=max_records)
+        self._count = 0
+        if enabled and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @classmethod
+    def from_env(cls, query_value=None) -> "CellProfiler":
+        """Profiler configured from PENANCE_HUNTER_PROFILE, or the `profile` query parameter."""
+        value = os.environ.get("PENANCE_HUNTER_PROFILE", "").strip()
+        if value.lower() not in _OFF:
+            return cls(True, None if value.lower() in _ON else value)
+        if query_value is not None:
+            # A bare "?profile" turns it on
+            return cls(str(query_value).strip().lower() not in _OFF - {''})
+        return cls(False)
+
+    def start(self, cell: str):
+        """Begin timing `cell`; pass the result to `stop`."""
+        if not self.enabled:
+            return None
+        tracemalloc.reset_peak()
+        return cell, time.time(), time.perf_counter(), tracemalloc.get_traced_memory()[0]
+
+    def stop(self, token, rows: int | None = None) -> CellRun | None:
+        """Record the run begun by `start`, with the number of rows the cell processed."""
+        if token is None:
+            return None
+        cell, started, t0, before = token
+        wall_ms = (time.perf_counter() - t0) * 1000
+        current, peak = tracemalloc.get_traced_memory()
+        self._count += 1
+        run = CellRun(cell, self._count, started, round(wall_ms, 3), None if rows is None else int(rows),
+                      max(peak - before, 0), current - before)
+        self.runs.append(run)
+        if self.path is not None:
+            self.write()
+        return run
+
+    @contextlib.contextmanager
+    def cell(self, name: str):
+        """Profile the block as one run of cell `name`, recorded however the block exits."""
+        handle = _Run()
+        token = self.start(name)
+        try:
+            yield handle
+        finally:
+            handle.run = self.stop(token, handle.rows)
+
+    def records(self) -> pd.DataFrame:
+        """Every recorded run, oldest first."""
+        return pd.DataFrame([asdict(r) for r in self.runs], columns=list(CellRun.__dataclass_fields__))
+
+    def summary(self) -> pd.DataFrame:
+        """PROFILE_COLUMNS per cell (Rows and bytes from its last run), slowest total first."""
+        runs = self.records()
+        if runs.empty:
+            return pd.DataFrame(columns=PROFILE_COLUMNS).rename_axis('Cell')
+        wall = runs.groupby('cell', sort=False)['wall_ms']
+        last = runs.groupby('cell', sort=False).last()
+        out = pd.DataFrame({
+            'Runs': wall.size(),
+            'Last_ms': last['wall_ms'],
+            'Mean_ms': wall.mean().round(3),
+            'Max_ms': wall.max(),
+            'Total_ms': wall.sum().round(3),
+            'Rows': last['rows'].astype('Int64'),
+            'Peak_Bytes': last['peak_bytes'],
+            'Net_Bytes': last['net_bytes'],
+        })
+        return out.sort_values('Total_ms', ascending=False).rename_axis('Cell')
+
+    def to_json(self) -> str:
+        return json.dumps({
+            'runs': [asdict(r) for r in self.runs],
+            'summary': json.loads(self.summary().reset_index().to_json(orient='records')),
+        }, indent=2)
+
+    def write(self, path=None) -> Path:
+        """Write `to_json()` to `path` (default: the configured one), atomically."""
+        path = Path(path) if path else self.path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + '.tmp')
+        tmp.write_text(self.to_json(), encoding="utf-8")
+        os.replace(tmp, path)
+        return path
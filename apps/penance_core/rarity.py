@@ -0,0 +1,227 @@
+"""
+Persisted, incrementally updated rarity index over a corpus of exports.
+
+For every Achievement_ID the index keeps counters over each account's latest
+export: how many accounts have the penance, how many completed it, and a
+histogram of time-to-complete (days from the account's first completion,
+log-spaced bins) from which the median is estimated. A newer export of an
+account subtracts that account's previous contribution and adds the new one,
+so updating never rescans the corpus; exports not newer than what is indexed
+are skipped from their filename alone.
+
+Layout:
+    <root>/manifest.json                 indexed stamp/source per account
+    <root>/counters.parquet              per-penance counters + histogram
+    <root>/accounts/<account_id>.parquet that account's current contribution
+"""
+
+import json
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from .export import ExportFile, check_account_id, parse_export_filename
+
+RARITY_VERSION = 1
+
+# Time-to-complete histogram: bin 0 is [0, 1 hour), then log-spaced up to 10 years (the last bin is open)
+TTC_EDGES = np.r_[0.0, np.geomspace(1 / 24, 3650, 128)]
+TTC_BINS = len(TTC_EDGES) - 1
+
+MANIFEST = 'manifest.json'
+COUNTERS = 'counters.parquet'
+
+
+def default_rarity_dir() -> Path:
+    """Where the notebooks keep the index: in-memory FS under WASM, ~/.penance_hunter otherwise."""
+    if "pyodide" in sys.modules:
+        return Path("/tmp/penance_rarity")
+    return Path(os.environ.get("PENANCE_HUNTER_RARITY", Path.home() / ".penance_hunter" / "rarity"))
+
+
+def _contribution(table: pa.Table) -> pd.DataFrame:
+    """Per-penance (completed, time-to-complete bin) of one export; bin is -1 when not completed."""
+    df = table.select(['Achievement_ID', 'Status', 'Completion_Time']).to_pandas()
+    df = df[~df['Achievement_ID'].duplicated(keep='last')]
+    completed = (df['Status'] == 'Completed').to_numpy() & df['Completion_Time'].notna().to_numpy()
+    times = df['Completion_Time']
+    days = ((times - times[completed].min()) / pd.Timedelta(days=1)).to_numpy(dtype=float) if completed.any() else np.zeros(len(df))
+    bins = np.clip(np.searchsorted(TTC_EDGES, days, side='right') - 1, 0, TTC_BINS - 1)
+    return pd.DataFrame({
+        'Achievement_ID': df['Achievement_ID'].to_numpy(dtype=object),
+        'bin': np.where(completed, bins, -1).astype(np.int16),
+    })
+
+
+def _median_days(hist: np.ndarray) -> np.ndarray:
+    """Median of each histogram row, interpolated within its bin (log-scale above the first bin)."""
+    total = hist.sum(axis=1)
+    cum = hist.cumsum(axis=1)
+    half = total / 2
+    idx = np.minimum((cum < half[:, None]).sum(axis=1), TTC_BINS - 1)
+    rows = np.arange(len(hist))
+    before = np.where(idx > 0, cum[rows, np.maximum(idx - 1, 0)], 0)
+    frac = np.clip((half - before) / np.maximum(hist[rows, idx], 1), 0, 1)
+    lo, hi = TTC_EDGES[idx], TTC_EDGES[idx + 1]
+    median = np.where(idx == 0, hi * frac, lo * (hi / np.where(lo > 0, lo, 1)) ** frac)
+    return np.where(total > 0, median, np.nan)
+
+
+class RarityIndex:
+    """Completion rate and median time-to-complete per Achievement_ID across accounts."""
+
+    def __init__(self, root):
+        self.root = Path(root)
+        manifest = self.root / MANIFEST
+        self.manifest = json.loads(manifest.read_text(encoding="utf-8")) if manifest.exists() else {}
+        if self.manifest.get('version') != RARITY_VERSION:
+            self.manifest = {'version': RARITY_VERSION, 'accounts': {}}
+        counters = self.root / COUNTERS
+        if self.manifest['accounts'] and counters.exists():
+            table = pq.read_table(counters)
+            self._ids = {aid: i for i, aid in enumerate(table.column('Achievement_ID').to_pylist())}
+            self._accounts = table.column('accounts').to_numpy().astype(np.int64)
+            self._hist = table.column('ttc').combine_chunks().flatten().to_numpy().reshape(-1, TTC_BINS).astype(np.int64)
+        else:
+            self.manifest['accounts'] = {}
+            self._ids = {}
+            self._accounts = np.zeros(0, dtype=np.int64)
+            self._hist = np.zeros((0, TTC_BINS), dtype=np.int64)
+
+    @property
+    def accounts(self) -> dict[str, str]:
+        """Account ID -> stamp of the export currently indexed for it."""
+        return {account_id: entry['stamp'] for account_id, entry in self.manifest['accounts'].items()}
+
+    def _rows(self, ids) -> np.ndarray:
+        """Counter rows for `ids`, appending rows for unseen penances."""
+        new = [aid for aid in dict.fromkeys(ids) if aid not in self._ids]
+        if new:
+            self._ids.update({aid: len(self._ids) + i for i, aid in enumerate(new)})
+            self._accounts = np.r_[self._accounts, np.zeros(len(new), dtype=np.int64)]
+            self._hist = np.vstack([self._hist, np.zeros((len(new), TTC_BINS), dtype=np.int64)])
+        return np.fromiter((self._ids[aid] for aid in ids), dtype=np.int64, count=len(ids))
+
+    def _apply(self, contribution: pd.DataFrame, sign: int):
+        rows = self._rows(contribution['Achievement_ID'].tolist())
+        bins = contribution['bin'].to_numpy()
+        np.add.at(self._accounts, rows, sign)
+        done = bins >= 0
+        np.add.at(self._hist, (rows[done], bins[done]), sign)
+
+    def _account_path(self, account_id: str) -> Path:
+        return self.root / "accounts" / f"{check_account_id(account_id)}.parquet"
+
+    def add(self, contents: bytes, filename) -> bool:
+        """Index one export if it is newer than the account's indexed one. Returns whether it was used."""
+        return self.add_file(ExportFile(filename, contents))
+
+    def add_file(self, export: ExportFile) -> bool:
+        """`add` an ExportFile, reusing its table if it was already parsed.
+
+        Everything that can fail runs before the counters change, and they are
+        restored if writing the account's contribution fails, so an error
+        leaves the index as it was.
+        """
+        key = parse_export_filename(export.filename) or export.key
+        if key is None:
+            raise ValueError(f"cannot identify account/timestamp for {export.filename}")
+        indexed = self.manifest['accounts'].get(key.account_id)
+        if indexed and indexed['stamp'] >= key.stamp:
+            return False
+
+        contribution = _contribution(export.table)
+        path = self._account_path(key.account_id)
+        previous = pq.read_table(path).to_pandas() if indexed and path.exists() else None
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.tmp")
+        pq.write_table(pa.Table.from_pandas(contribution, preserve_index=False), tmp)
+
+        state = dict(self._ids), self._accounts.copy(), self._hist.copy()
+        try:
+            if previous is not None:
+                self._apply(previous, -1)
+            self._apply(contribution, +1)
+            os.replace(tmp, path)
+        except BaseException:
+            self._ids, self._accounts, self._hist = state
+            tmp.unlink(missing_ok=True)
+            raise
+        self.manifest['accounts'][key.account_id] = {'stamp': key.stamp, 'source': Path(str(export.filename)).name}
+        return True
+
+    def remove(self, account_id: str) -> bool:
+        """Drop an account's contribution and persist; returns whether it was indexed."""
+        if account_id not in self.manifest['accounts']:
+            return False
+        previous = self._account_path(account_id)
+        if previous.exists():
+            self._apply(pq.read_table(previous).to_pandas(), -1)
+            previous.unlink()
+        del self.manifest['accounts'][account_id]
+        self.save()
+        return True
+
+    def update(self, exports) -> tuple[int, list[tuple[str, str]]]:
+        """Index ExportFiles or (filename, contents) pairs and persist.
+
+        `contents` may be a callable returning the bytes, so already-indexed
+        files are skipped without being read. Returns (exports used, skipped
+        files): a file that can't be indexed is skipped as (filename, reason),
+        leaving the index untouched, and the rest of the batch is still saved.
+        """
+        used = 0
+        skipped = []
+        for export in exports:
+            name = export.filename if isinstance(export, ExportFile) else export[0]
+            try:
+                if not isinstance(export, ExportFile):
+                    key = parse_export_filename(name)
+                    indexed = self.manifest['accounts'].get(key.account_id) if key else None
+                    if indexed and indexed['stamp'] >= key.stamp:
+                        continue
+                    contents = export[1]
+                    export = ExportFile(name, contents() if callable(contents) else contents)
+                used += self.add_file(export)
+            except (ValueError, OSError) as e:
+                skipped.append((name, str(e)))
+        if used:
+            self.save()
+        return used, skipped
+
+    def update_dir(self, directory) -> tuple[int, list[tuple[str, str]]]:
+        """Index every export CSV in `directory` that is newer than what is indexed for its account."""
+        paths = sorted(Path(directory).glob("*.csv"))
+        return self.update((p.name, p.read_bytes) for p in paths)
+
+    def save(self):
+        self.root.mkdir(parents=True, exist_ok=True)
+        hist = pa.FixedSizeListArray.from_arrays(pa.array(self._hist.ravel(), pa.int32()), TTC_BINS)
+        table = pa.table({
+            'Achievement_ID': pa.array(list(self._ids), pa.string()),
+            'accounts': pa.array(self._accounts, pa.int32()),
+            'ttc': hist,
+        })
+        tmp = self.root / f"{COUNTERS}.tmp"
+        pq.write_table(table, tmp)
+        os.replace(tmp, self.root / COUNTERS)
+        tmp = self.root / f"{MANIFEST}.tmp"
+        tmp.write_text(json.dumps(self.manifest, indent=2), encoding="utf-8")
+        os.replace(tmp, self.root / MANIFEST)
+
+    def frame(self) -> pd.DataFrame:
+        """Per-penance index: Accounts (that have it), Completed, Rarity (% of indexed
+        accounts that completed it) and Median_Days to complete, indexed by Achievement_ID."""
+        completed = self._hist.sum(axis=1)
+        accounts = len(self.manifest['accounts'])
+        return pd.DataFrame({
+            'Accounts': self._accounts,
+            'Completed': completed,
+            'Rarity': np.round(completed / accounts * 100, 1) if accounts else np.nan,
+            'Median_Days': np.round(_median_days(self._hist), 1),
+        }, index=pd.Index(list(self._ids), name='Achievement_ID', dtype=object))
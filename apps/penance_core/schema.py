@@ -0,0 +1,101 @@
+"""
+Fixed, versioned schema for the 21 data columns of a penance export, read
+with the pyarrow CSV engine so every column is typed at read time.
+
+Bump SCHEMA_VERSION whenever a column's stored type changes.
+"""
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+
+SCHEMA_VERSION = 1
+
+_DICT = pa.dictionary(pa.int32(), pa.string())
+
+EXPORT_SCHEMA = pa.schema([
+    ('Export_Account', _DICT),
+    ('Export_Platform', _DICT),
+    ('Export_Character', _DICT),
+    ('Export_Archetype', _DICT),
+    ('Export_Mod_Date', _DICT),
+    ('Achievement_ID', pa.string()),
+    ('Category', _DICT),
+    ('Icon', pa.string()),
+    ('Title', pa.string()),
+    ('Description', pa.string()),
+    ('Status', _DICT),
+    ('Progress', pa.int64()),
+    ('Goal', pa.int64()),
+    ('Progress_Percentage', pa.float64()),  # "200%" in the CSV -> 2.0
+    ('Completion_Time', pa.timestamp('s')),
+    ('Score', pa.int64()),
+    ('Stats_Detail', pa.string()),
+    ('Mastery_Level', pa.float64()),
+    ('Mastery_XP', pa.float64()),
+    ('Mastery_XP_Next_Level', pa.float64()),
+    ('Mastery_Progress_Percent', pa.float64()),
+])
+CSV_COLUMNS = EXPORT_SCHEMA.names
+# Present in every mod version (Mastery_* arrived later)
+REQUIRED_COLUMNS = CSV_COLUMNS[:17]
+
+# Columns the CSV reader can't convert directly; fixed up after reading
+_RAW_TYPES = {'Progress_Percentage': pa.string()}
+
+# Some descriptions span lines; block boundaries must not split them
+_PARSE_OPTIONS = pacsv.ParseOptions(newlines_in_values=True)
+
+_CONVERT_OPTIONS = pacsv.ConvertOptions(
+    column_types={f.name: _RAW_TYPES.get(f.name, f.type) for f in EXPORT_SCHEMA},
+    include_columns=CSV_COLUMNS,
+    include_missing_columns=True,  # older mod versions lack the Mastery_* columns
+    strings_can_be_null=True,
+    timestamp_parsers=['%Y-%m-%d %H:%M:%S'],
+)
+
+
+def _parse_percentage(column: pa.ChunkedArray) -> pa.ChunkedArray:
+    stripped = pc.utf8_rtrim(column, characters='%')
+    stripped = pc.if_else(pc.equal(stripped, ''), pa.scalar(None, pa.string()), stripped)
+    return pc.divide(pc.cast(stripped, pa.float64()), 100.0)
+
+
+def _header_names(body: pa.Buffer) -> list[str]:
+    head = body[:4096].to_pybytes().lstrip(b'\r\n')
+    return head.split(b'\n', 1)[0].decode('utf-8', 'replace').strip().split(',')
+
+
+def check_columns(names: list[str]):
+    """Raise ValueError unless the CSV header `names` has every REQUIRED_COLUMNS entry."""
+    missing = [name for name in REQUIRED_COLUMNS if name not in names]
+    if missing:
+        raise ValueError(f"not a penance export, missing columns: {', '.join(missing)}")
+
+
+def _conform(data):
+    """Fix up the columns the CSV reader reads raw, then cast a table or batch to EXPORT_SCHEMA."""
+    idx = data.schema.get_field_index('Progress_Percentage')
+    if data.schema.field(idx).type != pa.float64():
+        data = data.set_column(idx, 'Progress_Percentage', _parse_percentage(data.column(idx)))
+    return data.cast(EXPORT_SCHEMA)
+
+
+def read_table(body) -> pa.Table:
+    """Read the CSV body (bytes or pa.Buffer) into a table with EXPORT_SCHEMA."""
+    body = pa.py_buffer(body) if not isinstance(body, pa.Buffer) else body
+    check_columns(_header_names(body))
+    return _conform(pacsv.read_csv(pa.BufferReader(body), parse_options=_PARSE_OPTIONS, convert_options=_CONVERT_OPTIONS))
+
+
+def read_batches(source, block_size: int):
+    """Stream a CSV body (a binary file object) as EXPORT_SCHEMA record batches of about
+    `block_size` bytes of input each; only one block is held in memory at a time."""
+    reader = pacsv.open_csv(
+        source,
+        read_options=pacsv.ReadOptions(block_size=block_size, use_threads=False),
+        parse_options=_PARSE_OPTIONS,
+        convert_options=_CONVERT_OPTIONS,
+    )
+    for batch in reader:
+        yield _conform(batch)
@@ -0,0 +1,91 @@
+"""
+Token inverted index over Title, Description and Achievement_ID.
+
+Built once per export: every lowercase word becomes a posting list of
+(row, weight) pairs, stored CSR-style against a sorted vocabulary so each
+query word is a binary search plus a slice. Query words also match as
+prefixes ("volley" finds "volley_fire"), at a lower weight than an exact hit.
+"""
+
+import re
+
+import numpy as np
+import pandas as pd
+
+# Column -> weight of a hit in that column
+SEARCH_COLUMNS = {'Title': 3.0, 'Achievement_ID': 2.0, 'Description': 1.0}
+TOKEN_RE = re.compile(r'[a-z0-9]+')
+PREFIX_WEIGHT = 0.5
+
+
+def tokenize(text: str) -> list[str]:
+    return TOKEN_RE.findall(text.lower())
+
+
+class SearchIndex:
+    """Ranked AND-search over the rows of one frame (positional row numbers)."""
+
+    def __init__(self, df: pd.DataFrame, columns: dict = SEARCH_COLUMNS):
+        self.size = len(df)
+        postings = []
+        for col, weight in columns.items():
+            if col not in df.columns:
+                continue
+            # Achievement_ID words are split on '_' too, so IDs match by their parts
+            tokens = df[col].astype('string').str.lower().str.findall(TOKEN_RE.pattern)
+            tokens = pd.Series(tokens.to_numpy(), index=np.arange(self.size)).explode().dropna()
+            postings.append(pd.DataFrame({'token': tokens.to_numpy(dtype=object), 'row': tokens.index, 'weight': weight}))
+
+        if postings:
+            postings = pd.concat(postings, ignore_index=True)
+            # Best column per (token, row), sorted by token so each token is one contiguous slice
+            postings = postings.groupby(['token', 'row'], sort=True)['weight'].max().reset_index()
+        else:
+            postings = pd.DataFrame({'token': [], 'row': [], 'weight': []})
+
+        tokens = postings['token'].to_numpy(dtype=object)
+        self.vocab, starts = np.unique(tokens, return_index=True)
+        self.vocab = self.vocab.astype(str)
+        self.offsets = np.append(starts, len(tokens))
+        self.rows = postings['row'].to_numpy(dtype=np.int64)
+        self.weights = postings['weight'].to_numpy(dtype=np.float64)
+
+    def __len__(self) -> int:
+        return len(self.vocab)
+
+    def _term_scores(self, term: str) -> np.ndarray:
+        """Per-row score for one query word: exact token hits plus prefix hits."""
+        scores = np.zeros(self.size)
+        lo = np.searchsorted(self.vocab, term, side='left')
+        hi = np.searchsorted(self.vocab, term + '\uffff', side='left')
+        if lo == hi:
+            return scores
+        start, stop = self.offsets[lo], self.offsets[hi]
+        rows, weights = self.rows[start:stop], self.weights[start:stop].copy()
+        if self.vocab[lo] == term:
+            weights[self.offsets[lo + 1] - start:] *= PREFIX_WEIGHT
+        else:
+            weights *= PREFIX_WEIGHT
+        np.maximum.at(scores, rows, weights)
+        return scores
+
+    def scores(self, query: str) -> np.ndarray:
+        """Per-row relevance for `query`; 0 where any query word is missing."""
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return np.ones(self.size)
+        total = np.zeros(self.size)
+        matched = np.ones(self.size, dtype=bool)
+        for term in terms:
+            term_scores = self._term_scores(term)
+            matched &= term_scores > 0
+            total += term_scores
+        return np.where(matched, total, 0.0)
+
+    def search(self, query: str) -> np.ndarray:
+        """Matching row positions, best first (ties keep frame order). Empty query -> every row."""
+        if not tokenize(query):
+            return np.arange(self.size)
+        scores = self.scores(query)
+        hits = np.flatnonzero(scores)
+        return hits[np.argsort(-scores[hits], kind='stable')]
@@ -0,0 +1,49 @@
+"""
+Sub-stats packed into Stats_Detail by `perform_export` ("stat_a: 3/5; stat_b: 1/1"),
+exploded into a long table in one `str.extractall` pass.
+"""
+
+import numpy as np
+import pandas as pd
+
+STATS_COLUMNS = ['Achievement_ID', 'stat_name', 'value', 'target']
+
+# One "name: value/target" part; parts are joined with "; "
+STAT_PATTERN = r'(?:^|;)\s*(?P<stat_name>[^;]+?): (?P<value>-?\d+)/(?P<target>\d+)\s*(?=;|$)'
+
+WEAKEST_COLUMNS = ['Weakest_Stat', 'Weakest_Value', 'Weakest_Target', 'Weakest_Progress', 'Stats_Done', 'Stats_Total']
+
+
+def stats_table(df: pd.DataFrame) -> pd.DataFrame:
+    """STATS_COLUMNS with one row per sub-stat of every penance that has a Stats_Detail."""
+    detail = df['Stats_Detail']
+    has_stats = detail.notna().to_numpy() & (detail.astype(str).str.len() > 0).to_numpy()
+    if not has_stats.any():
+        return pd.DataFrame({'Achievement_ID': pd.Series(dtype=object), 'stat_name': pd.Series(dtype=object),
+                             'value': pd.Series(dtype=np.int64), 'target': pd.Series(dtype=np.int64)})
+    parts = detail[has_stats].astype(str).reset_index(drop=True).str.extractall(STAT_PATTERN)
+    rows = parts.index.get_level_values(0)
+    return pd.DataFrame({
+        'Achievement_ID': df['Achievement_ID'].to_numpy(dtype=object)[has_stats][rows],
+        'stat_name': parts['stat_name'].to_numpy(dtype=object),
+        'value': parts['value'].astype(np.int64).to_numpy(),
+        'target': parts['target'].astype(np.int64).to_numpy(),
+    })
+
+
+def weakest_stats(stats: pd.DataFrame) -> pd.DataFrame:
+    """Per Achievement_ID, the sub-stat furthest from its target (value/target, capped at 1)
+    and how many sub-stats are done."""
+    progress = np.where(stats['target'] > 0, np.minimum(stats['value'] / stats['target'].where(stats['target'] > 0), 1.0), 1.0)
+    stats = stats.assign(_progress=progress, _done=progress >= 1.0)
+    weakest = stats.sort_values(['Achievement_ID', '_progress'], kind='stable').drop_duplicates('Achievement_ID')
+    per_penance = stats.groupby('Achievement_ID', sort=False)['_done'].agg(['sum', 'size'])
+    out = pd.DataFrame({
+        'Weakest_Stat': weakest['stat_name'].to_numpy(),
+        'Weakest_Value': weakest['value'].to_numpy(),
+        'Weakest_Target': weakest['target'].to_numpy(),
+        'Weakest_Progress': weakest['_progress'].to_numpy(),
+    }, index=pd.Index(weakest['Achievement_ID'].to_numpy(dtype=object), name='Achievement_ID'))
+    out['Stats_Done'] = per_penance['sum'].reindex(out.index).astype(int).to_numpy()
+    out['Stats_Total'] = per_penance['size'].reindex(out.index).astype(int).to_numpy()
+    return out
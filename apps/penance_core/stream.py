@@ -0,0 +1,210 @@
+"""
+Streaming reads of export files that may not fit in memory, or that hold
+several exports concatenated one after another (each with its own `#`
+header block).
+
+The source is read in fixed-size blocks. Each export's body is handed to the
+pyarrow CSV reader as a file object that ends at the next `#` line, so rows
+arrive as bounded record batches and peak memory is one block plus one batch,
+whatever the file size. A `#` line inside a quoted field (e.g. a multi-line
+Description) is part of the body, not a header.
+"""
+
+import hashlib
+import io
+from collections.abc import Iterator
+
+import pyarrow as pa
+
+from .export import ExportKey, ExportMetadata, export_key, parse_header, split_export
+from .schema import check_columns, read_batches
+
+# Bytes of CSV per record batch (and per read from the source)
+EXPORT_BATCH_BYTES = 1 << 20
+
+
+def _next_header(data, start: int, quoted: bool = False) -> int:
+    """Offset of the first newline at or after `start` that begins a `#` line outside a quoted
+    CSV field, or -1. `quoted` says whether `start` itself is inside quotes."""
+    pos = start
+    while (cut := data.find(b'\n#', pos)) != -1:
+        # Escaped quotes ("") come in pairs, so the count's parity says whether a field is open
+        quoted ^= data.count(b'"', pos, cut) % 2 == 1
+        if not quoted:
+            return cut
+        pos = cut + 1
+    return -1
+
+
+class _Segments:
+    """Block reader over a byte stream that stops at every `#` header block."""
+
+    def __init__(self, source, block_size: int):
+        self._source = source
+        self._block_size = block_size
+        self._buf = bytearray()
+        self._eof = False
+        self._line_start = True
+        self._quoted = False  # inside a quoted field of the current body
+        self.sha256 = hashlib.sha256()
+
+    def _fill(self) -> bool:
+        if self._eof:
+            return False
+        chunk = self._source.read(self._block_size)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buf += chunk
+        return True
+
+    def _line_end(self) -> int:
+        """End (exclusive) of the first buffered line, reading more as needed; 0 at end of stream."""
+        while True:
+            end = self._buf.find(b'\n')
+            if end >= 0:
+                return end + 1
+            if not self._fill():
+                return len(self._buf)
+
+    def _take(self, n: int) -> bytes:
+        data = bytes(self._buf[:n])
+        del self._buf[:n]
+        if data:
+            self._line_start = data.endswith(b'\n')
+        self.sha256.update(data)
+        return data
+
+    def header(self) -> bytes | None:
+        """The next export's `#` header block, or None at the end of the stream.
+
+        Blank lines between exports are skipped; a leading export without a
+        header gets an empty block.
+        """
+        while (end := self._line_end()) and not self._buf[:end].strip():
+            del self._buf[:end]
+        if not self._buf:
+            return None
+        self.sha256 = hashlib.sha256()
+        self._quoted = False
+        lines = []
+        while self._buf.startswith(b'#'):
+            lines.append(self._take(self._line_end()))
+        return b''.join(lines)
+
+    def columns(self) -> list[str]:
+        """Column names from the CSV header line of the current body, without consuming it."""
+        pos = 0
+        while True:
+            end = self._buf.find(b'\n', pos)
+            if end == -1 and self._fill():
+                continue
+            line = bytes(self._buf[pos:end if end >= 0 else len(self._buf)])
+            if line.strip() or end == -1:
+                return line.decode('utf-8', 'replace').strip().split(',')
+            pos = end + 1
+
+    def body(self, size: int) -> bytes:
+        """Up to `size` bytes of the current body; b'' once the next `#` line (or the end) is reached."""
+        while True:
+            if self._buf and self._line_start and not self._quoted and self._buf[0] == ord('#'):
+                return b''
+            cut = _next_header(self._buf, 0, self._quoted)
+            if cut >= 0:
+                limit = cut + 1
+            elif self._eof:
+                limit = len(self._buf)
+            else:
+                # A trailing newline might be followed by the next header's '#'
+                limit = len(self._buf) - 1
+            if limit > 0 or self._eof:
+                data = self._take(min(size, limit))
+                self._quoted ^= data.count(b'"') % 2 == 1
+                return data
+            self._fill()
+
+
+class _Body(io.RawIOBase):
+    """File object over one export's CSV body, for the pyarrow reader."""
+
+    def __init__(self, segments: _Segments):
+        self._segments = segments
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        data = self._segments.body(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+
+class ExportPart:
+    """One export of a stream: its header metadata and an iterator of its row batches."""
+
+    def __init__(self, index: int, meta: ExportMetadata, batches: Iterator[pa.RecordBatch], segments: _Segments):
+        self.index = index
+        self.meta = meta
+        self.batches = batches
+        self._sha256 = segments.sha256
+
+    def key(self, filename=None) -> ExportKey | None:
+        """Key of this export. The filename's timestamp only applies to the first export in a
+        file; later ones are keyed by their header's Account ID and Export Date."""
+        return export_key(self.meta, filename if self.index == 0 else None)
+
+    @property
+    def sha256(self) -> str:
+        """Digest of this export's bytes (header + body), complete once `batches` is exhausted.
+        Matches the digest of a file holding just this export."""
+        return self._sha256.hexdigest()
+
+
+def iter_exports(source, block_size: int = EXPORT_BATCH_BYTES) -> Iterator[ExportPart]:
+    """Stream the exports in a binary file object, in file order.
+
+    Each part's `batches` must be consumed before advancing to the next part;
+    whatever is left of it is skipped.
+    """
+    segments = _Segments(source, block_size)
+    index = 0
+    while (header := segments.header()) is not None:
+        check_columns(segments.columns())
+        yield ExportPart(index, parse_header(header), read_batches(_Body(segments), block_size), segments)
+        while segments.body(block_size):
+            pass
+        index += 1
+
+
+def export_parts(contents: bytes, filename=None) -> list[tuple[str, bytes]]:
+    """Split in-memory `contents` into one (filename, contents) pair per export.
+
+    A single export comes back as-is. Exports after the first of a
+    concatenated file are named `<account_id>_<YYYYMMDD>_<HHMMSS>.csv` from
+    their header, so filename-keyed code sees each one as its own file.
+    """
+    bounds = []
+    pos = 0
+    while pos < len(contents):
+        end = contents.find(b'\n', pos)
+        line_end = len(contents) if end == -1 else end + 1
+        if not contents[pos:line_end].strip():
+            pos = line_end
+            continue
+        body_start = pos + split_export(contents[pos:pos + 65536])
+        cut = _next_header(contents, body_start)
+        end = len(contents) if cut == -1 else cut + 1
+        bounds.append((pos, end))
+        pos = end
+    if len(bounds) <= 1:
+        return [(filename, contents)]
+
+    parts = []
+    for i, (start, end) in enumerate(bounds):
+        part = contents[start:end]
+        name = filename
+        if i:
+            key = export_key(parse_header(part[:split_export(part)]))
+            name = f"{key.account_id}_{key.stamp}.csv" if key else filename
+        parts.append((name, part))
+    return parts
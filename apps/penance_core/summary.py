@@ -0,0 +1,134 @@
+"""
+Account/category/class summaries shown in the notebook header and written
+by the batch CLI. `SummaryAccumulator` builds the same summary from record
+batches of a streamed export, keeping only running totals.
+"""
+
+from dataclasses import asdict
+
+import pandas as pd
+
+from .classification import CLASS_CATEGORIES, CLASSES, EXPLORATION_REGEX
+from .export import ExportKey, ExportMetadata
+
+TACTICAL_CATEGORIES = [
+    'loc_achievement_category_offensive_label',
+    'loc_achievement_category_defensive_label',
+    'loc_achievement_category_teamplay_label',
+]
+MISSION_CATEGORIES = [
+    'loc_achievement_subcategory_missions_general_label',
+    'loc_achievement_subcategory_missions_auric_label',
+    'loc_achievement_subcategory_missions_havoc_label',
+    'loc_achievement_subcategory_missions_survival_label',
+]
+WEAPON_CATEGORIES = ['loc_weapon_progression_mastery', 'loc_achievement_category_weapons_label']
+
+# Everything not in here (and not exploration) counts as an Endeavour
+GROUPED_CATEGORIES = CLASS_CATEGORIES + [
+    'loc_achievement_category_account_label',
+    *TACTICAL_CATEGORIES,
+    'loc_achievement_category_heretics_label',
+    *MISSION_CATEGORIES,
+    'loc_achievement_subcategory_twins_mission_label',
+    *WEAPON_CATEGORIES,
+]
+
+SUMMARY_GROUPS = ['Account', 'Tactical', 'Heretical', 'Missions', 'Exploration', 'Endeavours', 'Weapons']
+
+
+def group_masks(df: pd.DataFrame) -> dict[str, pd.Series]:
+    """Boolean row masks for the header's category groups (groups may overlap)."""
+    category = df['Category']
+    exploration_id = df['Achievement_ID'].str.contains(EXPLORATION_REGEX, case=False, na=False)
+    return {
+        'Account': category.isin(['loc_achievement_category_account_label']),
+        'Tactical': category.isin(TACTICAL_CATEGORIES),
+        'Heretical': category.isin(['loc_achievement_category_heretics_label']),
+        'Missions': category.isin(MISSION_CATEGORIES),
+        'Exploration': exploration_id | category.isin(['loc_achievement_subcategory_twins_mission_label']),
+        'Endeavours': ~category.isin(GROUPED_CATEGORIES) & ~exploration_id,
+        'Weapons': category.isin(WEAPON_CATEGORIES),
+    }
+
+
+def category_summary(df: pd.DataFrame) -> pd.DataFrame:
+    """Completed / in-progress counts per SUMMARY_GROUPS entry."""
+    completed = (df['Status'] == 'Completed').to_numpy()
+    in_progress = (df['Status'] == 'In Progress').to_numpy()
+    rows = {}
+    for group, mask in group_masks(df).items():
+        mask = mask.to_numpy()
+        rows[group] = {
+            'completed': int((mask & completed).sum()),
+            'in_progress': int((mask & in_progress).sum()),
+            'total': int(mask.sum()),
+        }
+    return pd.DataFrame.from_dict(rows, orient='index')
+
+
+def class_summary(df: pd.DataFrame) -> pd.DataFrame:
+    """Total / completed / pct of class penances per Penance_Class (needs `classify` first)."""
+    class_df = df[df['Category'].isin(CLASS_CATEGORIES)]
+    summary = class_df.groupby('Penance_Class', observed=True)['Status'].agg(
+        total='size',
+        completed=lambda s: (s == 'Completed').sum()
+    ).astype({'total': int, 'completed': int})
+    summary['pct'] = (summary['completed'] / summary['total'] * 100).round(0).astype(int)
+    return summary
+
+
+class SummaryAccumulator:
+    """Running totals behind `export_summary`, fed one classified frame (or batch) at a time."""
+
+    def __init__(self):
+        self.total = 0
+        self.completed = 0
+        self.score = 0
+        self.first = pd.NaT
+        self.last = pd.NaT
+        self.categories = pd.DataFrame(0, index=SUMMARY_GROUPS, columns=['completed', 'in_progress', 'total'])
+        self.classes = pd.DataFrame(columns=['total', 'completed'], dtype=int)
+
+    def add(self, df: pd.DataFrame):
+        completed = df[df['Status'] == 'Completed']
+        self.total += len(df)
+        self.completed += len(completed)
+        self.score += int(completed['Score'].sum())
+        times = completed['Completion_Time']
+        self.first = min((t for t in (self.first, times.min()) if pd.notna(t)), default=pd.NaT)
+        self.last = max((t for t in (self.last, times.max()) if pd.notna(t)), default=pd.NaT)
+        self.categories += category_summary(df)
+        self.classes = self.classes.add(class_summary(df)[['total', 'completed']], fill_value=0).astype(int)
+
+    def summary(self, meta: ExportMetadata, key: ExportKey | None = None) -> dict:
+        classes = self.classes.reindex([c for c in CLASSES if c in self.classes.index])
+        classes['pct'] = (classes['completed'] / classes['total'] * 100).round(0).astype(int)
+        return {
+            'account_id': key.account_id if key else meta.account_id,
+            'stamp': key.stamp if key else None,
+            'account': meta.account,
+            'platform': meta.platform,
+            'mod_version': meta.mod_version,
+            'export_character': meta.export_character,
+            'export_date': meta.export_date,
+            'account_level': meta.account_level,
+            'account_true_level': meta.account_true_level,
+            'account_prestige': meta.account_prestige,
+            'total': self.total,
+            'completed': self.completed,
+            'completion_pct': round(self.completed / self.total * 100, 1) if self.total else 0.0,
+            'score': self.score,
+            'first_completion': self.first.isoformat() if pd.notna(self.first) else None,
+            'latest_completion': self.last.isoformat() if pd.notna(self.last) else None,
+            'categories': self.categories.to_dict(orient='index'),
+            'classes': classes.to_dict(orient='index'),
+            'characters': [asdict(c) for c in meta.characters],
+        }
+
+
+def export_summary(meta: ExportMetadata, df: pd.DataFrame, key: ExportKey | None = None) -> dict:
+    """JSON-ready summary of one classified export."""
+    summary = SummaryAccumulator()
+    summary.add(df)
+    return summary.summary(meta, key)
@@ -0,0 +1,114 @@
+"""
+Cumulative completion timeline behind the progress chart.
+
+Completed penances are sorted by class and time once per export, with a
+running per-class count. A date window is then two binary searches per class
+on the sorted times; counts inside the window are re-based by subtracting the
+number of completions before its start, so nothing is re-sorted or regrouped.
+"""
+
+import numpy as np
+import pandas as pd
+
+TIMELINE_COLUMNS = ['Penance_Class', 'Completion_Time', 'Title', 'Score']
+COUNT_COLUMN = 'CCOUNT_PER_CLASS'
+
+# What the chart spec actually embeds, and how many points it may carry in total
+CHART_COLUMNS = ['Penance_Class', 'Completion_Time', COUNT_COLUMN, 'Title']
+CHART_MAX_POINTS = 1500
+
+
+def _as_datetime64(value) -> np.datetime64:
+    return pd.Timestamp(value).to_datetime64()
+
+
+class Timeline:
+    """Per-class cumulative completion counts for one export."""
+
+    def __init__(self, completed_df: pd.DataFrame, group: str = 'Penance_Class', columns=TIMELINE_COLUMNS):
+        df = completed_df.loc[completed_df['Completion_Time'].notna(), [c for c in columns if c in completed_df.columns]]
+        df = df.sort_values([group, 'Completion_Time'], kind='stable').reset_index(drop=True)
+        df[COUNT_COLUMN] = df.groupby(group, observed=True).cumcount() + 1
+        self.frame = df
+        self.times = df['Completion_Time'].to_numpy()
+        codes, classes = pd.factorize(df[group])
+        starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]]) if len(codes) else np.array([], dtype=int)
+        stops = np.r_[starts[1:], len(codes)]
+        self.bounds = {cls: (int(start), int(stop)) for cls, start, stop in zip(classes, starts, stops)}
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    @property
+    def start(self) -> pd.Timestamp:
+        return pd.Timestamp(self.times.min()) if len(self.times) else pd.NaT
+
+    @property
+    def end(self) -> pd.Timestamp:
+        return pd.Timestamp(self.times.max()) if len(self.times) else pd.NaT
+
+    def window(self, classes=None, start=None, end=None) -> tuple[pd.DataFrame, pd.DataFrame]:
+        """Rows with start <= Completion_Time <= end for `classes` (default: all), counts
+        re-based to 1 at the window start, plus each class's last point in the window."""
+        lo_t = _as_datetime64(start) if start is not None else None
+        hi_t = _as_datetime64(end) if end is not None else None
+        positions, offsets, last = [], [], []
+        for cls, (first, stop) in self.bounds.items():
+            if classes is not None and cls not in classes:
+                continue
+            times = self.times[first:stop]
+            lo = first + (int(np.searchsorted(times, lo_t, side='left')) if lo_t is not None else 0)
+            hi = first + (int(np.searchsorted(times, hi_t, side='right')) if hi_t is not None else len(times))
+            if hi <= lo:
+                continue
+            positions.append(np.arange(lo, hi))
+            offsets.append(np.full(hi - lo, lo - first))
+            last.append(hi - 1)
+
+        if not positions:
+            empty = self.frame.iloc[:0]
+            return empty, empty
+        positions = np.concatenate(positions)
+        window = self.frame.iloc[positions].reset_index(drop=True)
+        window[COUNT_COLUMN] = window[COUNT_COLUMN].to_numpy() - np.concatenate(offsets)
+        last_points = window.iloc[np.searchsorted(positions, last)].reset_index(drop=True)
+        return window, last_points
+
+
+def lttb(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """Largest-Triangle-Three-Buckets: indices of `threshold` points that keep the
+    shape of the (x, y) line, always including the first and last point."""
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    every = (n - 2) / (threshold - 2)
+    picked = np.empty(threshold, dtype=np.int64)
+    picked[0], picked[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        start, stop = int(i * every) + 1, int((i + 1) * every) + 1
+        next_stop = min(int((i + 2) * every) + 1, n)
+        avg_x, avg_y = x[stop:next_stop].mean(), y[stop:next_stop].mean()
+        area = np.abs((x[a] - avg_x) * (y[start:stop] - y[a]) - (x[a] - x[start:stop]) * (avg_y - y[a]))
+        a = start + int(np.argmax(area))
+        picked[i + 1] = a
+    return picked
+
+
+def chart_points(window: pd.DataFrame, max_points: int = CHART_MAX_POINTS, columns=CHART_COLUMNS) -> pd.DataFrame:
+    """Project a `Timeline.window` onto the chart columns and LTTB-downsample each class
+    to its share of `max_points`. Narrow date ranges fit the budget and are drawn in full;
+    every class keeps its exact first and last point, so endpoint markers stay on the line."""
+    window = window[[c for c in columns if c in window.columns]]
+    if len(window) <= max_points:
+        return window
+    x = window['Completion_Time'].to_numpy().astype('int64').astype(np.float64)
+    y = window[COUNT_COLUMN].to_numpy(dtype=np.float64)
+    codes = pd.factorize(window['Penance_Class'])[0]
+    starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+    stops = np.r_[starts[1:], len(codes)]
+    keep = []
+    for start, stop in zip(starts, stops):
+        budget = max(3, int(max_points * (stop - start) / len(window)))
+        keep.append(start + lttb(x[start:stop], y[start:stop], budget))
+    return window.iloc[np.concatenate(keep)].reset_index(drop=True)
@@ -0,0 +1,140 @@
+"""
+Named, index-based views over the one canonical frame of an export.
+
+Defining a view stores only what it selects: row positions (from a mask
+and/or a sort order), a default column projection and any derived columns,
+aligned to the canonical rows. Rows and columns are taken from the
+canonical frame when a cell asks for the view, and only those. With pandas
+copy-on-write enabled, an all-rows view and derived columns share the
+canonical buffers until someone writes to them; without it, an all-rows view
+is copied up front so writes never reach the canonical frame.
+
+`sizes()` reports what frames derived from the export cost on their own, so
+repeated filter changes can be checked for a flat footprint. Each notebook
+cell returns the sizes of the frames it creates and `memory_table` combines
+them, so nothing is recorded on the shared object from other cells.
+"""
+
+import numpy as np
+import pandas as pd
+
+VIEW_MEMORY_COLUMNS = ['Rows', 'Columns', 'Position_Bytes', 'Derived_Bytes', 'Owned_Bytes', 'Shared_Bytes']
+
+CANONICAL = '(canonical)'
+
+
+def _buffer(series: pd.Series) -> np.ndarray:
+    """The ndarray behind a column (codes for categoricals), for buffer-sharing checks."""
+    array = series.array
+    return np.asarray(array.codes if isinstance(array, pd.Categorical) else array)
+
+
+class ExportViews:
+    """Lazy row/column views of one export frame, with per-view memory accounting."""
+
+    def __init__(self, frame: pd.DataFrame):
+        self.frame = frame
+        self._specs = {}  # name -> (positions or None, default columns or None, derived columns)
+
+    def __contains__(self, name) -> bool:
+        return name in self._specs
+
+    def add(self, name: str, rows=None, order=None, columns=None, derived: dict | None = None) -> "ExportViews":
+        """Define (or redefine) view `name`.
+
+        `rows` is a boolean mask over the canonical rows, `order` the row
+        positions in view order (e.g. an argsort); either may be omitted.
+        `derived` maps extra column names to arrays or Series aligned to the
+        canonical rows.
+        """
+        positions = None
+        if order is not None:
+            positions = np.asarray(order)
+            if rows is not None:
+                positions = positions[np.asarray(rows, dtype=bool)[positions]]
+        elif rows is not None:
+            positions = np.flatnonzero(np.asarray(rows, dtype=bool))
+        if positions is not None:
+            positions = positions.astype(np.int32 if len(self.frame) < 2**31 else np.int64)
+        derived = {col: pd.Series(values).reset_index(drop=True) for col, values in (derived or {}).items()}
+        for col, values in derived.items():
+            if len(values) != len(self.frame):
+                raise ValueError(f"derived column {col!r} has {len(values)} rows, the export has {len(self.frame)}")
+        self._specs[name] = (positions, list(columns) if columns is not None else None, derived)
+        return self
+
+    def rows(self, name: str) -> np.ndarray:
+        """Canonical row positions of view `name`, in view order."""
+        positions = self._specs[name][0]
+        return np.arange(len(self.frame)) if positions is None else positions
+
+    def view(self, name: str, columns=None) -> pd.DataFrame:
+        """Materialize view `name` (projected onto `columns`, default: the view's own), keeping
+        the canonical index labels."""
+        positions, default_columns, derived = self._specs[name]
+        columns = list(columns) if columns is not None else default_columns or [*self.frame.columns, *derived]
+        unknown = [c for c in columns if c not in derived and c not in self.frame.columns]
+        if unknown:
+            raise KeyError(f"view {name!r} has no column(s) {', '.join(map(repr, unknown))}")
+
+        if positions is None:
+            # Every row in canonical order: columns are referenced, not copied - unless writes to
+            # the view would reach the canonical frame (pandas copy-on-write off)
+            out = pd.DataFrame({col: derived[col].set_axis(self.frame.index) if col in derived else self.frame[col]
+                                for col in columns}, index=self.frame.index, copy=not pd.options.mode.copy_on_write)
+        else:
+            # One block-wise take of the canonical columns, then the derived ones at the same positions
+            base = [col for col in columns if col not in derived]
+            out = self.frame.iloc[positions, self.frame.columns.get_indexer(base)]
+            out = out.assign(**{col: derived[col].iloc[positions].set_axis(out.index) for col in columns if col in derived})
+            if list(out.columns) != columns:
+                out = out[columns]
+        return out
+
+    def _shares(self, col: str, series: pd.Series, derived: dict) -> bool:
+        source = derived.get(col)
+        if source is None and col in self.frame.columns:
+            source = self.frame[col]
+        return source is not None and np.shares_memory(_buffer(series), _buffer(source))
+
+    def sizes(self, frames: dict[str, pd.DataFrame] | None = None, canonical: bool = False) -> dict[str, dict]:
+        """VIEW_MEMORY_COLUMNS of each frame in `frames` (name -> frame derived from the canonical
+        one, e.g. `view(name)` or a filtered selection of it), plus the canonical frame itself
+        if `canonical`.
+
+        Owned_Bytes counts the frame's column buffers that are not shared
+        with the canonical frame (or the view's derived columns); string
+        objects are shared by every view and are only counted for the
+        canonical frame. Position/Derived_Bytes are those of the view
+        defined under the same name, if any.
+        """
+        sizes = {}
+        if canonical:
+            sizes[CANONICAL] = {
+                'Rows': len(self.frame), 'Columns': self.frame.shape[1], 'Position_Bytes': 0, 'Derived_Bytes': 0,
+                'Owned_Bytes': int(self.frame.memory_usage(index=True, deep=True).sum()), 'Shared_Bytes': 0,
+            }
+        for name, frame in (frames or {}).items():
+            positions, _, derived = self._specs.get(name, (None, None, {}))
+            owned = shared = 0
+            col_bytes = frame.memory_usage(index=False, deep=False)
+            for col in frame.columns:
+                if self._shares(col, frame[col], derived):
+                    shared += int(col_bytes[col])
+                else:
+                    owned += int(col_bytes[col])
+            sizes[name] = {
+                'Rows': frame.shape[0],
+                'Columns': frame.shape[1],
+                'Position_Bytes': positions.nbytes if positions is not None else 0,
+                'Derived_Bytes': int(sum(s.memory_usage(index=False, deep=True) for s in derived.values())),
+                'Owned_Bytes': owned,
+                'Shared_Bytes': shared,
+            }
+        return sizes
+
+
+def memory_table(*sizes: dict[str, dict]) -> pd.DataFrame:
+    """One VIEW_MEMORY_COLUMNS row per view from `ExportViews.sizes` results, in the order given."""
+    rows = {name: row for part in sizes for name, row in part.items()}
+    return pd.DataFrame.from_dict(rows, orient='index', columns=VIEW_MEMORY_COLUMNS).rename_axis('View')
@@ -1,11 +1,10 @@
 # /// script
 # requires-python = ">=3.13"
 # dependencies = [
-#     "altair==6.0.0",
 #     "marimo",
-#     "pandas==2.3.3",
-#     "pyfiglet==1.0.4",
-#     "pyarrow",
+#     "altair==6.0.0; sys_platform != 'emscripten'",
+#     "pandas==2.3.3; sys_platform != 'emscripten'",
+#     "pyarrow; sys_platform != 'emscripten'",
 # ]
 # [tool.marimo.display]
 # theme = "dark"
@@ -20,22 +19,35 @@ app = marimo.App(width="full")
 @app.cell(hide_code=True)
 def _():
     import marimo as mo
-    import pandas as pd
-    import altair as alt
-    import io
+    import importlib
     import json
     import sys
-    import re
-    import pyfiglet
-    return alt, io, json, mo, pd, pyfiglet, re, sys
+    return importlib, json, mo, sys
 
 
 @app.cell(hide_code=True)
-def _(mo, pyfiglet):
-    nurgle_ascii = pyfiglet.figlet_format("Penance Hunter", font="bloody", width=200)
-    penance_title = pyfiglet.figlet_format("notebook visualizer 40k", font="double_blocky", width=200)
-
-    _output = mo.Html(f"<pre style='text-align: center; font-family: monospace; color: #8b0000; text-shadow: 0 0 10px #5c0000, 0 2px 4px #000;'>{nurgle_ascii}\n{penance_title}</pre>")
+def _(mo):
+    # Banner precomputed with pyfiglet ("bloody" / "double_blocky" fonts, width=200) so the
+    # WASM app doesn't install pyfiglet just to draw it
+    _nurgle_ascii = """\
+ ██▓███  ▓█████  ███▄    █  ▄▄▄       ███▄    █  ▄████▄  ▓█████     ██░ ██  █    ██  ███▄    █ ▄▄▄█████▓▓█████  ██▀███  
+▓██░  ██▒▓█   ▀  ██ ▀█   █ ▒████▄     ██ ▀█   █ ▒██▀ ▀█  ▓█   ▀    ▓██░ ██▒ ██  ▓██▒ ██ ▀█   █ ▓  ██▒ ▓▒▓█   ▀ ▓██ ▒ ██▒
+▓██░ ██▓▒▒███   ▓██  ▀█ ██▒▒██  ▀█▄  ▓██  ▀█ ██▒▒▓█    ▄ ▒███      ▒██▀▀██░▓██  ▒██░▓██  ▀█ ██▒▒ ▓██░ ▒░▒███   ▓██ ░▄█ ▒
+▒██▄█▓▒ ▒▒▓█  ▄ ▓██▒  ▐▌██▒░██▄▄▄▄██ ▓██▒  ▐▌██▒▒▓▓▄ ▄██▒▒▓█  ▄    ░▓█ ░██ ▓▓█  ░██░▓██▒  ▐▌██▒░ ▓██▓ ░ ▒▓█  ▄ ▒██▀▀█▄  
+▒██▒ ░  ░░▒████▒▒██░   ▓██░ ▓█   ▓██▒▒██░   ▓██░▒ ▓███▀ ░░▒████▒   ░▓█▒░██▓▒▒█████▓ ▒██░   ▓██░  ▒██▒ ░ ░▒████▒░██▓ ▒██▒
+▒▓▒░ ░  ░░░ ▒░ ░░ ▒░   ▒ ▒  ▒▒   ▓▒█░░ ▒░   ▒ ▒ ░ ░▒ ▒  ░░░ ▒░ ░    ▒ ░░▒░▒░▒▓▒ ▒ ▒ ░ ▒░   ▒ ▒   ▒ ░░   ░░ ▒░ ░░ ▒▓ ░▒▓░
+░▒ ░      ░ ░  ░░ ░░   ░ ▒░  ▒   ▒▒ ░░ ░░   ░ ▒░  ░  ▒    ░ ░  ░    ▒ ░▒░ ░░░▒░ ░ ░ ░ ░░   ░ ▒░    ░     ░ ░  ░  ░▒ ░ ▒░
+░░          ░      ░   ░ ░   ░   ▒      ░   ░ ░ ░           ░       ░  ░░ ░ ░░░ ░ ░    ░   ░ ░   ░         ░     ░░   ░ 
+            ░  ░         ░       ░  ░         ░ ░ ░         ░  ░    ░  ░  ░   ░              ░             ░  ░   ░     
+                                                ░                                                                       
+"""
+    _penance_title = """\
+ ▄▀█ ▄▀▄ ▄█▄ ██▀ █▄▄ ▄▀▄ ▄▀▄ █░▄  █░█ ▀ █▀ █░█ ▄▀▄ █░ ▀ ▀█ ██▀ █▀▄  █░█ █▀█ █░▄
+ █░█ ▀▄▀ ░█▄ █▄▄ █▄█ ▀▄▀ ▀▄▀ █▀▄  ▀▄▀ █ ▄█ ▀▄█ █▀█ █▄ █ █▄ █▄▄ █▀▄  ▀▀█ █▄█ █▀▄
+                                                                               
+"""
+
+    _output = mo.Html(f"<pre style='text-align: center; font-family: monospace; color: #8b0000; text-shadow: 0 0 10px #5c0000, 0 2px 4px #000;'>{_nurgle_ascii}\n{_penance_title}</pre>")
     _output.center()
     return
 
@@ -74,319 +86,341 @@ def _(mo):
 
 @app.cell(hide_code=True)
 def _(mo, sys):
-    default_csv = mo.notebook_location() / "public" / "00000000-0000-0000-0000-000000000000_20260126_161207.csv"
-
     def is_wasm() -> bool:
         return "pyodide" in sys.modules
 
+    # Assets live in apps/public locally; the site build shares one public/ between stable and beta
+    public_dir = mo.notebook_location().parent / "public" if is_wasm() else mo.notebook_location() / "public"
+    public_url = "../public" if is_wasm() else "public"
+    default_csv = public_dir / "00000000-0000-0000-0000-000000000000_20260126_161207.csv"
+
     csv_upload = mo.ui.file(
         filetypes=[".csv"],
-        multiple=False,
+        multiple=True,
         kind="area",
-        label="Drop your penance export CSV here, or click to browse",
+        label="Drop your penance export CSV(s) here, or click to browse",
     )
-    return csv_upload, default_csv, is_wasm
+    return csv_upload, default_csv, is_wasm, public_dir, public_url
 
 
-@app.cell
-def _(csv_upload, default_csv, io, is_wasm, mo, pd, re):
-    # Load CSV data
-    if csv_upload.value:
-        penance_export_filename = csv_upload.name()
-        penance_export_contents = csv_upload.contents()
-    else:
-        penance_export_filename = default_csv.name
-        if is_wasm():
-            import pyodide.http
-            resp = pyodide.http.open_url(str(default_csv))
-            penance_export_contents = resp.read().encode("utf-8")
-        else:
-            penance_export_contents = default_csv.read_bytes()
+@app.cell(hide_code=True)
+async def _(importlib, mo, sys):
+    # Shared penance_core package - sits next to the notebook when run locally,
+    # fetched as a zip from the site's shared public/ in the WASM build.
+    # Its data stack is installed here, on the first data cell, instead of before the app
+    # starts: those packages are left out of the emscripten dependencies above and imported
+    # via importlib (which marimo's startup import scan doesn't see), so the banner and
+    # upload area render while they download
+    if "pyodide" in sys.modules and "penance_core" not in sys.modules:
+        import micropip as _micropip
+        from pyodide.http import pyfetch
+        await _micropip.install(["numpy", "pandas", "pyarrow"])
+        _resp = await pyfetch(str(mo.notebook_location().parent / "public" / "penance_core.zip"))
+        with open("/tmp/penance_core.zip", "wb") as _f:
+            _f.write(await _resp.bytes())
+        sys.path.insert(0, "/tmp/penance_core.zip")
+    import penance_core as pc
+    pd = importlib.import_module("pandas")
+    return pc, pd
 
-    # Parse CSV
-    print(f"~ now reading file: {penance_export_filename} ({type(penance_export_contents)})")
-    penances_df = pd.read_csv(io.BytesIO(penance_export_contents), comment='#')
-    print(f"~ created dataframe from penance export ({len(penances_df)} rows)")
 
-    # label with source export file
-    penances_df['EXPORT_FILE'] = penance_export_filename
-    penances_df['EXPORT_FILE'] = penances_df['EXPORT_FILE'].astype(str)
+@app.cell(hide_code=True)
+def _(mo, pc):
+    # Opt-in per-cell profiling (wall time, rows, allocations): PENANCE_HUNTER_PROFILE=1 locally,
+    # ?profile in the browser
+    profiler = pc.CellProfiler.from_env(mo.query_params().get("profile"))
+    return (profiler,)
 
-    penances_df['Completion_Time'] = pd.to_datetime(penances_df['Completion_Time'], errors='coerce')
 
-    # regex for extracting timestamps and dates from export filenames
-    match = re.search(r'[0-9a-f-]+_([0-9]{8})_[0-9]{6}\.csv', str(penance_export_filename))
-    ts_match = re.search(r'[0-9a-f-]+_([0-9]{8})_([0-9]{6})\.csv', str(penance_export_filename))
+@app.cell(hide_code=True)
+async def _(is_wasm, json, pc, public_dir, public_url):
+    # Achievement icon sprite sheets packed by the site build; local runs use the per-icon PNGs
+    _atlas_index = None
+    if is_wasm():
+        from pyodide.http import pyfetch as _pyfetch
+        _resp = await _pyfetch(str(public_dir / pc.ATLAS_INDEX))
+        if _resp.ok:
+            _atlas_index = await _resp.json()
+    elif (public_dir / pc.ATLAS_INDEX).exists():
+        _atlas_index = json.loads((public_dir / pc.ATLAS_INDEX).read_text(encoding="utf-8"))
+    icon_atlas = pc.IconAtlas(public_url, _atlas_index)
+    return (icon_atlas,)
 
-    # extract export date from filename
-    penances_df['EXPORT_DATE'] = match.group(1).title() if match else "Unknown"
 
-    if ts_match:
-        ts_string = ts_match.group(1) + ts_match.group(2)
-        export_timestamp = pd.to_datetime(ts_string, format='%Y%m%d%H%M%S', errors='coerce')
-    else:
-        export_timestamp = pd.NaT
-
-    # Extract account metadata from CSV comments
-    def get_account_metadata(contents):
-        meta = {'all_characters': []}
-        in_characters_section = False
-        with io.TextIOWrapper(io.BytesIO(contents), encoding="utf-8") as f:
-            for line in f:
-                if not line.startswith('#'):
-                    break
-                line_stripped = line.lstrip('#').strip()
-                if 'All Characters:' in line_stripped:
-                    in_characters_section = True
-                    continue
-                if in_characters_section:
-                    if line_stripped and line_stripped[0].isdigit():
-                        meta['all_characters'].append(line_stripped)
-                    elif not line_stripped or 'Export Character:' in line_stripped:
-                        in_characters_section = False
-                if 'Account ID:' in line_stripped:
-                    meta['account_id'] = line_stripped.split(':', 1)[1].strip()
-                elif 'Account Level:' in line_stripped:
-                    meta['account_level'] = int(line_stripped.split(':')[1].strip())
-                elif 'Account True Level:' in line_stripped:
-                    meta['account_true_level'] = int(line_stripped.split(':')[1].strip())
-                elif 'Account Prestige:' in line_stripped:
-                    meta['prestige'] = int(line_stripped.split(':')[1].strip())
-                elif 'Export Timezone:' in line_stripped:
-                    meta['timezone'] = line_stripped.split(':', 1)[1].strip()
-                elif 'Mod Version:' in line_stripped:
-                    meta['mod_version'] = line_stripped.split(':', 1)[1].strip()
-        return meta
-
-    account_meta = get_account_metadata(penance_export_contents)
-
-    # Calculate derived columns
-    penances_df['PROGRESS_DIFF'] = penances_df['Goal'] - penances_df['Progress']
-    penances_df = penances_df.sort_values('Completion_Time')
-    penances_df['CUMULATIVE_COUNT'] = range(1, len(penances_df) + 1)
-
-    # Create sub-dataframes
-    completed_df = penances_df[penances_df['Status'] == 'Completed'].copy()
-    completed_df['Completion_Date'] = completed_df['Completion_Time'].dt.date
-
-    active_df = penances_df[penances_df['Status'] == 'In Progress'].copy()
-    active_df = active_df.sort_values(by='Progress_Percentage', ascending=False)
+@app.cell(hide_code=True)
+async def _(is_wasm, pc):
+    # Parsed exports and tracked lists persist across visits: in the browser the cache directory is
+    # backed by IndexedDB, locally it lives in ~/.penance_hunter/cache (least recently viewed evicted)
+    _cache_dir = pc.default_cache_dir()
+    if is_wasm():
+        await pc.mount_browser_storage(_cache_dir)
+    export_cache = pc.ExportCache(_cache_dir)
+    return (export_cache,)
+
+
+@app.cell
+def _(csv_upload, default_csv, export_cache, is_wasm, mo, pc, pd, profiler):
+    # Load CSV data - every upload goes into the export history, the latest one is shown.
+    # Without an upload, a revisit restores the last viewed export from the cache instead
+    # of downloading and parsing the sample again
+    with profiler.cell("load") as _run:
+        # Only real uploads go into export_uploads (history, rarity, leaderboard); the bundled
+        # sample is just displayed. Files holding several concatenated exports (each with its own
+        # # header) are split into one entry per export, so every consumer sees each of them.
+        # Each export is an ExportFile whose body is parsed at most once, by whichever cell needs
+        # its table first
+        export_uploads = [
+            pc.ExportFile(_name, _part)
+            for _f in csv_upload.value
+            for _name, _part in pc.export_parts(_f.contents, _f.name)
+        ]
+        _restored = None if export_uploads else export_cache.get(export_cache.last())
+        if export_uploads or _restored is not None:
+            _shown = export_uploads
+        elif is_wasm():
+            import pyodide.http
+            resp = pyodide.http.open_url(str(default_csv))
+            _shown = [pc.ExportFile(*_p) for _p in pc.export_parts(resp.read().encode("utf-8"), default_csv.name)]
+        else:
+            _shown = [pc.ExportFile(*_p) for _p in pc.export_parts(default_csv.read_bytes(), default_csv.name)]
 
+        if _restored is not None:
+            account_meta, _export_table, penance_export_filename = _restored
+            print(f"~ restored {penance_export_filename} from the export cache")
+        else:
+            _export = max(_shown, key=lambda f: f.key.stamp if f.key else '')
+            penance_export_filename = _export.filename
+            _restored = export_cache.get(_export.key)
+            if _restored is not None:
+                account_meta, _export.table, _ = _restored
+                print(f"~ {penance_export_filename} already parsed, restored from the export cache")
+            else:
+                # Parse CSV - header block and data body are split once at the byte level, and the
+                # pyarrow reader types every column (percentages, timestamps, categoricals) up front
+                print(f"~ now reading file: {penance_export_filename} ({type(_export.contents)})")
+                account_meta = _export.meta
+                if _export.key is not None:
+                    try:
+                        export_cache.put(_export.key, account_meta, _export.table, penance_export_filename)
+                        pc.persist_browser_storage()
+                    except OSError as _err:
+                        print(f"~ export cache not updated: {_err}")
+            _export_table = _export.table
+
+        history_store = pc.HistoryStore(pc.default_history_dir())
+        if export_uploads:
+            try:
+                _added, _skipped = history_store.ingest_many(export_uploads)
+                print(f"~ added {len(_added)} new snapshot(s) to export history in {history_store.root}")
+                for _, _reason in _skipped:
+                    print(f"~ export history skipped: {_reason}")
+            except OSError as _err:
+                print(f"~ export history not updated: {_err}")
+
+        penances_df = _export_table.to_pandas()
+        print(f"~ created dataframe from penance export ({len(penances_df)} rows)")
+
+        # label with source export file
+        penances_df['EXPORT_FILE'] = penance_export_filename
+        penances_df['EXPORT_FILE'] = penances_df['EXPORT_FILE'].astype(str)
+
+        # Export date/time from the filename (falls back to the header's Export Date)
+        _export_key = pc.export_key(account_meta, penance_export_filename)
+        penances_df['EXPORT_DATE'] = _export_key.date if _export_key else "Unknown"
+        export_timestamp = _export_key.timestamp if _export_key else pd.NaT
+
+        # Calculate derived columns
+        penances_df['PROGRESS_DIFF'] = penances_df['Goal'] - penances_df['Progress']
+
+        # Penance_Class / Penance_Category for the whole frame in one vectorized pass
+        pc.classify(penances_df)
+        penances_df = penances_df.sort_values('Completion_Time')
+        penances_df['CUMULATIVE_COUNT'] = range(1, len(penances_df) + 1)
+
+        # Achievement_ID-indexed view shared by tracking and profile loading
+        penance_index = pc.PenanceIndex(penances_df)
+
+        # Derived frames are index-based views of penances_df, taken only for the columns each cell reads
+        export_views = pc.ExportViews(penances_df).add('completed', rows=(penances_df['Status'] == 'Completed').to_numpy())
+        completed_df = export_views.view('completed', columns=pc.TIMELINE_COLUMNS)
+        load_view_sizes = export_views.sizes({'completed': completed_df}, canonical=True)
+        _run.rows = len(penances_df)
     mo.stop(False)  # Always continue
-    return account_meta, completed_df, export_timestamp, penances_df
+    return (
+        account_meta,
+        completed_df,
+        export_timestamp,
+        export_uploads,
+        export_views,
+        history_store,
+        load_view_sizes,
+        penance_index,
+        penances_df,
+    )
 
 
 @app.cell
-def _(account_meta, completed_df, export_timestamp, mo, penances_df):
-    # Account info header
-    account_name = penances_df['Export_Account'].iloc[0] if 'Export_Account' in penances_df.columns else "Unknown"
-    character_name = penances_df['Export_Character'].iloc[0] if 'Export_Character' in penances_df.columns else "Unknown"
-
-    total_penances = len(penances_df)
-    total_completed = len(completed_df)
-    completion_pct = round(total_completed / total_penances * 100, 1)
-
-    # Get completion time stats
-    earliest_completion = completed_df['Completion_Time'].min()
-    latest_completion = completed_df['Completion_Time'].max()
-
-    # Get timezone from export metadata
-    timezone_str = account_meta.get('timezone', '')
-
-    # Format timestamps with time and seconds
-    export_time_str = export_timestamp.strftime('%Y-%m-%d %H:%M:%S') if not export_timestamp != export_timestamp else "Unknown"
-    earliest_str = earliest_completion.strftime('%Y-%m-%d %H:%M:%S') if not earliest_completion != earliest_completion else "N/A"
-    latest_str = latest_completion.strftime('%Y-%m-%d %H:%M:%S') if not latest_completion != latest_completion else "N/A"
-
-    # Main stats row
-    _stats = [
-        mo.stat(label="Completed", value=f"{total_completed}/{total_penances}", bordered=True),
-        mo.stat(label="Completion %", value=f"{completion_pct}%", bordered=True),
-        mo.stat(label="Account Level", value=account_meta.get('account_level', 'N/A'), bordered=True),
-        mo.stat(label="True Level", value=account_meta.get('account_true_level', 'N/A'), bordered=True),
-        mo.stat(label="Prestige", value=account_meta.get('prestige', 'N/A'), bordered=True),
-    ]
-
-    # Time stats row
-    _time_stats = [
-        mo.stat(label="Export Time", value=export_time_str, bordered=True),
-        mo.stat(label="First Completion", value=earliest_str, bordered=True),
-        mo.stat(label="Latest Completion", value=latest_str, bordered=True),
-        mo.stat(label="Timezone", value=timezone_str if timezone_str else "N/A", bordered=True),
-    ]
-
-    # Operatives list
-    all_chars = account_meta.get('all_characters', [])
-
-    if all_chars:
-        import re as _re
-        _class_mapping = {
-            'veteran': 'Veteran',
-            'zealot': 'Zealot',
-            'zelot': 'Zealot',
-            'psyker': 'Psyker',
-            'ogryn': 'Ogryn',
-            'adamant': 'Arbitrator',
-            'broker': 'Hive Scum'
-        }
-        _char_stats = []
-        for char in all_chars:
-            # Parse: "1. gern (Zealot) - Level 30 (True: 169, Prestige: 4)" or "2. Zek (Hive Scum) - Level 30"
-            char_match = _re.match(r'\d+\.\s*(.+?)\s*\(([^)]+)\)\s*-\s*Level\s*(\d+)(?:\s*\(True:\s*(\d+),\s*Prestige:\s*(\d+)\))?', char)
-            if char_match:
-                name, cls, level, true_level, prestige = char_match.groups()
-                # Map class names (adamant -> Arbitrator, broker -> Hive Scum)
-                display_cls = _class_mapping.get(cls.lower(), cls.title())
-                if true_level and prestige:
-                    caption = f"Level {level} (True: {true_level}, Prestige: {prestige})"
-                else:
-                    caption = f"Level {level}"
-                _char_stats.append(mo.stat(label=display_cls, caption=caption, value=name, bordered=True))
-            else:
-                _char_stats.append(mo.stat(label="Unknown", value=char, bordered=True))
-        _operatives_section = mo.vstack([
-            mo.md("#### ::lucide:users:: Operatives"),
-            mo.hstack(_char_stats, widths="equal", align="center")
-        ])
-    else:
-        _operatives_section = None
+def _(default_csv, export_uploads, pc, profiler):
+    # Rarity index over every account seen so far - counters are updated with this
+    # session's uploads instead of re-aggregating the whole corpus. The bundled sample
+    # never counts as an account (and is dropped if an earlier version indexed it)
+    with profiler.cell("rarity") as _run:
+        rarity_index = pc.RarityIndex(pc.default_rarity_dir())
+        try:
+            _sample_key = pc.parse_export_filename(default_csv.name)
+            if _sample_key is not None:
+                rarity_index.remove(_sample_key.account_id)
+            if export_uploads:
+                _used, _skipped = rarity_index.update(export_uploads)
+                for _name, _reason in _skipped:
+                    print(f"~ rarity index skipped {_name}: {_reason}")
+                print(f"~ rarity index: {_used} new export(s), {len(rarity_index.accounts)} account(s) in {rarity_index.root}")
+        except (ValueError, OSError) as _err:
+            print(f"~ rarity index not updated: {_err}")
+        rarity_frame = rarity_index.frame()
+        _run.rows = len(rarity_frame)
+    return (rarity_frame,)
 
-    mod_version = account_meta.get('mod_version', 'Legacy')
-    version_str = f" (v{mod_version})"
-    _header = mo.md(f"### **{account_name}** - exported by {character_name}{version_str}")
 
-    _content = [
-        _header,
-        mo.hstack(_stats, widths="equal", align="center"),
-        mo.hstack(_time_stats, widths="equal", align="center"),
-    ]
-    if _operatives_section:
-        _content.append(_operatives_section)
+@app.cell
+def _(account_meta, export_timestamp, history_store, pc, pd, profiler):
+    # Completion ETAs for the shown export from the progress made since the snapshot before
+    # it - fitted for all penances at once and cached per snapshot pair in the history store.
+    # Empty when the shown export isn't in the history (e.g. the bundled sample)
+    with profiler.cell("forecast") as _run:
+        if account_meta.account_id and pd.notna(export_timestamp):
+            eta_frame = history_store.forecast(account_meta.account_id, export_timestamp.strftime('%Y%m%d_%H%M%S'))
+        else:
+            eta_frame = pd.DataFrame(columns=pc.ETA_COLUMNS)
+        _run.rows = len(eta_frame)
+    return (eta_frame,)
+
 
-    mo.vstack(_content)
+@app.cell
+def _(
+    account_meta,
+    completed_df,
+    export_timestamp,
+    history_store,
+    mo,
+    pc,
+    penances_df,
+    profiler,
+):
+    with profiler.cell("account header") as _run:
+        # Account info header
+        account_name = penances_df['Export_Account'].iloc[0] if 'Export_Account' in penances_df.columns else "Unknown"
+        character_name = penances_df['Export_Character'].iloc[0] if 'Export_Character' in penances_df.columns else "Unknown"
+
+        total_penances = len(penances_df)
+        total_completed = len(completed_df)
+        completion_pct = round(total_completed / total_penances * 100, 1)
+
+        # Get completion time stats
+        earliest_completion = completed_df['Completion_Time'].min()
+        latest_completion = completed_df['Completion_Time'].max()
+
+        # Get timezone from export metadata
+        timezone_str = account_meta.timezone or ''
+
+        # Format timestamps with time and seconds
+        export_time_str = export_timestamp.strftime('%Y-%m-%d %H:%M:%S') if not export_timestamp != export_timestamp else "Unknown"
+        earliest_str = earliest_completion.strftime('%Y-%m-%d %H:%M:%S') if not earliest_completion != earliest_completion else "N/A"
+        latest_str = latest_completion.strftime('%Y-%m-%d %H:%M:%S') if not latest_completion != latest_completion else "N/A"
+
+        # Main stats row
+        _stats = [
+            mo.stat(label="Completed", value=f"{total_completed}/{total_penances}", bordered=True),
+            mo.stat(label="Completion %", value=f"{completion_pct}%", bordered=True),
+            mo.stat(label="Account Level", value=account_meta.account_level or 'N/A', bordered=True),
+            mo.stat(label="True Level", value=account_meta.account_true_level or 'N/A', bordered=True),
+            mo.stat(label="Prestige", value=account_meta.account_prestige or 'N/A', bordered=True),
+        ]
+
+        # Snapshots of this account kept in the export history
+        _history_count = len(history_store.snapshots(account_meta.account_id)) if account_meta.account_id else 0
+
+        # Time stats row
+        _time_stats = [
+            mo.stat(label="Export Time", value=export_time_str, bordered=True),
+            mo.stat(label="First Completion", value=earliest_str, bordered=True),
+            mo.stat(label="Latest Completion", value=latest_str, bordered=True),
+            mo.stat(label="Timezone", value=timezone_str if timezone_str else "N/A", bordered=True),
+            mo.stat(label="Exports in History", value=str(_history_count), bordered=True),
+        ]
+
+        # Operatives list
+        all_chars = account_meta.characters
+
+        if all_chars:
+            _char_stats = []
+            for char in all_chars:
+                # Map class names (adamant -> Arbitrator, broker -> Hive Scum)
+                display_cls = pc.CLASS_MAPPING.get(char.archetype.lower(), char.archetype.title())
+                if char.true_level and char.prestige:
+                    caption = f"Level {char.level} (True: {char.true_level}, Prestige: {char.prestige})"
+                else:
+                    caption = f"Level {char.level}"
+                _char_stats.append(mo.stat(label=display_cls, caption=caption, value=char.name, bordered=True))
+            _operatives_section = mo.vstack([
+                mo.md("#### ::lucide:users:: Operatives"),
+                mo.hstack(_char_stats, widths="equal", align="center")
+            ])
+        else:
+            _operatives_section = None
+
+        mod_version = account_meta.mod_version or 'Legacy'
+        version_str = f" (v{mod_version})"
+        _header = mo.md(f"### **{account_name}** - exported by {character_name}{version_str}")
+
+        _content = [
+            _header,
+            mo.hstack(_stats, widths="equal", align="center"),
+            mo.hstack(_time_stats, widths="equal", align="center"),
+        ]
+        if _operatives_section:
+            _content.append(_operatives_section)
+
+        _output = mo.vstack(_content)
+        _run.rows = len(penances_df)
+    _output
     return
 
 
 @app.cell
-def _(mo, penances_df):
-    # Create dataframes per in-game mapped category
-    _class_mapping = {
-        'veteran': 'Veteran',
-        'zealot': 'Zealot',
-        'zelot': 'Zealot',
-        'psyker': 'Psyker',
-        'ogryn': 'Ogryn',
-        'adamant': 'Arbitrator',
-        'broker': 'Hive Scum'
-    }
-
-    def _extract_class(achievement_id):
-        achievement_id_lower = achievement_id.lower()
-        for class_key, class_value in _class_mapping.items():
-            if class_key in achievement_id_lower:
-                return class_value
-        return 'Unknown'
-
-    # 1. Account Penances
-    account_df = penances_df[penances_df['Category'].isin(['loc_achievement_category_account_label'])]
-    account_completed = len(account_df[account_df['Status'] == 'Completed'])
-    account_in_progress = len(account_df[account_df['Status'] == 'In Progress'])
-    account_total = len(account_df)
-
-    # 2. Class Penances
-    class_df = penances_df[penances_df['Category'].isin(['loc_class_abilities_title', 'loc_class_progression_title'])].copy()
-    class_df['Penance_Class'] = class_df['Achievement_ID'].apply(_extract_class)
-    class_summary = class_df.groupby('Penance_Class')['Status'].agg(
-        total='size',
-        completed=lambda s: (s == 'Completed').sum()
-    ).astype({'total': int, 'completed': int})
-    class_summary['pct'] = (class_summary['completed'] / class_summary['total'] * 100).round(0).astype(int)
-
-    # 3. Tactical Penances
-    tactical_df = penances_df[penances_df['Category'].isin([
-        'loc_achievement_category_offensive_label',
-        'loc_achievement_category_defensive_label',
-        'loc_achievement_category_teamplay_label'
-    ])]
-    tactical_completed = len(tactical_df[tactical_df['Status'] == 'Completed'])
-    tactical_in_progress = len(tactical_df[tactical_df['Status'] == 'In Progress'])
-
-    # 4. Heretical Penances
-    heretical_df = penances_df[penances_df['Category'].isin(['loc_achievement_category_heretics_label'])]
-    heretical_completed = len(heretical_df[heretical_df['Status'] == 'Completed'])
-    heretical_in_progress = len(heretical_df[heretical_df['Status'] == 'In Progress'])
-
-    # 5. Missions Penances
-    missions_df = penances_df[penances_df['Category'].isin([
-        'loc_achievement_subcategory_missions_general_label',
-        'loc_achievement_subcategory_missions_auric_label',
-        'loc_achievement_subcategory_missions_havoc_label',
-        'loc_achievement_subcategory_missions_survival_label'
-    ])]
-    missions_completed = len(missions_df[missions_df['Status'] == 'Completed'])
-    missions_in_progress = len(missions_df[missions_df['Status'] == 'In Progress'])
-
-    # 6. Exploration Penances
-    exploration_terms = ['group_mission_zone_wide', 'collectible', 'destructible', 'mission_zone_',
-                         'mission_scavenge_samples', 'mission_propaganda_fan_kills', 'mission_raid_bottles']
-    exploration_regex = '|'.join(exploration_terms)
-    exploration_df = penances_df[
-        (penances_df['Achievement_ID'].str.contains(exploration_regex, case=False, na=False)) |
-        (penances_df['Category'].isin(['loc_achievement_subcategory_twins_mission_label']))
-    ]
-    exploration_completed = len(exploration_df[exploration_df['Status'] == 'Completed'])
-    exploration_in_progress = len(exploration_df[exploration_df['Status'] == 'In Progress'])
-
-    # 7. Endeavours Penances (leftover)
-    excluded_categories = [
-        'loc_class_abilities_title', 'loc_class_progression_title',
-        'loc_achievement_category_account_label',
-        'loc_achievement_category_offensive_label', 'loc_achievement_category_defensive_label',
-        'loc_achievement_category_teamplay_label', 'loc_achievement_category_heretics_label',
-        'loc_achievement_subcategory_missions_general_label', 'loc_achievement_subcategory_missions_auric_label',
-        'loc_achievement_subcategory_missions_havoc_label', 'loc_achievement_subcategory_missions_survival_label',
-        'loc_achievement_subcategory_twins_mission_label',
-        'loc_weapon_progression_mastery', 'loc_achievement_category_weapons_label'
-    ]
-    leftover_df = penances_df[~penances_df['Category'].isin(excluded_categories)]
-    leftover_df = leftover_df[~leftover_df['Achievement_ID'].str.contains(exploration_regex, case=False, na=False)]
-    endeavours_completed = len(leftover_df[leftover_df['Status'] == 'Completed'])
-    endeavours_in_progress = len(leftover_df[leftover_df['Status'] == 'In Progress'])
-
-    # 8. Weapons Penances
-    weapons_df = penances_df[penances_df['Category'].isin([
-        'loc_weapon_progression_mastery', 'loc_achievement_category_weapons_label'
-    ])]
-    weapons_completed = len(weapons_df[weapons_df['Status'] == 'Completed'])
-    weapons_in_progress = len(weapons_df[weapons_df['Status'] == 'In Progress'])
-
-    # All categories in one row
-    _cat_stats = [
-        mo.stat(label="Account", value=f"{account_completed}", caption=f"{account_in_progress} in progress" if account_in_progress else "Completed", bordered=True),
-        mo.stat(label="Tactical", value=f"{tactical_completed}", caption=f"{tactical_in_progress} in progress" if tactical_in_progress else "Completed", bordered=True),
-        mo.stat(label="Heretical", value=f"{heretical_completed}", caption=f"{heretical_in_progress} in progress" if heretical_in_progress else "Completed", bordered=True),
-        mo.stat(label="Missions", value=f"{missions_completed}", caption=f"{missions_in_progress} in progress" if missions_in_progress else "Completed", bordered=True),
-        mo.stat(label="Exploration", value=f"{exploration_completed}", caption=f"{exploration_in_progress} in progress" if exploration_in_progress else "Completed", bordered=True),
-        mo.stat(label="Endeavours", value=f"{endeavours_completed}", caption=f"{endeavours_in_progress} in progress" if endeavours_in_progress else "Completed", bordered=True),
-        mo.stat(label="Weapons", value=f"{weapons_completed}", caption=f"{weapons_in_progress} in progress" if weapons_in_progress else "Completed", bordered=True),
-    ]
-
-    # Class penances per class with icons
-    _class_icons = {
-        'Veteran': 'public/icons/veteran.png',
-        'Zealot': 'public/icons/zealot.png',
-        'Psyker': 'public/icons/psyker.png',
-        'Ogryn': 'public/icons/ogryn.png',
-        'Arbitrator': 'public/icons/arbitrator.png',
-        'Hive Scum': 'public/icons/hive_scum.png',
-    }
+def _(mo, pc, penances_df, profiler, public_url):
+    # Completed / in-progress counts per in-game mapped category group
+    with profiler.cell("category summary") as _run:
+        _category_counts = pc.category_summary(penances_df)
+        class_summary = pc.class_summary(penances_df)
+
+        # All categories in one row
+        _cat_stats = [
+            mo.stat(
+                label=_group,
+                value=f"{_row['completed']}",
+                caption=f"{_row['in_progress']} in progress" if _row['in_progress'] else "Completed",
+                bordered=True,
+            )
+            for _group, _row in _category_counts.iterrows()
+        ]
+
+        # Class penances per class with icons
+        _class_icons = {
+            'Veteran': f'{public_url}/icons/veteran.png',
+            'Zealot': f'{public_url}/icons/zealot.png',
+            'Psyker': f'{public_url}/icons/psyker.png',
+            'Ogryn': f'{public_url}/icons/ogryn.png',
+            'Arbitrator': f'{public_url}/icons/arbitrator.png',
+            'Hive Scum': f'{public_url}/icons/hive_scum.png',
+        }
 
-    _class_stats = []
-    for _cls in ['Arbitrator', 'Hive Scum', 'Ogryn', 'Psyker', 'Veteran', 'Zealot']:
-        if _cls in class_summary.index:
-            _row = class_summary.loc[_cls]
-            _icon_data = _class_icons.get(_cls, '')
-            _card_html = f'''
+        _class_stats = []
+        for _cls in ['Arbitrator', 'Hive Scum', 'Ogryn', 'Psyker', 'Veteran', 'Zealot']:
+            if _cls in class_summary.index:
+                _row = class_summary.loc[_cls]
+                _icon_data = _class_icons.get(_cls, '')
+                _card_html = f'''
             <div style="
                 position: relative;
                 border: 1px solid var(--border-color, #333);
@@ -412,84 +446,208 @@ def _(mo, penances_df):
                 </div>
             </div>
             '''
-            _class_stats.append(mo.Html(_card_html))
-
-    mo.vstack([
-        mo.md("#### ::lucide:trophy:: Categories"),
-        mo.hstack(_cat_stats, widths="equal", align="center"),
-        mo.md("##### ::lucide:swords:: Class Penances"),
-        mo.hstack(_class_stats, widths="equal", align="center"),
-    ])
+                _class_stats.append(mo.Html(_card_html))
+
+        _output = mo.vstack([
+            mo.md("#### ::lucide:trophy:: Categories"),
+            mo.hstack(_cat_stats, widths="equal", align="center"),
+            mo.md("##### ::lucide:swords:: Class Penances"),
+            mo.hstack(_class_stats, widths="equal", align="center"),
+        ])
+        _run.rows = len(penances_df)
+    _output
     return
 
 
-@app.cell(hide_code=True)
-def _(completed_df, mo, pd):
-    # Class mapping for extracting class from Achievement_ID
-    _class_mapping = {
-        'veteran': 'Veteran',
-        'zealot': 'Zealot',
-        'zelot': 'Zealot',
-        'psyker': 'Psyker',
-        'ogryn': 'Ogryn',
-        'adamant': 'Arbitrator',
-        'broker': 'Hive Scum'
+@app.cell
+def _(account_meta, history_store, mo):
+    # Snapshot pickers for the "what changed" panel - previous vs latest export by default
+    _snapshots = history_store.snapshots(account_meta.account_id) if account_meta.account_id else None
+    _snapshot_options = {} if _snapshots is None else {
+        f"{_ts:%Y-%m-%d %H:%M:%S}": _stamp for _ts, _stamp in zip(_snapshots['timestamp'], _snapshots['stamp'])
     }
+    _labels = list(_snapshot_options)
+    diff_from = mo.ui.dropdown(options=_snapshot_options, value=_labels[-2] if len(_labels) > 1 else None, label="From")
+    diff_to = mo.ui.dropdown(options=_snapshot_options, value=_labels[-1] if _labels else None, label="To")
+    return diff_from, diff_to
 
-    def _extract_class(row):
-        # Only extract class for actual class penances, not enemy kills or weapons
-        category = row.get('Category', '')
-        if category not in ['loc_class_abilities_title', 'loc_class_progression_title']:
-            return 'General'
-        achievement_id_lower = row['Achievement_ID'].lower()
-        for class_key, class_value in _class_mapping.items():
-            if class_key in achievement_id_lower:
-                return class_value
-        return 'General'
-
-    # Prepare chart data with class info
-    chart_base_df = completed_df.copy()
-    chart_base_df['Penance_Class'] = chart_base_df.apply(_extract_class, axis=1)
-
-    # Get date range from data
-    min_date = chart_base_df['Completion_Time'].min()
-    max_date = chart_base_df['Completion_Time'].max()
-
-    # Class filter - multiselect
-    available_classes = ['General', 'Arbitrator', 'Hive Scum', 'Ogryn', 'Psyker', 'Veteran', 'Zealot']
-    chart_class_filter = mo.ui.multiselect(
-        options=available_classes,
-        value=available_classes,
-        label="Classes"
-    )
 
-    # Date range filters
-    chart_start_date = mo.ui.date(
-        value=min_date.date() if pd.notna(min_date) else None,
-        label="Start Date"
-    )
+@app.cell
+def _(account_meta, diff_from, diff_to, history_store, mo, pc, profiler):
+    # What changed between two exports of this account - one keyed merge on Achievement_ID
+    with profiler.cell("what changed") as _run:
+        if not diff_from.value or not diff_to.value or diff_from.value == diff_to.value:
+            _diff_content = mo.md(
+                "Drop two or more exports of this account (or come back after your next export) to see what changed between them."
+            ).callout(kind="info")
+        else:
+            _account_id = account_meta.account_id
+            _old_stamp, _new_stamp = sorted([diff_from.value, diff_to.value])
+            export_diff = pc.diff_exports(
+                history_store.load(_account_id, _old_stamp),
+                history_store.load(_account_id, _new_stamp),
+                history_store.metadata(_account_id, _old_stamp),
+                history_store.metadata(_account_id, _new_stamp),
+            )
+
+            _level_labels = {'account_level': "Account Level", 'account_true_level': "True Level", 'account_prestige': "Prestige"}
+            _diff_stats = [
+                mo.stat(label="Newly Completed", value=str(len(export_diff.newly_completed)), bordered=True),
+                mo.stat(label="Score Gained", value=f"+{export_diff.score_gained}", bordered=True),
+                mo.stat(label="Progress Changes", value=str(len(export_diff.progress)), bordered=True),
+                mo.stat(label="Mastery Changes", value=str(len(export_diff.mastery)), bordered=True),
+            ]
+            for _field, (_old, _new) in export_diff.header.items():
+                _diff_stats.append(mo.stat(label=_level_labels[_field], value=f"{_old or 'N/A'} → {_new or 'N/A'}", bordered=True))
 
-    chart_end_date = mo.ui.date(
-        value=max_date.date() if pd.notna(max_date) else None,
-        label="End Date"
-    )
+            if export_diff.is_empty:
+                _diff_tabs = mo.md("No changes between these exports.").callout(kind="neutral")
+            else:
+                _diff_tabs = mo.ui.tabs({
+                    f"Newly Completed ({len(export_diff.newly_completed)})": mo.ui.table(export_diff.newly_completed, selection=None),
+                    f"Progress ({len(export_diff.progress)})": mo.ui.table(export_diff.progress, selection=None),
+                    f"Mastery ({len(export_diff.mastery)})": mo.ui.table(export_diff.mastery, selection=None),
+                    f"Operatives ({len(export_diff.characters)})": mo.ui.table(export_diff.characters, selection=None),
+                })
+            _diff_content = mo.vstack([mo.hstack(_diff_stats, widths="equal", align="center"), _diff_tabs])
+
+        _output = mo.vstack([
+            mo.md("#### ::lucide:git-compare:: What Changed"),
+            mo.hstack([diff_from, diff_to], justify="start"),
+            _diff_content,
+        ])
+    _output
+    return
+
+
+@app.cell
+def _(export_uploads, mo, pc, profiler):
+    # Leaderboard - latest export of every uploaded account in one Arrow table,
+    # aggregated on the dictionary-encoded Account_ID (listed under each account's latest name)
+    with profiler.cell("leaderboard") as _run:
+        accounts_table = pc.leaderboard_table(export_uploads)
+        _accounts = len(accounts_table.column('Account_ID').unique())
+        if _accounts < 2:
+            _board_content = mo.md(
+                "Drop exports from two or more accounts to rank them against each other."
+            ).callout(kind="info")
+        else:
+            _board = pc.leaderboard(accounts_table)
+            _rarity = pc.penance_rarity(accounts_table)
+            _rarity['Rarity'] = (_rarity['Rarity'] * 100).round(1)
+            _board_content = mo.ui.tabs({
+                f"Standings ({_accounts} accounts)": mo.ui.table(_board, selection=None),
+                "Penance Rarity (% of accounts completed)": mo.ui.table(_rarity, selection=None),
+            })
+
+        _output = mo.vstack([
+            mo.md("#### ::lucide:trophy:: Leaderboard"),
+            _board_content,
+        ])
+        _run.rows = accounts_table.num_rows
+    _output
+    return
+
+
+@app.cell
+def _(account_meta, export_timestamp, history_store, mo, pc, pd, penances_df, profiler):
+    # Weapon mastery per pattern from the Mastery_* columns - XP/day comes from the export
+    # history and is cached per ingested export; without history only the current export is used
+    with profiler.cell("mastery") as _run:
+        if account_meta.account_id and pd.notna(export_timestamp) and account_meta.account_id in history_store.accounts():
+            mastery_df = history_store.mastery(account_meta.account_id, export_timestamp.strftime('%Y%m%d_%H%M%S'))
+        else:
+            mastery_df = pc.mastery_table(penances_df)
+
+        if len(mastery_df):
+            _mastered = int((mastery_df['Levels_To_Max'] == 0).sum())
+            _levels = int(mastery_df['Level'].sum())
+            _mastery_stats = [
+                mo.stat(label="Weapons Mastered", value=f"{_mastered}/{len(mastery_df)}", bordered=True),
+                mo.stat(label="Mastery Levels", value=f"{_levels}/{len(mastery_df) * pc.MASTERY_MAX_LEVEL}", bordered=True),
+                mo.stat(label="Levels to Go", value=str(int(mastery_df['Levels_To_Max'].sum())), bordered=True),
+            ]
+            _mastery_view = mastery_df.reset_index()
+            for _col in ('XP', 'XP_Next_Level', 'XP_To_Next'):
+                _mastery_view[_col] = _mastery_view[_col].round().astype('Int64')
+            _mastery_view['Level_Progress'] = pc.progress_text(_mastery_view['Level_Progress'])
+            if 'XP_Per_Day' in _mastery_view.columns:
+                _xp_per_day = mastery_df['XP_Per_Day'].sum(min_count=1)
+                _mastery_stats.append(mo.stat(
+                    label="XP / Day", value=f"{_xp_per_day:,.0f}" if pd.notna(_xp_per_day) else "N/A", bordered=True
+                ))
+                _mastery_view['XP_Per_Day'] = _mastery_view['XP_Per_Day'].round(0)
+                _mastery_view['Days_To_Next'] = _mastery_view['Days_To_Next'].round(1)
+            _mastery_content = mo.vstack([
+                mo.hstack(_mastery_stats, widths="equal", align="center"),
+                mo.ui.table(_mastery_view, selection=None, page_size=10),
+            ])
+        else:
+            _mastery_content = mo.md("This export has no weapon mastery data (older mod versions don't write the Mastery_* columns).").callout(kind="info")
+
+        _output = mo.vstack([
+            mo.md("#### ::lucide:swords:: Weapon Mastery"),
+            _mastery_content,
+        ])
+        _run.rows = len(mastery_df)
+    _output
+    return
 
-    chart_use_now = mo.ui.checkbox(label="End at Now", value=False)
-
-    mo.vstack([
-        mo.md("#### ::lucide:chart-line:: Penance Progress Chart"),
-        mo.hstack([
-            chart_class_filter,
-            chart_start_date,
-            chart_end_date,
-            chart_use_now
-        ], justify="start", gap=1)
-    ])
+
+@app.cell(hide_code=True)
+async def _(completed_df, importlib, is_wasm, mo, pc, pd, profiler):
+    # Altair is only needed from the chart on - installed on demand in the WASM build
+    with profiler.cell("chart timeline") as _run:
+        if is_wasm():
+            import micropip as _micropip
+            await _micropip.install("altair")
+        alt = importlib.import_module("altair")
+
+        # Per-class cumulative series, sorted once per export - the widgets below only pick a window
+        chart_timeline = pc.Timeline(completed_df)
+
+        # Get date range from data
+        min_date = chart_timeline.start
+        max_date = chart_timeline.end
+
+        # Class filter - multiselect
+        available_classes = list(pc.CLASSES)
+        chart_class_filter = mo.ui.multiselect(
+            options=available_classes,
+            value=available_classes,
+            label="Classes"
+        )
+
+        # Date range filters
+        chart_start_date = mo.ui.date(
+            value=min_date.date() if pd.notna(min_date) else None,
+            label="Start Date"
+        )
+
+        chart_end_date = mo.ui.date(
+            value=max_date.date() if pd.notna(max_date) else None,
+            label="End Date"
+        )
+
+        chart_use_now = mo.ui.checkbox(label="End at Now", value=False)
+
+        _output = mo.vstack([
+            mo.md("#### ::lucide:chart-line:: Penance Progress Chart"),
+            mo.hstack([
+                chart_class_filter,
+                chart_start_date,
+                chart_end_date,
+                chart_use_now
+            ], justify="start", gap=1)
+        ])
+        _run.rows = len(completed_df)
+    _output
     return (
-        chart_base_df,
+        alt,
         chart_class_filter,
         chart_end_date,
         chart_start_date,
+        chart_timeline,
         chart_use_now,
     )
 
@@ -497,263 +655,273 @@ def _(completed_df, mo, pd):
 @app.cell(hide_code=True)
 def _(
     alt,
-    chart_base_df,
     chart_class_filter,
     chart_end_date,
     chart_start_date,
+    chart_timeline,
     chart_use_now,
+    export_views,
     mo,
+    pc,
     pd,
+    profiler,
 ):
-    # Apply filters
-    filtered_chart_df = chart_base_df.copy()
-
-    # Filter by selected classes
-    if chart_class_filter.value:
-        filtered_chart_df = filtered_chart_df[filtered_chart_df['Penance_Class'].isin(chart_class_filter.value)]
-
-    # Filter by date range
-    if chart_start_date.value:
-        start_dt = pd.Timestamp(chart_start_date.value)
-        filtered_chart_df = filtered_chart_df[filtered_chart_df['Completion_Time'] >= start_dt]
-
-    if chart_use_now.value:
-        end_dt = pd.Timestamp.now()
-    elif chart_end_date.value:
-        end_dt = pd.Timestamp(chart_end_date.value) + pd.Timedelta(days=1)  # Include full end day
-    else:
-        end_dt = None
-
-    if end_dt:
-        filtered_chart_df = filtered_chart_df[filtered_chart_df['Completion_Time'] <= end_dt]
-
-    # Sort by completion time and calculate cumulative count per class
-    filtered_chart_df = filtered_chart_df.sort_values('Completion_Time')
-    filtered_chart_df['CCOUNT_PER_CLASS'] = filtered_chart_df.groupby('Penance_Class').cumcount() + 1
-
-    # Get last point for each class (for endpoint markers)
-    last_points = filtered_chart_df.groupby('Penance_Class').last().reset_index()
-
-    # Determine x-axis domain
-    if len(filtered_chart_df) > 0:
-        x_min = filtered_chart_df['Completion_Time'].min()
-        x_max = pd.Timestamp.now() + pd.Timedelta(days=5) if chart_use_now.value else (end_dt + pd.Timedelta(days=5) if end_dt else pd.Timestamp.now() + pd.Timedelta(days=5))
-
-        # Line chart for progression
-        line_chart = alt.Chart(filtered_chart_df).mark_line(point=True).encode(
-            x=alt.X('Completion_Time:T', title='Date', scale=alt.Scale(domain=[x_min, x_max])),
-            y=alt.Y('CCOUNT_PER_CLASS:Q', title='Penances Completed'),
-            color=alt.Color('Penance_Class:N', title='Class'),
-            tooltip=[
-                alt.Tooltip('Penance_Class:N', title='Class'),
-                alt.Tooltip('Completion_Time:T', title='Date'),
-                alt.Tooltip('CCOUNT_PER_CLASS:Q', title='Total for Class'),
-                alt.Tooltip('Title:N', title='Penance')
-            ]
-        )
-
-        # Endpoint markers
-        last_points_chart = alt.Chart(last_points).mark_point(size=200, filled=True).encode(
-            x=alt.X('Completion_Time:T', scale=alt.Scale(domain=[x_min, x_max])),
-            y=alt.Y('CCOUNT_PER_CLASS:Q'),
-            color=alt.Color('Penance_Class:N', title='Class'),
-            tooltip=[
-                alt.Tooltip('Penance_Class:N', title='Class'),
-                alt.Tooltip('Completion_Time:T', title='Date'),
-                alt.Tooltip('CCOUNT_PER_CLASS:Q', title='Total for Class')
-            ]
+    with profiler.cell("chart") as _run:
+        # Date range
+        start_dt = pd.Timestamp(chart_start_date.value) if chart_start_date.value else None
+
+        if chart_use_now.value:
+            end_dt = pd.Timestamp.now()
+        elif chart_end_date.value:
+            end_dt = pd.Timestamp(chart_end_date.value) + pd.Timedelta(days=1)  # Include full end day
+        else:
+            end_dt = None
+
+        # Selected classes within the date range, with per-class cumulative counts starting at
+        # the range start and each class's last point (for endpoint markers) - binary search
+        # on the cached timeline, no re-sort or groupby
+        filtered_chart_df, last_points = chart_timeline.window(
+            classes=chart_class_filter.value or None,
+            start=start_dt,
+            end=end_dt,
         )
+        chart_view_sizes = export_views.sizes({'chart_window': filtered_chart_df})
+
+        # Determine x-axis domain
+        if len(filtered_chart_df) > 0:
+            x_min = filtered_chart_df['Completion_Time'].min()
+            x_max = pd.Timestamp.now() + pd.Timedelta(days=5) if chart_use_now.value else (end_dt + pd.Timedelta(days=5) if end_dt else pd.Timestamp.now() + pd.Timedelta(days=5))
+
+            # Only the plotted columns go into the spec; long ranges are LTTB-downsampled to a fixed
+            # point budget, so zooming in with the date pickers brings back full detail
+            _line_points = pc.chart_points(filtered_chart_df)
+            _marker_points = last_points[['Penance_Class', 'Completion_Time', 'CCOUNT_PER_CLASS']]
+
+            # Line chart for progression
+            line_chart = alt.Chart(_line_points).mark_line(point=True).encode(
+                x=alt.X('Completion_Time:T', title='Date', scale=alt.Scale(domain=[x_min, x_max])),
+                y=alt.Y('CCOUNT_PER_CLASS:Q', title='Penances Completed'),
+                color=alt.Color('Penance_Class:N', title='Class'),
+                tooltip=[
+                    alt.Tooltip('Penance_Class:N', title='Class'),
+                    alt.Tooltip('Completion_Time:T', title='Date'),
+                    alt.Tooltip('CCOUNT_PER_CLASS:Q', title='Total for Class'),
+                    alt.Tooltip('Title:N', title='Penance')
+                ]
+            )
+
+            # Endpoint markers
+            last_points_chart = alt.Chart(_marker_points).mark_point(size=200, filled=True).encode(
+                x=alt.X('Completion_Time:T', scale=alt.Scale(domain=[x_min, x_max])),
+                y=alt.Y('CCOUNT_PER_CLASS:Q'),
+                color=alt.Color('Penance_Class:N', title='Class'),
+                tooltip=[
+                    alt.Tooltip('Penance_Class:N', title='Class'),
+                    alt.Tooltip('Completion_Time:T', title='Date'),
+                    alt.Tooltip('CCOUNT_PER_CLASS:Q', title='Total for Class')
+                ]
+            )
+
+            # Layer together
+            class_progression_chart = (
+                line_chart + last_points_chart
+            ).properties(
+                width="container",
+                height=400,
+                title="Operative Penance Progress by Class"
+            ).interactive()
+
+            _chart_output = mo.ui.altair_chart(class_progression_chart, chart_selection=False)
+
+            # Stats for filtered data
+            first_penance_time = filtered_chart_df['Completion_Time'].min()
+            last_penance_time = filtered_chart_df['Completion_Time'].max()
+            total_completed_in_range = len(filtered_chart_df)
+            total_score_in_range = filtered_chart_df['Score'].sum() if 'Score' in filtered_chart_df.columns else 0
+
+            first_str = first_penance_time.strftime('%Y-%m-%d %H:%M:%S') if pd.notna(first_penance_time) else "N/A"
+            last_str = last_penance_time.strftime('%Y-%m-%d %H:%M:%S') if pd.notna(last_penance_time) else "N/A"
+
+            _chart_stats = mo.hstack([
+                mo.stat(label="First in Range", value=first_str, bordered=True),
+                mo.stat(label="Last in Range", value=last_str, bordered=True),
+                mo.stat(label="Completed in Range", value=str(total_completed_in_range), bordered=True),
+                mo.stat(label="Total Score", value=str(total_score_in_range), bordered=True),
+            ], widths="equal", align="center")
+        else:
+            _chart_output = mo.md("_No data matches the selected filters._").callout(kind="warn")
+            _chart_stats = None
 
-        # Layer together
-        class_progression_chart = (
-            line_chart + last_points_chart
-        ).properties(
-            width="container",
-            height=400,
-            title="Operative Penance Progress by Class"
-        ).interactive()
-
-        _chart_output = mo.ui.altair_chart(class_progression_chart, chart_selection=False)
-
-        # Stats for filtered data
-        first_penance_time = filtered_chart_df['Completion_Time'].min()
-        last_penance_time = filtered_chart_df['Completion_Time'].max()
-        total_completed_in_range = len(filtered_chart_df)
-        total_score_in_range = filtered_chart_df['Score'].sum() if 'Score' in filtered_chart_df.columns else 0
-
-        first_str = first_penance_time.strftime('%Y-%m-%d %H:%M:%S') if pd.notna(first_penance_time) else "N/A"
-        last_str = last_penance_time.strftime('%Y-%m-%d %H:%M:%S') if pd.notna(last_penance_time) else "N/A"
-
-        _chart_stats = mo.hstack([
-            mo.stat(label="First in Range", value=first_str, bordered=True),
-            mo.stat(label="Last in Range", value=last_str, bordered=True),
-            mo.stat(label="Completed in Range", value=str(total_completed_in_range), bordered=True),
-            mo.stat(label="Total Score", value=str(total_score_in_range), bordered=True),
-        ], widths="equal", align="center")
-    else:
-        _chart_output = mo.md("_No data matches the selected filters._").callout(kind="warn")
-        _chart_stats = None
-
-    mo.vstack([_chart_output, _chart_stats] if _chart_stats else [_chart_output])
-    return
+        _output = mo.vstack([_chart_output, _chart_stats] if _chart_stats else [_chart_output])
+        _run.rows = len(filtered_chart_df)
+    _output
+    return chart_view_sizes, filtered_chart_df
 
 
 @app.cell
-def _(mo, penances_df):
-    # Class mapping for table
-    _class_mapping = {
-        'veteran': 'Veteran',
-        'zealot': 'Zealot',
-        'zelot': 'Zealot',
-        'psyker': 'Psyker',
-        'ogryn': 'Ogryn',
-        'adamant': 'Arbitrator',
-        'broker': 'Hive Scum'
-    }
-
-    def _extract_class(row):
-        # Only extract class for actual class penances, not enemy kills or weapons
-        category = row.get('Category', '')
-        if category not in ['loc_class_abilities_title', 'loc_class_progression_title']:
-            return 'General'
-        achievement_id_lower = row['Achievement_ID'].lower()
-        for class_key, class_value in _class_mapping.items():
-            if class_key in achievement_id_lower:
-                return class_value
-        return 'General'
-
-    # Add class column and Penance_Category to dataframe
-    table_df = penances_df.copy()
-    table_df['Penance_Class'] = table_df.apply(_extract_class, axis=1)
-
-    # Map raw Category to friendly category names
-    _category_map = {
-        'loc_achievement_category_account_label': 'Account',
-        'loc_class_abilities_title': 'Class',
-        'loc_class_progression_title': 'Class',
-        'loc_achievement_category_offensive_label': 'Tactical',
-        'loc_achievement_category_defensive_label': 'Tactical',
-        'loc_achievement_category_teamplay_label': 'Tactical',
-        'loc_achievement_category_heretics_label': 'Heretical',
-        'loc_achievement_subcategory_missions_general_label': 'Missions - General',
-        'loc_achievement_subcategory_missions_auric_label': 'Missions - General',
-        'loc_achievement_subcategory_missions_havoc_label': 'Missions - Havoc',
-        'loc_achievement_subcategory_missions_survival_label': 'Missions - General',
-        'loc_achievement_subcategory_twins_mission_label': 'Exploration',
-        'loc_weapon_progression_mastery': 'Weapons',
-        'loc_achievement_category_weapons_label': 'Weapons',
-    }
+def _(
+    eta_frame,
+    mo,
+    pc,
+    penance_index,
+    penances_df,
+    profiler,
+    rarity_frame,
+):
+    # Table columns derived per export, aligned to penances_df and sorted by PROGRESS_DIFF through the
+    # view's row order - the export itself is not copied (Penance_Class/Category come from load time)
+    with profiler.cell("table columns") as _run:
+        _ids = penances_df['Achievement_ID']
+
+        # Weakest sub-stat of multi-stat penances (Stats_Detail is parsed once per export by the index)
+        _weakest = penance_index.weakest
+        _weakest_text = (
+            _weakest['Weakest_Stat'] + ' ' + _weakest['Weakest_Value'].astype(str) + '/' + _weakest['Weakest_Target'].astype(str)
+            + ' (' + _weakest['Stats_Done'].astype(str) + '/' + _weakest['Stats_Total'].astype(str) + ' done)'
+        )
 
-    # Exploration detection via Achievement_ID patterns
-    _exploration_terms = ['group_mission_zone_wide', 'collectible', 'destructible', 'mission_zone_',
-                          'mission_scavenge_samples', 'mission_propaganda_fan_kills', 'mission_raid_bottles']
-    _exploration_regex = '|'.join(_exploration_terms)
-
-    def _map_category(row):
-        if row['Category'] in _category_map:
-            return _category_map[row['Category']]
-        if row['Achievement_ID'] and any(term in row['Achievement_ID'].lower() for term in _exploration_terms):
-            return 'Exploration'
-        return 'Endeavours'
-
-    table_df['Penance_Category'] = table_df.apply(_map_category, axis=1)
-    table_df = table_df.sort_values(by='PROGRESS_DIFF', ascending=True)
-
-    # Create calculated columns for progress display
-    def _make_progress_bar(v):
-        if isinstance(v, str):
-            v = float(v.rstrip("%")) / 100.0
-        display_v = min(v, 1.0)
-        blocks = int(display_v * 10)
-        return "█" * blocks + "░" * (10 - blocks)
-
-    def _format_percentage(v):
-        if isinstance(v, str):
-            v = float(v.rstrip("%")) / 100.0
-        return f"{v*100:.0f}%"
-
-    table_df['PROGRESS'] = table_df['Progress_Percentage'].apply(_format_percentage)
-    table_df['PROGRESS_BAR'] = table_df['Progress_Percentage'].apply(_make_progress_bar)
-
-    # Count in-progress penances per category and class
-    _in_progress_df = table_df[table_df['Status'] == 'In Progress']
-    _cat_counts = _in_progress_df['Penance_Category'].value_counts().to_dict()
-    _class_counts = _in_progress_df['Penance_Class'].value_counts().to_dict()
-    _total_in_progress = len(_in_progress_df)
-
-    # Filter dropdowns with counts
-    status_filter = mo.ui.dropdown(
-        options=["All", "In Progress", "Completed"],
-        value="All",
-        label="Status"
-    )
+        table_views = pc.ExportViews(penances_df).add(
+            'table',
+            order=penances_df['PROGRESS_DIFF'].to_numpy(dtype=float).argsort(kind='stable'),
+            derived={
+                'WEAKEST_STAT': _ids.map(_weakest_text),
+                'WEAKEST_PCT': (_ids.map(_weakest['Weakest_Progress']).astype(float) * 100).round(1),
+                'Sub_Stats': _ids.isin(_weakest.index).map({True: "Multi-stat", False: "Single"}),
+                # % of indexed accounts that completed each penance, looked up from the stored rarity index
+                'RARITY': _ids.map(rarity_frame['Rarity']),
+                # Days until completion at the current rate (blank without two snapshots or progress)
+                'ETA_DAYS': _ids.map(eta_frame['ETA_Days']).astype(float).round(1),
+                # Calculated columns for progress display
+                'PROGRESS': pc.progress_text(penances_df['Progress_Percentage']),
+                'PROGRESS_BAR': pc.progress_bar(penances_df['Progress_Percentage']),
+            },
+        )
+        table_df = table_views.view('table')
+        table_view_sizes = table_views.sizes({'table': table_df})
+
+        # Per-value row masks for the filters and a word index for search, built once per export
+        table_filters = pc.FilterIndex(table_df, columns=pc.FILTER_COLUMNS + ['Sub_Stats'])
+        table_search = pc.SearchIndex(table_df)
+
+        # Count in-progress penances per category and class
+        _cat_counts = table_filters.counts('Penance_Category', Status='In Progress')
+        _class_counts = table_filters.counts('Penance_Class', Status='In Progress')
+
+        # Filter dropdowns with counts
+        status_filter = mo.ui.dropdown(
+            options=["All", "In Progress", "Completed"],
+            value="All",
+            label="Status"
+        )
 
-    _categories = ["Account", "Class", "Tactical", "Heretical", "Missions - General", "Missions - Havoc", "Exploration", "Endeavours", "Weapons"]
-    _category_options = {"All": "All"} | {f"{cat} ({_cat_counts.get(cat, 0)})": cat for cat in _categories}
-    category_filter = mo.ui.dropdown(
-        options=_category_options,
-        value="All",
-        label="Category"
-    )
+        _category_options = {"All": "All"} | {f"{cat} ({_cat_counts.get(cat, 0)})": cat for cat in pc.CATEGORIES}
+        category_filter = mo.ui.dropdown(
+            options=_category_options,
+            value="All",
+            label="Category"
+        )
 
-    _classes = ["General", "Arbitrator", "Hive Scum", "Ogryn", "Psyker", "Veteran", "Zealot"]
-    _class_options = {"All": "All"} | {f"{cls} ({_class_counts.get(cls, 0)})": cls for cls in _classes}
-    class_filter = mo.ui.dropdown(
-        options=_class_options,
-        value="All",
-        label="Class"
+        _class_options = {"All": "All"} | {f"{cls} ({_class_counts.get(cls, 0)})": cls for cls in pc.CLASSES}
+        class_filter = mo.ui.dropdown(
+            options=_class_options,
+            value="All",
+            label="Class"
+        )
+        _multi_count = table_filters.counts('Sub_Stats').get("Multi-stat", 0)
+        stats_filter = mo.ui.dropdown(
+            options={"All": "All", f"Multi-stat ({_multi_count})": "Multi-stat"},
+            value="All",
+            label="Sub-stats"
+        )
+        search_box = mo.ui.text(
+            placeholder="Title, description or ID",
+            label="Search",
+            debounce=True,
+        )
+        _run.rows = len(penances_df)
+    return (
+        category_filter,
+        class_filter,
+        search_box,
+        stats_filter,
+        status_filter,
+        table_filters,
+        table_search,
+        table_view_sizes,
+        table_views,
     )
-    return category_filter, class_filter, status_filter, table_df
 
 
 @app.cell(hide_code=True)
-def _(category_filter, class_filter, mo, status_filter, table_df):
-    # Apply filters
-    filtered_df = table_df.copy()
-
-    if status_filter.value != "All":
-        filtered_df = filtered_df[filtered_df['Status'] == status_filter.value]
-
-    if category_filter.value != "All":
-        filtered_df = filtered_df[filtered_df['Penance_Category'] == category_filter.value]
-
-    if class_filter.value != "All":
-        filtered_df = filtered_df[filtered_df['Penance_Class'] == class_filter.value]
-
-    # Style function for percentage and bar coloring
-    def _style_progress(row_id, column_name, value):
-        if column_name not in ("PROGRESS", "PROGRESS_BAR"):
-            return {}
-        if isinstance(value, str):
-            if "%" in value:
-                value = float(value.rstrip("%")) / 100.0
+def _(
+    category_filter,
+    class_filter,
+    mo,
+    profiler,
+    search_box,
+    stats_filter,
+    status_filter,
+    table_filters,
+    table_search,
+    table_views,
+):
+    with profiler.cell("filters") as _run:
+        # Style function for percentage and bar coloring
+        def _style_progress(row_id, column_name, value):
+            if column_name not in ("PROGRESS", "PROGRESS_BAR"):
+                return {}
+            if isinstance(value, str):
+                if "%" in value:
+                    value = float(value.rstrip("%")) / 100.0
+                else:
+                    value = value.count("█") / 10.0
+            if value >= 0.8:
+                return {"color": "#22c55e"}
+            elif value >= 0.5:
+                return {"color": "#f97316"}
             else:
-                value = value.count("█") / 10.0
-        if value >= 0.8:
-            return {"color": "#22c55e"}
-        elif value >= 0.5:
-            return {"color": "#f97316"}
-        else:
-            return {"color": "#ef4444"}
+                return {"color": "#ef4444"}
+
+        _display_cols = ["Title", "Description", "Score", "RARITY", "Penance_Class", "Penance_Category", "Progress", "Goal", "PROGRESS", "PROGRESS_BAR", "ETA_DAYS", "WEAKEST_STAT", "WEAKEST_PCT", "Status", "Completion_Time", "Achievement_ID", "Icon"]
+        # Ranked search hits (best first) intersected with the precomputed filter masks,
+        # taking only the displayed columns
+        _search_order = table_search.search(search_box.value) if search_box.value.strip() else None
+        _filtered_display = table_filters.select(
+            _display_cols,
+            order=_search_order,
+            Status=status_filter.value,
+            Penance_Category=category_filter.value,
+            Penance_Class=class_filter.value,
+            Sub_Stats=stats_filter.value,
+        )
+        filter_view_sizes = table_views.sizes({'filtered': _filtered_display})
+
+        penance_table = mo.ui.table(
+            _filtered_display,
+            style_cell=_style_progress,
+            page_size=15,
+            selection="multi",
+            wrapped_columns=['Description']
+        )
+        _run.rows = len(_filtered_display)
+    return filter_view_sizes, penance_table
 
-    _display_cols = ["Title", "Description", "Score", "Penance_Class", "Penance_Category", "Progress", "Goal", "PROGRESS", "PROGRESS_BAR", "Status", "Completion_Time", "Achievement_ID", "Icon"]
-    _filtered_display = filtered_df[_display_cols].reset_index(drop=True)
 
-    penance_table = mo.ui.table(
-        _filtered_display,
-        style_cell=_style_progress,
-        page_size=15,
-        selection="multi",
-        wrapped_columns=['Description']
-    )
-    return (penance_table,)
+@app.cell
+def _(account_meta, export_cache, mo, penance_index):
+    # State to persist tracked penances across filter changes, starting from the list this
+    # account had tracked on its last visit
+    _cached_penances, _ = penance_index.records(export_cache.tracked(account_meta.account_id))
+    get_tracked, set_tracked = mo.state(_cached_penances)
+    return get_tracked, set_tracked
 
 
 @app.cell
-def _(mo):
-    # State to persist tracked penances across filter changes
-    get_tracked, set_tracked = mo.state([])
-    return get_tracked, set_tracked
+def _(icon_atlas, mo, pc):
+    # Card markup survives re-runs of the tracking cell, which shows the list a page at a time
+    tracked_cards = pc.TrackedCards(icon_atlas)
+    tracked_page = mo.ui.number(start=1, step=1, value=1, label="Page")
+    return tracked_cards, tracked_page
 
 
 @app.cell
@@ -768,7 +936,9 @@ def _(mo):
 def _(mo):
     # State to track which profile file has been "cleared" (to prevent auto-reload)
     get_cleared_profile, set_cleared_profile = mo.state(None)
-    return get_cleared_profile, set_cleared_profile
+    # IDs from the last loaded profile that aren't in this export
+    get_unknown_ids, set_unknown_ids = mo.state([])
+    return get_cleared_profile, get_unknown_ids, set_cleared_profile, set_unknown_ids
 
 
 @app.cell
@@ -785,159 +955,184 @@ def _(mo):
 
 @app.cell
 def _(
+    account_meta,
     category_filter,
     class_filter,
     clear_btn,
+    eta_frame,
+    export_cache,
     get_cleared_profile,
     get_tracked,
+    get_unknown_ids,
     json,
     load_profile,
     mo,
+    pc,
     pd,
+    penance_index,
     penance_table,
-    penances_df,
+    profiler,
+    search_box,
     set_cleared_profile,
     set_tracked,
+    set_unknown_ids,
+    stats_filter,
     status_filter,
     track_btn,
+    tracked_cards,
+    tracked_page,
 ):
-    # Track button clicked - run_button.value is True when clicked
-    if track_btn.value:
-        _selected = penance_table.value
-        if _selected is not None and isinstance(_selected, pd.DataFrame) and len(_selected) > 0:
-            _current = get_tracked()
-            _existing_ids = {_p['Achievement_ID'] for _p in _current}
-            _new_penances = _selected.to_dict('records')
-            for _p in _new_penances:
-                if _p['Achievement_ID'] not in _existing_ids:
-                    _current.append(_p)
-            set_tracked(_current)
-
-    # Load profile - replaces current tracked with penance data looked up by ID
-    # Only load if: file exists, clear not clicked, and this file wasn't already cleared
-    _profile_name = load_profile.name() if load_profile.value else None
-    _was_cleared = _profile_name is not None and _profile_name == get_cleared_profile()
-    if load_profile.value and not clear_btn.value and not _was_cleared:
-        try:
-            _profile_ids = json.loads(load_profile.value[0].contents.decode('utf-8'))
-            if isinstance(_profile_ids, list):
-                # Look up full penance data from penances_df using Achievement_IDs
-                _loaded_penances = []
-                for _aid in _profile_ids:
-                    _matching = penances_df[penances_df['Achievement_ID'] == _aid]
-                    if len(_matching) > 0:
-                        _loaded_penances.append(_matching.iloc[0].to_dict())
-                set_tracked(_loaded_penances)
-                # Clear the "cleared" flag since we loaded a new/same profile
-                set_cleared_profile(None)
-        except (json.JSONDecodeError, IndexError, AttributeError):
-            pass  # Invalid JSON, ignore
-
-    # Clear button clicked - mark profile as cleared and empty tracked list
-    if clear_btn.value:
-        if load_profile.value:
-            set_cleared_profile(load_profile.name())
-        set_tracked([])
-
-    # Get current tracked penances
-    tracked_list = get_tracked()
-
-    # Create save profile download element - shown directly when there are tracked penances
-    _save_profile = None
-    if tracked_list:
-        _profile_ids = [_p.get('Achievement_ID') for _p in tracked_list]
-        _profile_json = json.dumps(_profile_ids, indent=2)
-        _save_profile = mo.download(
-            data=_profile_json.encode('utf-8'),
-            filename="penance_profile.json",
-            mimetype="application/json",
-            label="Save Profile"
-        )
+    with profiler.cell("tracked cards") as _run:
+        # Track button clicked - run_button.value is True when clicked
+        if track_btn.value:
+            _selected = penance_table.value
+            if _selected is not None and isinstance(_selected, pd.DataFrame) and len(_selected) > 0:
+                _current = get_tracked()
+                _existing_ids = {_p['Achievement_ID'] for _p in _current}
+                _new_ids = [_aid for _aid in _selected['Achievement_ID'] if _aid not in _existing_ids]
+                _new_penances, _ = penance_index.records(_new_ids)
+                set_tracked(_current + _new_penances)
+
+        # Load profile - replaces current tracked with penance data looked up by ID
+        # Only load if: file exists, clear not clicked, and this file wasn't already cleared
+        _profile_name = load_profile.name() if load_profile.value else None
+        _was_cleared = _profile_name is not None and _profile_name == get_cleared_profile()
+        if load_profile.value and not clear_btn.value and not _was_cleared:
+            try:
+                _profile_ids = json.loads(load_profile.value[0].contents.decode('utf-8'))
+                if isinstance(_profile_ids, list):
+                    # Resolve the whole profile against the indexed export in one lookup
+                    _loaded_penances, _unknown = penance_index.records(_profile_ids)
+                    set_tracked(_loaded_penances)
+                    set_unknown_ids(_unknown)
+                    # Clear the "cleared" flag since we loaded a new/same profile
+                    set_cleared_profile(None)
+            except (json.JSONDecodeError, IndexError, AttributeError):
+                pass  # Invalid JSON, ignore
+
+        # Clear button clicked - mark profile as cleared and empty tracked list
+        if clear_btn.value:
+            if load_profile.value:
+                set_cleared_profile(load_profile.name())
+            set_tracked([])
+            set_unknown_ids([])
+
+        # Get current tracked penances
+        tracked_list = get_tracked()
+
+        # Remember them for this account's next visit
+        if export_cache.set_tracked(account_meta.account_id, [_p['Achievement_ID'] for _p in tracked_list]):
+            pc.persist_browser_storage()
+
+        # Create save profile download element - shown directly when there are tracked penances
+        _save_profile = None
+        if tracked_list:
+            _profile_ids = [_p.get('Achievement_ID') for _p in tracked_list]
+            _profile_json = json.dumps(_profile_ids, indent=2)
+            _save_profile = mo.download(
+                data=_profile_json.encode('utf-8'),
+                filename="penance_profile.json",
+                mimetype="application/json",
+                label="Save Profile"
+            )
+
+        # Tracked cards - only the visible page is rendered; each card is built once per Achievement_ID
+        # and kept until its progress or ETA changes, and all of them share one stylesheet
+        if tracked_list:
+            _pages = tracked_cards.pages(len(tracked_list))
+            _cards = mo.Html(tracked_cards.render(tracked_list, eta_frame['ETA_Days'], page=tracked_page.value or 1))
+            _pager = mo.hstack([tracked_page, mo.md(f"of {_pages}")], justify="start", align="center") if _pages > 1 else None
+
+            # Add save profile button at the bottom of tracked penances
+            _tracked_content = mo.vstack([
+                _pager,
+                _cards,
+                mo.hstack([_save_profile], justify="end") if _save_profile else None
+            ], gap=1)
+        else:
+            _tracked_content = mo.md("_Select penances from the Penance List and click 'Track Selected' to add them here._").callout(kind="info")
+
+        # Profile IDs this export doesn't know (e.g. a profile saved from another account or mod version)
+        _unknown_ids = get_unknown_ids()
+        if _unknown_ids:
+            _unknown_list = ", ".join(f"`{_aid}`" for _aid in _unknown_ids[:20])
+            _more = f" and {len(_unknown_ids) - 20} more" if len(_unknown_ids) > 20 else ""
+            _tracked_content = mo.vstack([
+                mo.md(f"**{len(_unknown_ids)}** profile penance(s) not found in this export: {_unknown_list}{_more}").callout(kind="warn"),
+                _tracked_content,
+            ])
+
+        # Status message for tracking
+        _status_msg = mo.md(f"**{len(tracked_list)}** tracked") if tracked_list else mo.md("_Select rows to track_")
+
+        # Build controls row - filters | track, clear, status | divider | load
+        _control_items = [
+            search_box, status_filter, category_filter, class_filter, stats_filter,
+            mo.Html("<div style='width: 1px; height: 24px; background: var(--border-color, #333); margin: 0 8px;'></div>"),
+            track_btn, clear_btn, _status_msg,
+            mo.Html("<div style='width: 1px; height: 24px; background: var(--border-color, #333); margin: 0 8px;'></div>"),
+            load_profile
+        ]
+
+        _controls = mo.hstack(_control_items, justify="start", align="center", gap=1)
+
+        # Tabs
+        _output = mo.vstack([
+            mo.md("#### ::lucide:table:: Penance Data"),
+            _controls,
+            mo.ui.tabs({
+                "::lucide:list:: Penance List": penance_table,
+                f"::lucide:target:: Tracked ({len(tracked_list)})": _tracked_content,
+            })
+        ])
+        _run.rows = len(tracked_list)
+    _output
+    return (tracked_list,)
 
-    # Build cards for tracked penances with X buttons
-    if tracked_list:
-        _cards = []
-        for _p in tracked_list:
-            _icon_path = _p.get('Icon', '')
-            # Handle NaN/null values - convert to string and check
-            if pd.isna(_icon_path) or not isinstance(_icon_path, str):
-                _icon_path = ''
-            # Extract filename from path like 'content/ui/textures/icons/achievements/achievement_icon_0124'
-            _icon_filename = _icon_path.split('/')[-1] if _icon_path else ''
-            _icon_url = f"public/icons/achievements/{_icon_filename}.png" if _icon_filename else ''
-            _title = _p.get('Title', 'Unknown')
-            _description = _p.get('Description', '')
-            _progress = _p.get('Progress', 0)
-            _goal = _p.get('Goal', 1)
-            _pct = min((_progress / _goal) * 100, 100) if _goal > 0 else 0
-
-            # Color based on progress
-            if _pct >= 100:
-                _bar_color = "#22c55e"  # green
-                _status_text = "Completed"
-            elif _pct >= 50:
-                _bar_color = "#f97316"  # orange
-                _status_text = f"{_progress}/{_goal}"
-            else:
-                _bar_color = "#ef4444"  # red
-                _status_text = f"{_progress}/{_goal}"
 
-            _card_html = mo.Html(f'''
-            <div style="
-                display: flex;
-                align-items: center;
-                gap: 12px;
-                padding: 12px;
-                border: 1px solid var(--border-color, #333);
-                border-radius: 8px;
-                background: linear-gradient(135deg, rgba(0,0,0,0.6) 0%, rgba(20,20,20,0.8) 100%);
-            ">
-                <img src="{_icon_url}" style="width: 64px; height: 64px; border-radius: 4px;" onerror="this.onerror=null; this.src='public/icons/achievements/achievement_icon_0001.png'">
-                <div style="flex: 1; min-width: 0;">
-                    <div style="font-weight: bold; margin-bottom: 4px;">{_title}</div>
-                    <div style="font-size: 0.8rem; color: var(--text-muted, #888); margin-bottom: 8px; white-space: nowrap; overflow: hidden; text-overflow: ellipsis;">{_description}</div>
-                    <div style="display: flex; align-items: center; gap: 8px;">
-                        <div style="flex: 1; height: 8px; background: #333; border-radius: 4px; overflow: hidden;">
-                            <div style="width: {_pct}%; height: 100%; background: {_bar_color}; transition: width 0.3s;"></div>
-                        </div>
-                        <div style="font-size: 0.75rem; color: var(--text-muted, #888); min-width: 60px; text-align: right;">{_status_text}</div>
-                    </div>
-                </div>
-            </div>
-            ''')
-            _cards.append(_card_html)
-
-        # Add save profile button at the bottom of tracked penances
-        _tracked_content = mo.vstack([
-            mo.vstack(_cards, gap=0.5),
-            mo.hstack([_save_profile], justify="end") if _save_profile else None
-        ], gap=1)
-    else:
-        _tracked_content = mo.md("_Select penances from the Penance List and click 'Track Selected' to add them here._").callout(kind="info")
-
-    # Status message for tracking
-    _status_msg = mo.md(f"**{len(tracked_list)}** tracked") if tracked_list else mo.md("_Select rows to track_")
-
-    # Build controls row - filters | track, clear, status | divider | load
-    _control_items = [
-        status_filter, category_filter, class_filter,
-        mo.Html("<div style='width: 1px; height: 24px; background: var(--border-color, #333); margin: 0 8px;'></div>"),
-        track_btn, clear_btn, _status_msg,
-        mo.Html("<div style='width: 1px; height: 24px; background: var(--border-color, #333); margin: 0 8px;'></div>"),
-        load_profile
-    ]
-
-    _controls = mo.hstack(_control_items, justify="start", align="center", gap=1)
-
-    # Tabs
-    mo.vstack([
-        mo.md("#### ::lucide:table:: Penance Data"),
-        _controls,
-        mo.ui.tabs({
-            "::lucide:list:: Penance List": penance_table,
-            f"::lucide:target:: Tracked ({len(tracked_list)})": _tracked_content,
+@app.cell(hide_code=True)
+def _(
+    chart_view_sizes,
+    filter_view_sizes,
+    load_view_sizes,
+    mo,
+    pc,
+    table_view_sizes,
+):
+    # Memory per derived view - each cell returns the sizes of the frames it creates, so this
+    # re-runs after every filter or chart change and a footprint that grows with interactions
+    # would show up here
+    _memory = pc.memory_table(load_view_sizes, table_view_sizes, filter_view_sizes, chart_view_sizes)
+    _owned_mb = _memory['Owned_Bytes'].sum() / 2**20
+    mo.accordion({
+        f"::lucide:memory-stick:: Memory by view ({_owned_mb:.1f} MB owned)": mo.ui.table(
+            _memory.reset_index(), selection=None, show_column_summaries=False,
+        ),
+    })
+    return
+
+
+@app.cell(hide_code=True)
+def _(filtered_chart_df, mo, penance_table, profiler, tracked_list):
+    # Cell profile of the reactive runs so far - re-run after the table, chart and tracked cards,
+    # the last cells of every run; hidden unless profiling is on
+    _runs = (penance_table, filtered_chart_df, tracked_list)
+    if profiler.enabled:
+        _summary = profiler.summary()
+        _output = mo.accordion({
+            f"::lucide:timer:: Cell profile ({len(profiler.runs)} runs, {_summary['Total_ms'].sum():.0f} ms)": mo.vstack([
+                mo.ui.table(_summary.reset_index(), selection=None, show_column_summaries=False),
+                mo.download(
+                    data=lambda: profiler.to_json().encode('utf-8'),
+                    filename="penance_hunter_profile.json",
+                    mimetype="application/json",
+                    label="Save Profile JSON",
+                ),
+            ]),
         })
-    ])
+    else:
+        _output = None
+    _output
     return
 
 
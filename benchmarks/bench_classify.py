@@ -0,0 +1,75 @@
+# /// script
+# requires-python = ">=3.12"
+# dependencies = [
+#     "numpy",
+#     "pandas",
+# ]
+# ///
+
+"""
+Benchmark penance_core.classify against the old row-wise apply path.
+
+Usage: python benchmarks/bench_classify.py [--repeat N]
+"""
+
+import argparse
+import sys
+import timeit
+from pathlib import Path
+
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "apps"))
+
+import penance_core as pc  # noqa: E402
+
+SAMPLE_CSV = ROOT / "apps" / "public" / "00000000-0000-0000-0000-000000000000_20260126_161207.csv"
+
+
+def legacy_classify(df):
+    """The apply(axis=1) path the beta notebook used before penance_core."""
+    def _extract_class(row):
+        if row.get('Category', '') not in pc.CLASS_CATEGORIES:
+            return 'General'
+        achievement_id_lower = row['Achievement_ID'].lower()
+        for class_key, class_value in pc.CLASS_MAPPING.items():
+            if class_key in achievement_id_lower:
+                return class_value
+        return 'General'
+
+    def _map_category(row):
+        if row['Category'] in pc.CATEGORY_MAP:
+            return pc.CATEGORY_MAP[row['Category']]
+        if row['Achievement_ID'] and any(term in row['Achievement_ID'].lower() for term in pc.EXPLORATION_TERMS):
+            return 'Exploration'
+        return 'Endeavours'
+
+    df['Penance_Class'] = df.apply(_extract_class, axis=1)
+    df['Penance_Category'] = df.apply(_map_category, axis=1)
+    return df
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    base_df = pd.read_csv(SAMPLE_CSV, comment='#')
+    for scale in (1, 10, 100):
+        df = pd.concat([base_df] * scale, ignore_index=True)
+
+        legacy = legacy_classify(df.copy())
+        fast = pc.classify(df.copy())
+        assert (legacy['Penance_Class'] == fast['Penance_Class'].astype(str)).all()
+        assert (legacy['Penance_Category'] == fast['Penance_Category'].astype(str)).all()
+
+        repeat = max(1, args.repeat // scale)
+        t_legacy = timeit.timeit(lambda: legacy_classify(df.copy()), number=repeat) / repeat
+        t_fast = timeit.timeit(lambda: pc.classify(df.copy()), number=repeat) / repeat
+        print(f"{len(df):>7} rows  apply: {t_legacy * 1000:8.2f} ms  "
+              f"vectorized: {t_fast * 1000:7.2f} ms  speedup: {t_legacy / t_fast:5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,326 @@
+# /// script
+# requires-python = ">=3.12"
+# dependencies = [
+#     "altair==6.0.0",
+#     "marimo==0.25.1",
+#     "numpy",
+#     "pandas==2.3.3",
+#     "pyarrow",
+# ]
+# ///
+
+"""
+Headless load/interaction benchmark of the stable and beta notebooks.
+
+Each notebook is run through marimo's app API (`app.run(defs=...)`, with the
+upload widget overridden) against the sample export and synthetic exports of
+10k-100k penances across several accounts. Per-cell wall times are grouped
+into phases by what each cell defines:
+
+    load      cell defining penances_df (read + classify + derived columns)
+    classify  time inside pc.classify
+    filter    table/filter cells (table_filters, penance_table)
+    chart     chart cells (chart_timeline, filtered_chart_df)
+    tracking  tracking cell, with Track Selected clicked (and a profile loaded in beta)
+
+and the interaction paths are re-timed on the objects each notebook built
+(every filter combination, chart date windows). Results are written as JSON;
+beta/stable ratios over --max-ratio (or regressions against --baseline) are
+reported and make the run exit non-zero with --check.
+
+Usage: python benchmarks/bench_notebooks.py [--sizes 10000 100000] [--accounts 3] [-o results.json]
+"""
+
+import argparse
+import contextlib
+import importlib
+import itertools
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import marimo
+import pandas as pd
+# Private API, used to time each cell: only known to work with the marimo pinned above
+from marimo._runtime.executor.evaluator import Evaluator
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "apps"))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+import penance_core as pc  # noqa: E402
+from synthetic import SAMPLE_CSV, scaled_export  # noqa: E402
+
+NOTEBOOKS = ["penance_hunter", "penance_hunter_beta"]
+RESULTS_DIR = ROOT / "benchmarks" / "results"
+
+# Phase -> names whose defining cells belong to it
+PHASES = {
+    'load': {'penances_df'},
+    'filter': {'table_filters', 'penance_table'},
+    'chart': {'chart_timeline', 'filtered_chart_df'},
+    'tracking': {'tracked_list'},
+}
+TRACKED_ROWS = 200
+
+# Where the notebooks persist state; every run gets fresh directories so the user's own stores are
+# never touched and each run parses its exports instead of hitting the export cache
+STORE_ENV = ['PENANCE_HUNTER_HISTORY', 'PENANCE_HUNTER_CACHE', 'PENANCE_HUNTER_RARITY']
+
+
+class FakeFile:
+    def __init__(self, name: str, contents: bytes):
+        self.name, self.contents = name, contents
+
+
+class FakeUpload:
+    """Stands in for mo.ui.file in both notebooks (stable reads .name()/.contents(), beta .value)."""
+
+    def __init__(self, files: list[tuple[str, bytes]]):
+        self.value = [FakeFile(name, contents) for name, contents in files]
+
+    def name(self, index: int = 0) -> str:
+        return self.value[index].name
+
+    def contents(self, index: int = 0) -> bytes:
+        return self.value[index].contents
+
+
+class FakeValue:
+    def __init__(self, value):
+        self.value = value
+
+
+@contextlib.contextmanager
+def cell_timer(records: list):
+    """Record (defs, seconds) for every cell marimo evaluates, plus time spent in pc.classify."""
+    evaluate, evaluate_sync, classify = Evaluator.evaluate, Evaluator.evaluate_sync, pc.classify
+
+    async def timed_evaluate(self, cell, glbls):
+        start = time.perf_counter()
+        try:
+            return await evaluate(self, cell, glbls)
+        finally:
+            records.append((set(cell.defs), time.perf_counter() - start))
+
+    def timed_evaluate_sync(self, cell, glbls):
+        start = time.perf_counter()
+        try:
+            return evaluate_sync(self, cell, glbls)
+        finally:
+            records.append((set(cell.defs), time.perf_counter() - start))
+
+    def timed_classify(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return classify(*args, **kwargs)
+        finally:
+            records.append(({'<classify>'}, time.perf_counter() - start))
+
+    Evaluator.evaluate, Evaluator.evaluate_sync, pc.classify = timed_evaluate, timed_evaluate_sync, timed_classify
+    try:
+        yield records
+    finally:
+        Evaluator.evaluate, Evaluator.evaluate_sync, pc.classify = evaluate, evaluate_sync, classify
+
+
+def phase_times(records: list) -> dict:
+    times = {phase: 0.0 for phase in [*PHASES, 'classify', 'other']}
+    for defs, seconds in records:
+        if defs == {'<classify>'}:
+            times['classify'] += seconds
+            continue
+        phase = next((p for p, names in PHASES.items() if defs & names), 'other')
+        times[phase] += seconds
+    return {phase: round(seconds * 1000, 2) for phase, seconds in times.items()}
+
+
+def upload_defs(files: list[tuple[str, bytes]]) -> dict:
+    public = ROOT / "apps" / "public"
+    return {
+        'csv_upload': FakeUpload(files),
+        'default_csv': SAMPLE_CSV,
+        'is_wasm': lambda: False,
+        'public_dir': public,
+        'public_url': "public",
+    }
+
+
+@contextlib.contextmanager
+def isolated_stores():
+    """Point every STORE_ENV variable at a fresh temporary directory, restoring them afterwards."""
+    saved = {name: os.environ.get(name) for name in STORE_ENV}
+    with tempfile.TemporaryDirectory() as root:
+        try:
+            for name in STORE_ENV:
+                os.environ[name] = os.path.join(root, name.rsplit('_', 1)[-1].lower())
+            yield root
+        finally:
+            for name, value in saved.items():
+                if value is None:
+                    os.environ.pop(name, None)
+                else:
+                    os.environ[name] = value
+
+
+def run_notebook(app: marimo.App, defs: dict) -> tuple[dict, float, dict]:
+    records = []
+    with isolated_stores(), cell_timer(records):
+        start = time.perf_counter()
+        _, out = app.run(defs=defs)
+        total = time.perf_counter() - start
+    return out, total, phase_times(records)
+
+
+def interaction_times(out: dict) -> dict:
+    """Re-time the widget-driven paths on the objects the notebook built."""
+    times = {}
+    filters = out.get('table_filters')
+    if filters is not None:
+        columns = list(filters.frame.columns)
+        options = [[None, *filters.masks[col]] for col in pc.FILTER_COLUMNS]
+        start = time.perf_counter()
+        combos = 0
+        for status, category, cls in itertools.product(*options):
+            filters.select(columns, Status=status, Penance_Category=category, Penance_Class=cls)
+            combos += 1
+        times['filter_select_ms'] = round((time.perf_counter() - start) / combos * 1000, 3)
+
+    timeline = out.get('chart_timeline')
+    if timeline is not None and len(timeline):
+        windows = pd.date_range(timeline.start, timeline.end, periods=6)
+        start = time.perf_counter()
+        for lo, hi in zip(windows[:-1], windows[1:]):
+            window, _ = timeline.window(None, lo, hi)
+            pc.chart_points(window)
+        window, _ = timeline.window()
+        pc.chart_points(window)
+        times['chart_window_ms'] = round((time.perf_counter() - start) / 6 * 1000, 3)
+
+    search = out.get('table_search')
+    if search is not None:
+        queries = ["kill elite", "volley fire", "zealot", "mastery", "havoc"]
+        start = time.perf_counter()
+        for query in queries:
+            search.search(query)
+        times['search_ms'] = round((time.perf_counter() - start) / len(queries) * 1000, 3)
+    return times
+
+
+def tracking_defs(nb_source: str, penances_df: pd.DataFrame) -> dict:
+    """Overrides that click Track Selected on TRACKED_ROWS rows (and load a profile of every ID in beta)."""
+    selected = penances_df.head(TRACKED_ROWS).reset_index(drop=True)
+    defs = {
+        'track_btn': FakeValue(True),
+        'clear_btn': FakeValue(False),
+        'penance_table': FakeValue(selected),
+    }
+    if 'filter_view_sizes' in nb_source:
+        # Defined next to penance_table by the beta filter cell
+        defs['filter_view_sizes'] = {}
+    if 'load_profile = ' in nb_source:
+        profile = json.dumps(list(penances_df['Achievement_ID'])).encode("utf-8")
+        upload = FakeUpload([("profile.json", profile)])
+        defs['load_profile'] = upload
+    return defs
+
+
+def datasets(sizes: list[int], accounts: int) -> list[tuple[str, list[tuple[str, bytes]]]]:
+    out = [("sample", [(SAMPLE_CSV.name, SAMPLE_CSV.read_bytes())])]
+    for size in sizes:
+        files = [scaled_export(size, account=n) for n in range(1, accounts + 1)]
+        out.append((f"{size // 1000}k_x{accounts}", files))
+    return out
+
+
+def benchmark(sizes: list[int], accounts: int, repeat: int) -> list[dict]:
+    results = []
+    for name, files in datasets(sizes, accounts):
+        for nb_name in NOTEBOOKS:
+            module = importlib.import_module(nb_name)
+            nb_source = (ROOT / "apps" / f"{nb_name}.py").read_text(encoding="utf-8")
+            defs = upload_defs(files)
+
+            runs = [run_notebook(module.app, defs) for _ in range(repeat)]
+            out = runs[-1][0]
+            tracking = [run_notebook(module.app, {**defs, **tracking_defs(nb_source, out['penances_df'])})
+                        for _ in range(repeat)]
+
+            phases = {phase: statistics.median(r[2][phase] for r in runs) for phase in runs[0][2]}
+            phases['tracking'] = statistics.median(r[2]['tracking'] for r in tracking)
+            result = {
+                'notebook': nb_name,
+                'dataset': name,
+                'rows': len(out['penances_df']),
+                'accounts': len(files),
+                'startup_ms': round(statistics.median(r[1] for r in runs) * 1000, 2),
+                'phases_ms': phases,
+                'interactions': interaction_times(out),
+            }
+            results.append(result)
+            print(f"{nb_name:<22}{name:<12}{result['rows']:>8} rows  startup {result['startup_ms']:>9.1f} ms  "
+                  + "  ".join(f"{k} {v:.1f}" for k, v in phases.items() if k != 'other'))
+    return results
+
+
+def compare(results: list[dict], max_ratio: float, baseline: list[dict] | None) -> list[str]:
+    """Human-readable problems: beta vs stable divergence, and regressions against a baseline run."""
+    problems = []
+    by_key = {(r['notebook'], r['dataset']): r for r in results}
+    for (nb_name, dataset), beta in by_key.items():
+        if nb_name != "penance_hunter_beta" or ("penance_hunter", dataset) not in by_key:
+            continue
+        stable = by_key[("penance_hunter", dataset)]
+        for phase, beta_ms in [('startup', beta['startup_ms']), *beta['phases_ms'].items()]:
+            stable_ms = stable['startup_ms'] if phase == 'startup' else stable['phases_ms'][phase]
+            if phase != 'other' and stable_ms > 5 and beta_ms / stable_ms > max_ratio:
+                problems.append(f"{dataset}: beta {phase} {beta_ms:.1f} ms vs stable {stable_ms:.1f} ms")
+    for old in baseline or []:
+        new = by_key.get((old['notebook'], old['dataset']))
+        if new and old['startup_ms'] > 5 and new['startup_ms'] / old['startup_ms'] > max_ratio:
+            problems.append(f"{old['notebook']} {old['dataset']}: startup {new['startup_ms']:.1f} ms "
+                            f"vs baseline {old['startup_ms']:.1f} ms")
+    return problems
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="*", default=[10_000, 100_000], help="synthetic export sizes (penances)")
+    parser.add_argument("--accounts", type=int, default=3, help="synthetic accounts per dataset")
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("-o", "--output", type=Path, default=RESULTS_DIR / "notebooks.json")
+    parser.add_argument("--baseline", type=Path, help="earlier results JSON to check for regressions")
+    parser.add_argument("--max-ratio", type=float, default=1.5, help="slowdown factor reported as a regression")
+    parser.add_argument("--check", action="store_true", help="exit 1 if any regression is reported")
+    args = parser.parse_args()
+
+    results = benchmark(args.sizes, args.accounts, max(1, args.repeat))
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))['results'] if args.baseline else None
+    problems = compare(results, args.max_ratio, baseline)
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps({
+        'meta': {
+            'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'marimo': marimo.__version__,
+            'pandas': pd.__version__,
+        },
+        'results': results,
+        'problems': problems,
+    }, indent=2), encoding="utf-8")
+    print(f"Results written to {args.output}")
+    for problem in problems:
+        print(f"REGRESSION {problem}")
+    return 1 if problems and args.check else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,82 @@
+# /// script
+# requires-python = ">=3.12"
+# dependencies = [
+#     "numpy",
+#     "pandas",
+#     "pyarrow",
+# ]
+# ///
+
+"""
+Peak memory of streamed export ingestion as the input grows.
+
+Writes files of 1, 4 and 16 concatenated synthetic exports, then summarizes
+and history-ingests each one batch by batch in a fresh process and reports
+its peak RSS, which should stay flat as the file grows.
+
+Usage: python benchmarks/bench_stream.py [--penances N] [--exports 1 4 16]
+"""
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "apps"))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+import synthetic  # noqa: E402
+
+
+def measure(path: Path, history: Path) -> dict:
+    """Summarize and history-ingest `path` streaming; runs in its own process."""
+    from penance_core import HistoryStore
+    from penance_core.cli import summarize_file
+
+    start = time.perf_counter()
+    summaries = summarize_file(path)
+    with open(path, 'rb') as f:
+        added = HistoryStore(history).ingest_stream(f, path.name)
+    return {
+        'exports': len(summaries),
+        'snapshots': len(added),
+        'mb': round(path.stat().st_size / 2**20, 1),
+        'seconds': round(time.perf_counter() - start, 2),
+        'peak_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--penances", type=int, default=20000, help="penances per export")
+    parser.add_argument("--exports", type=int, nargs="+", default=[1, 4, 16], help="exports per file")
+    parser.add_argument("--measure", nargs=2, type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        print(json.dumps(measure(*args.measure)))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        exports = list(synthetic.generate(tmp / "exports", penances=args.penances, exports=max(args.exports)))
+        for n in args.exports:
+            combined = tmp / exports[0].name
+            with open(combined, 'wb') as out:
+                for path in exports[:n]:
+                    out.write(path.read_bytes())
+            result = subprocess.run(
+                [sys.executable, __file__, "--measure", str(combined), str(tmp / f"history_{n}")],
+                check=True, capture_output=True, text=True,
+            )
+            print(json.loads(result.stdout))
+            combined.unlink()
+
+
+if __name__ == "__main__":
+    main()
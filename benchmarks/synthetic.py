@@ -0,0 +1,334 @@
+# /// script
+# requires-python = ">=3.12"
+# dependencies = [
+#     "numpy",
+# ]
+# ///
+
+"""
+Synthetic penance exports in the exact format `perform_export` in
+penance_exporter.lua writes: the `#` header block, the 21-column CSV with
+weapon mastery rows, and `<account_id>_<YYYYMMDD>_<HHMMSS>.csv` names.
+
+Penance definitions (IDs, categories, icons, titles, descriptions, goals,
+scores, Stats_Detail layouts) come from the sample export, repeated with
+suffixed IDs past its 1028 rows. Each account gets a fixed progress model -
+a completion day per penance, an XP rate per weapon pattern - so its exports
+are monotonic snapshots taken at the export cadence. Files are written row by
+row; only per-penance arrays for one account are ever held in memory, so
+corpora of any size can be streamed to disk.
+
+Usage: python benchmarks/synthetic.py OUT_DIR [--accounts 10] [--exports 30] [--cadence 24] [--penances 5000]
+"""
+
+import argparse
+import csv
+import io
+import re
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Iterator, TextIO
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+SAMPLE_CSV = ROOT / "apps" / "public" / "00000000-0000-0000-0000-000000000000_20260126_161207.csv"
+
+MOD_VERSION = "2.4.9"
+CSV_HEADER = ("Export_Account,Export_Platform,Export_Character,Export_Archetype,Export_Mod_Date,Achievement_ID,"
+              "Category,Icon,Title,Description,Status,Progress,Goal,Progress_Percentage,Completion_Time,Score,"
+              "Stats_Detail,Mastery_Level,Mastery_XP,Mastery_XP_Next_Level,Mastery_Progress_Percent")
+MASTERY_CATEGORY = "loc_weapon_progression_mastery"
+MASTERY_MAX_LEVEL = 20
+
+# XP needed to finish each mastery level 0-19, interpolated between the thresholds seen in the sample
+_MASTERY_ANCHORS = {0: 5850, 4: 33222, 6: 51869, 9: 88333, 13: 151475, 14: 169030, 16: 207643, 19: 277395}
+MASTERY_LEVEL_XP = np.interp(np.arange(MASTERY_MAX_LEVEL), list(_MASTERY_ANCHORS), list(_MASTERY_ANCHORS.values())).astype(np.int64)
+
+ARCHETYPES = ['Veteran', 'Zealot', 'Psyker', 'Ogryn', 'Arbitrator', 'Hive Scum']
+PLATFORMS = ['Steam', 'Steam', 'Steam', 'Xbox', 'PlayStation']
+_NAME_PARTS = ['Bonk', 'Rudge', 'Montov', 'Vask', 'Dre', 'Kell', 'Ulric', 'Tarsk', 'Mira', 'Sable', 'Grim', 'Hax', 'Ortho', 'Zev']
+_STAT_PART = re.compile(r'^(.*): (\d+)/(\d+)$')
+
+# Seconds between the export date in the header and the timestamp in the filename
+FILENAME_LAG = 6
+
+
+def csv_escape(value) -> str:
+    """Same quoting as the mod's csv_escape: quote only fields with quotes, commas or newlines."""
+    value = str(value)
+    if any(c in value for c in '",\n\r'):
+        return '"' + value.replace('"', '""') + '"'
+    return value
+
+
+@dataclass
+class Catalogue:
+    """Static per-penance columns, pre-escaped, in export row order."""
+    static: list[str]                 # "Achievement_ID,Category,Icon,Title,Description"
+    goal: np.ndarray
+    score: list[int]
+    mastery: np.ndarray               # bool: weapon mastery row
+    stats: dict[int, list[tuple[str, int]]] = field(default_factory=dict)  # row -> [(stat name, target)]
+
+    def __len__(self) -> int:
+        return len(self.static)
+
+
+def _sample_rows() -> list[dict]:
+    text = SAMPLE_CSV.read_text(encoding="utf-8")
+    body = text[text.index("Export_Account,"):]
+    return list(csv.DictReader(io.StringIO(body)))
+
+
+def load_catalogue(penances: int | None = None, mastery_patterns: int | None = None) -> Catalogue:
+    """`penances` definitions, `mastery_patterns` of them weapon mastery rows (defaults: as in the sample)."""
+    rows = _sample_rows()
+    weapons = [r for r in rows if r['Category'] == MASTERY_CATEGORY]
+    others = [r for r in rows if r['Category'] != MASTERY_CATEGORY]
+    mastery_patterns = len(weapons) if mastery_patterns is None else mastery_patterns
+    penances = len(rows) if penances is None else penances
+    mastery_patterns = min(mastery_patterns, penances)
+
+    def cycle(base: list[dict], n: int) -> Iterator[dict]:
+        for i in range(n):
+            row, copy = base[i % len(base)], i // len(base)
+            yield {**row, 'Achievement_ID': f"{row['Achievement_ID']}_{copy}"} if copy else row
+
+    selected = [*cycle(others, penances - mastery_patterns), *cycle(weapons, mastery_patterns)]
+    stats = {}
+    for i, row in enumerate(selected):
+        if row['Stats_Detail']:
+            parts = [_STAT_PART.match(part).groups() for part in row['Stats_Detail'].split('; ')]
+            stats[i] = [(name, int(target)) for name, _, target in parts]
+    return Catalogue(
+        static=[",".join(csv_escape(r[c]) for c in ('Achievement_ID', 'Category', 'Icon', 'Title', 'Description'))
+                for r in selected],
+        goal=np.array([MASTERY_MAX_LEVEL if r['Category'] == MASTERY_CATEGORY else max(int(r['Goal']), 1)
+                       for r in selected], dtype=np.int64),
+        score=[int(r['Score']) for r in selected],
+        mastery=np.array([r['Category'] == MASTERY_CATEGORY for r in selected]),
+        stats=stats,
+    )
+
+
+@dataclass
+class Character:
+    name: str
+    archetype: str
+    level: int
+    true_level: int
+    prestige: int
+
+
+@dataclass
+class Account:
+    """One synthetic account and its progress model; progress at any time is a pure function of it."""
+    id: str
+    name: str
+    platform: str
+    characters: list[Character]
+    started: datetime
+    done_day: np.ndarray              # day (since `started`) each penance completes; inf = never
+    overshoot: np.ndarray             # progress keeps counting up to goal * overshoot
+    stat_day: dict[int, np.ndarray]   # row -> completion day of each Stats_Detail part
+    xp_rate: np.ndarray               # mastery XP per day (0 for non-mastery rows)
+
+    @classmethod
+    def create(cls, n: int, catalogue: Catalogue, characters: int, start: datetime, seed: int = 0) -> "Account":
+        rng = np.random.default_rng([seed, n])
+        age = rng.uniform(60, 1000)
+        done_day = rng.lognormal(np.log(age * 0.35), 1.0, len(catalogue))
+        done_day[rng.random(len(catalogue)) < 0.1] = np.inf
+        overshoot = np.where((catalogue.goal > 1) & (rng.random(len(catalogue)) < 0.3),
+                             1 + rng.exponential(2.0, len(catalogue)), 1.0)
+        xp_rate = np.where(catalogue.mastery & np.isfinite(done_day), MASTERY_LEVEL_XP[-1] / done_day, 0.0)
+
+        chars = []
+        archetypes, names = rng.permutation(ARCHETYPES), rng.permutation(_NAME_PARTS)
+        for i in range(characters):
+            true_level = int(rng.integers(30, 200))
+            chars.append(Character(
+                name=f"{names[i % len(names)]}{i // len(names) or ''}",
+                archetype=str(archetypes[i % len(archetypes)]),
+                level=30,
+                true_level=true_level,
+                prestige=(true_level - 30) // 12,
+            ))
+        return cls(
+            id=str(uuid.UUID(bytes=rng.bytes(16), version=4)),
+            name=f"Synthetic Account {n}",
+            platform=str(rng.choice(PLATFORMS)),
+            characters=chars,
+            started=start - timedelta(days=age),
+            done_day=done_day,
+            overshoot=overshoot,
+            stat_day={i: done_day[i] * rng.uniform(0.3, 1.0, len(parts)) for i, parts in catalogue.stats.items()},
+            xp_rate=xp_rate,
+        )
+
+    def completion_times(self) -> list[str]:
+        """Completion_Time strings (empty for never), the same in every export of the account."""
+        finite = np.isfinite(self.done_day)
+        seconds = np.where(finite, self.done_day * 86400, 0).astype('timedelta64[s]')
+        stamps = (np.datetime64(self.started, 's') + seconds).astype(str)
+        return [s.replace('T', ' ') if ok else '' for s, ok in zip(stamps.tolist(), finite.tolist())]
+
+
+def _header(out: TextIO, account: Account, character: Character, export_date: str, timezone: str,
+            total: int, completed: int) -> None:
+    w = out.write
+    w("# Darktide Penance Export\n")
+    w(f"# Mod Version: {MOD_VERSION}\n")
+    w(f"# Account: {account.name}\n")
+    w(f"# Account ID: {account.id}\n")
+    w(f"# Platform: {account.platform}\n")
+    chars = account.characters
+    if chars:
+        w(f"# Number of Characters: {len(chars)}\n")
+        w(f"# Account Level: {sum(c.level for c in chars)}\n")
+        w(f"# Account True Level: {sum(c.true_level for c in chars)}\n")
+        if sum(c.prestige for c in chars) > 0:
+            w(f"# Account Prestige: {sum(c.prestige for c in chars)}\n")
+    w("#\n")
+    if chars:
+        w("# All Characters:\n")
+        for i, c in enumerate(chars, 1):
+            level = f"{c.level} (True: {c.true_level}, Prestige: {c.prestige})" if c.true_level > c.level else c.level
+            w(f"#   {i}. {c.name} ({c.archetype}) - Level {level}\n")
+        w("#\n")
+    w(f"# Export Character: {character.name}\n")
+    w(f"# Export Archetype: {character.archetype}\n")
+    w(f"# Export Character Level: {character.level}\n")
+    if character.true_level > character.level:
+        w(f"# Export Character True Level: {character.true_level}\n")
+        w(f"# Export Additional Levels: +{character.true_level - character.level}\n")
+        if character.prestige > 0:
+            w(f"# Export Character Prestige: {character.prestige}\n")
+    w("#\n")
+    w(f"# Export Date: {export_date}\n")
+    w(f"# Export Timezone: {timezone}\n")
+    w(f"# Total Penances: {total}\n")
+    w(f"# Completed Penances: {completed}\n")
+    w(f"# Completion Rate: {completed / total * 100 if total else 0:.1f}%\n")
+    w("\n")
+
+
+def write_export(out: TextIO, catalogue: Catalogue, account: Account, character: Character, when: datetime,
+                 timezone: str = "-0500", completion_times: list[str] | None = None, chunk: int = 4096) -> int:
+    """Stream one export of `account` taken at `when` to `out`; returns the number of penance rows."""
+    day = (when - account.started).total_seconds() / 86400
+    done = account.done_day <= day
+    with np.errstate(divide='ignore', invalid='ignore'):
+        fraction = np.minimum(np.where(np.isfinite(account.done_day), day / account.done_day, 0), account.overshoot)
+    progress = np.floor(catalogue.goal * fraction).astype(np.int64)
+    progress = np.where(done, np.maximum(progress, catalogue.goal), np.minimum(progress, catalogue.goal - 1))
+
+    # Weapon mastery: XP grows linearly to the level-20 total
+    xp = np.minimum(np.floor(account.xp_rate * max(day, 0)), MASTERY_LEVEL_XP[-1]).astype(np.int64)
+    level = np.searchsorted(MASTERY_LEVEL_XP, xp, side='right')
+    level = np.where(done, MASTERY_MAX_LEVEL, np.minimum(level, MASTERY_MAX_LEVEL - 1))
+    next_xp = np.where(level < MASTERY_MAX_LEVEL, MASTERY_LEVEL_XP[np.minimum(level, MASTERY_MAX_LEVEL - 1)], xp)
+    start_xp = np.where(level > 0, MASTERY_LEVEL_XP[np.maximum(level - 1, 0)], 0)
+    span = next_xp - start_xp
+    level_pct = np.where(span > 0, (xp - start_xp) * 100 // np.where(span > 0, span, 1), 100)
+    progress = np.where(catalogue.mastery, level, progress)
+    percent = progress * 100 // catalogue.goal
+
+    completed = int(done.sum())
+    export_date = when.strftime("%Y-%m-%d %H:%M:%S")
+    _header(out, account, character, export_date, timezone, len(catalogue), completed)
+    out.write(CSV_HEADER + "\n")
+
+    prefix = ",".join(csv_escape(v) for v in (account.name, account.platform, character.name, character.archetype, export_date))
+    times = completion_times if completion_times is not None else account.completion_times()
+    done_l, progress_l, goal_l, percent_l = done.tolist(), progress.tolist(), catalogue.goal.tolist(), percent.tolist()
+    mastery_l = catalogue.mastery.tolist()
+    level_l, xp_l, next_l, level_pct_l = level.tolist(), xp.tolist(), next_xp.tolist(), level_pct.tolist()
+
+    lines = []
+    for i, static in enumerate(catalogue.static):
+        stats = ''
+        if i in catalogue.stats:
+            parts = catalogue.stats[i]
+            part_days = account.stat_day[i]
+            stats = csv_escape("; ".join(
+                f"{name}: {target if done_l[i] or part_day <= day else int(target * day / part_day)}/{target}"
+                for (name, target), part_day in zip(parts, part_days)))
+        mastery = f"{level_l[i]},{xp_l[i]},{next_l[i]},{level_pct_l[i]}" if mastery_l[i] else ",,,"
+        lines.append(f"{prefix},{static},{'Completed' if done_l[i] else 'In Progress'},{progress_l[i]},{goal_l[i]},"
+                     f"{percent_l[i]}%,{times[i] if done_l[i] else ''},{catalogue.score[i]},{stats},{mastery}\n")
+        if len(lines) >= chunk:
+            out.writelines(lines)
+            lines.clear()
+    out.writelines(lines)
+    return len(catalogue)
+
+
+def export_times(n: int, exports: int, cadence: timedelta, start: datetime, seed: int = 0) -> list[datetime]:
+    """Export timestamps of account `n`: every `cadence` from `start`, with up to +-10% jitter."""
+    rng = np.random.default_rng([seed, n, 1])
+    first = start + cadence * rng.uniform(0, 1)
+    jitter = rng.uniform(-0.1, 0.1, exports)
+    return [(first + cadence * (k + j)).replace(microsecond=0) for k, j in enumerate(jitter)]
+
+
+def export_filename(account: Account, when: datetime) -> str:
+    return f"{account.id}_{(when + timedelta(seconds=FILENAME_LAG)):%Y%m%d_%H%M%S}.csv"
+
+
+def generate(out_dir: Path, accounts: int = 1, characters: int = 5, penances: int | None = None,
+             mastery_patterns: int | None = None, exports: int = 1, cadence: timedelta = timedelta(days=1),
+             start: datetime = datetime(2026, 1, 1), timezone: str = "-0500", seed: int = 0) -> Iterator[Path]:
+    """Write `exports` exports for each of `accounts` accounts into `out_dir`, yielding each path once written."""
+    out_dir.mkdir(parents=True, exist_ok=True)
+    catalogue = load_catalogue(penances, mastery_patterns)
+    for n in range(1, accounts + 1):
+        account = Account.create(n, catalogue, characters, start, seed)
+        times = account.completion_times()
+        for k, when in enumerate(export_times(n, exports, cadence, start, seed)):
+            character = account.characters[k % len(account.characters)]
+            path = out_dir / export_filename(account, when)
+            with open(path, 'w', encoding='utf-8', newline='') as f:
+                write_export(f, catalogue, account, character, when, timezone, times)
+            yield path
+
+
+def scaled_export(rows: int, account: int = 0, stamp: str = "20260126_161207") -> tuple[str, bytes]:
+    """(filename, contents) of one `rows`-penance export of synthetic account `account`, in memory."""
+    catalogue = load_catalogue(rows)
+    acct = Account.create(account, catalogue, 5, datetime(2026, 1, 1))
+    when = datetime.strptime(stamp, "%Y%m%d_%H%M%S") - timedelta(seconds=FILENAME_LAG)
+    out = io.StringIO()
+    write_export(out, catalogue, acct, acct.characters[0], when)
+    return export_filename(acct, when), out.getvalue().encode("utf-8")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Generate synthetic penance exports in the mod's CSV format")
+    parser.add_argument("out_dir", type=Path)
+    parser.add_argument("--accounts", type=int, default=1)
+    parser.add_argument("--characters", type=int, default=5, help="characters per account")
+    parser.add_argument("--penances", type=int, help="penances per export (default: as in the sample, 1028)")
+    parser.add_argument("--mastery-patterns", type=int, help="weapon mastery rows per export (default: 59)")
+    parser.add_argument("--exports", type=int, default=1, help="exports per account")
+    parser.add_argument("--cadence", type=float, default=24, help="hours between an account's exports")
+    parser.add_argument("--start", type=datetime.fromisoformat, default=datetime(2026, 1, 1))
+    parser.add_argument("--timezone", default="-0500")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    started, files, size = time.perf_counter(), 0, 0
+    for path in generate(args.out_dir, args.accounts, args.characters, args.penances, args.mastery_patterns,
+                         args.exports, timedelta(hours=args.cadence), args.start, args.timezone, args.seed):
+        files += 1
+        size += path.stat().st_size
+    elapsed = time.perf_counter() - started
+    print(f"{files} exports, {size / 1e6:.1f} MB in {elapsed:.1f}s ({size / 1e6 / elapsed:.1f} MB/s) -> {args.out_dir}")
+
+
+if __name__ == "__main__":
+    main()
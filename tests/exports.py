@@ -0,0 +1,59 @@
+"""
+Small hand-written penance exports for the tests, in the format written by
+`perform_export`: a `#` header block, then the CSV rows.
+"""
+
+import csv
+import io
+from pathlib import Path
+
+from penance_core import CSV_COLUMNS
+
+SAMPLE_CSV = Path(__file__).resolve().parents[1] / "apps" / "public" / "00000000-0000-0000-0000-000000000000_20260126_161207.csv"
+
+ROW_DEFAULTS = {
+    'Export_Platform': 'Steam',
+    'Export_Character': 'Rudge',
+    'Export_Archetype': 'veteran',
+    'Category': 'loc_achievement_category_account_label',
+    'Icon': 'content/ui/textures/icons/achievements/achievement_icon_0001',
+    'Description': 'Do the thing.',
+    'Status': 'In Progress',
+    'Progress': 0,
+    'Goal': 10,
+    'Score': 10,
+    'Stats_Detail': '',
+}
+
+
+def penance(achievement_id: str, **values) -> dict:
+    """One export row; Title defaults to the ID, Progress_Percentage follows Progress/Goal."""
+    row = {**ROW_DEFAULTS, 'Achievement_ID': achievement_id, 'Title': achievement_id, **values}
+    if 'Progress_Percentage' not in values:
+        row['Progress_Percentage'] = f"{row['Progress'] / row['Goal'] * 100:.0f}%" if row['Goal'] else '0%'
+    if row['Status'] == 'Completed' and 'Completion_Time' not in values:
+        row['Completion_Time'] = '2026-01-01 10:00:00'
+    return row
+
+
+def make_export(rows: list[dict], account_id: str = 'acct-1', stamp: str = '20260101_120000',
+                account: str = 'Tester', columns=CSV_COLUMNS) -> tuple[str, bytes]:
+    """(filename, contents) of an export of `rows` taken at `stamp` ("YYYYMMDD_HHMMSS")."""
+    export_date = f"{stamp[:4]}-{stamp[4:6]}-{stamp[6:8]} {stamp[9:11]}:{stamp[11:13]}:{stamp[13:15]}"
+    out = io.StringIO()
+    out.write(
+        "# Darktide Penance Export\n"
+        "# Mod Version: 2.4.9\n"
+        f"# Account: {account}\n"
+        f"# Account ID: {account_id}\n"
+        "# Platform: Steam\n"
+        "#\n"
+        f"# Export Date: {export_date}\n"
+        f"# Total Penances: {len(rows)}\n"
+        "\n"
+    )
+    writer = csv.DictWriter(out, fieldnames=list(columns), extrasaction='ignore', lineterminator='\n')
+    writer.writeheader()
+    for row in rows:
+        writer.writerow({'Export_Account': account, 'Export_Mod_Date': export_date, **row})
+    return f"{account_id}_{stamp}.csv", out.getvalue().encode('utf-8')
@@ -0,0 +1,53 @@
+import pytest
+
+import penance_core as pc
+
+from .exports import make_export, penance
+
+
+def _parsed(account_id, stamp, n=50):
+    filename, contents = make_export([penance(f'p{i}') for i in range(n)], account_id=account_id, stamp=stamp)
+    meta, table = pc.read_export_table(contents)
+    return pc.export_key(meta, filename), meta, table, filename
+
+
+def test_round_trip_and_last(tmp_path):
+    key, meta, table, filename = _parsed('acct-1', '20260101_000000')
+    cache = pc.ExportCache(tmp_path)
+    cache.put(key, meta, table, filename)
+    reopened = pc.ExportCache(tmp_path)
+    assert reopened.last() == key
+    got_meta, got_table, source = reopened.get(key)
+    assert got_meta == meta and source == filename
+    assert got_table.equals(table)
+
+
+def test_least_recently_viewed_is_evicted(tmp_path):
+    exports = [_parsed('acct-1', f'2026010{i}_000000') for i in range(1, 4)]
+    cache = pc.ExportCache(tmp_path)
+    cache.put(*exports[0])
+    size = cache.total_bytes
+    cache = pc.ExportCache(tmp_path, max_bytes=int(size * 2.5))
+    cache.put(*exports[1])
+    cache.get(exports[0][0])
+    cache.put(*exports[2])
+    assert exports[0][0] in cache and exports[2][0] in cache
+    assert exports[1][0] not in cache
+
+
+def test_tracked_ids(tmp_path):
+    cache = pc.ExportCache(tmp_path)
+    assert cache.set_tracked('acct-1', ['a', 'b'])
+    assert not cache.set_tracked('acct-1', ['a', 'b'])
+    assert pc.ExportCache(tmp_path).tracked('acct-1') == ['a', 'b']
+    assert cache.tracked(None) == []
+
+
+def test_unsafe_account_id_is_not_stored(tmp_path):
+    cache = pc.ExportCache(tmp_path / 'cache')
+    _, meta, table, filename = _parsed('acct-1', '20260101_000000')
+    key = pc.ExportKey('../outside', '20260101_000000')
+    with pytest.raises(ValueError, match='invalid account ID'):
+        cache.put(key, meta, table, filename)
+    assert key not in cache and cache.get(key) is None
+    assert not (tmp_path / 'outside_20260101_000000.arrow').exists()
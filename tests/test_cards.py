@@ -0,0 +1,36 @@
+import penance_core as pc
+
+
+class _Atlas:
+    def html(self, icon, size=64, title=''):
+        return f'<img alt="{icon}">'
+
+
+def _penance(aid, progress=1, goal=4):
+    return {'Achievement_ID': aid, 'Title': aid, 'Progress': progress, 'Goal': goal, 'Description': '<b>'}
+
+
+def test_card_status():
+    assert pc.card_status(5, 5) == (100, '#22c55e', 'Completed')
+    assert pc.card_status(1, 4, eta_days=0.5)[2] == '1/4 · ETA <1d'
+    assert pc.card_status(3, 4, eta_days=float('nan'))[1:] == ('#f97316', '3/4')
+
+
+def test_cards_rebuilt_only_when_changed():
+    cards = pc.TrackedCards(_Atlas(), page_size=2)
+    penances = [_penance('a'), _penance('b'), _penance('c')]
+    html = cards.render(penances)
+    assert cards.built == 2 and html.count('class="ph-card"') == 2
+    assert '&lt;b&gt;' in html
+    cards.render(penances)
+    assert cards.built == 0
+    penances[0] = _penance('a', progress=2)
+    cards.render(penances)
+    assert cards.built == 1
+
+
+def test_page_is_clamped():
+    cards = pc.TrackedCards(_Atlas(), page_size=2)
+    html = cards.render([_penance('a'), _penance('b'), _penance('c')], page=9)
+    assert cards.pages(3) == 2
+    assert html.count('class="ph-card"') == 1
@@ -0,0 +1,61 @@
+import pandas as pd
+
+import penance_core as pc
+
+from .exports import SAMPLE_CSV
+
+
+def _extract_class(achievement_id):
+    # The per-row helper the notebooks used to run through DataFrame.apply
+    achievement_id_lower = achievement_id.lower()
+    for class_key, class_value in pc.CLASS_MAPPING.items():
+        if class_key in achievement_id_lower:
+            return class_value
+    return 'General'
+
+
+def _map_category(row):
+    if row['Category'] in pc.CATEGORY_MAP:
+        return pc.CATEGORY_MAP[row['Category']]
+    if row['Achievement_ID'] and any(term in row['Achievement_ID'].lower() for term in pc.EXPLORATION_TERMS):
+        return 'Exploration'
+    return 'Endeavours'
+
+
+def _sample():
+    return pc.read_export(SAMPLE_CSV.read_bytes())[1]
+
+
+def test_class_matches_apply_path():
+    df = _sample()
+    expected = df['Achievement_ID'].apply(_extract_class)
+    got = pc.penance_class(df, class_categories_only=False)
+    assert list(got) == list(expected)
+
+
+def test_class_categories_only_leaves_other_penances_general():
+    df = _sample()
+    got = pd.Series(pc.penance_class(df), index=df.index)
+    is_class = df['Category'].isin(pc.CLASS_CATEGORIES)
+    assert (got[~is_class] == 'General').all()
+    assert list(got[is_class]) == list(df.loc[is_class, 'Achievement_ID'].apply(_extract_class))
+
+
+def test_category_matches_apply_path():
+    df = _sample()
+    expected = df.apply(_map_category, axis=1)
+    assert list(pc.penance_category(df)) == list(expected)
+
+
+def test_first_matching_class_key_wins():
+    df = pd.DataFrame({
+        'Achievement_ID': ['zealot_and_veteran', 'ZELOT_kills', 'broker_1', 'adamant_2', 'nothing'],
+        'Category': ['loc_class_abilities_title'] * 5,
+    })
+    assert list(pc.penance_class(df)) == ['Veteran', 'Zealot', 'Hive Scum', 'Arbitrator', 'General']
+
+
+def test_classify_adds_categorical_columns():
+    df = pc.classify(_sample())
+    assert isinstance(df['Penance_Class'].dtype, pd.CategoricalDtype)
+    assert list(df['Penance_Category'].cat.categories) == pc.CATEGORIES
@@ -0,0 +1,76 @@
+import json
+from pathlib import Path
+
+import pandas as pd
+
+import penance_core as pc
+from penance_core.cli import main
+
+from .exports import make_export, penance
+
+
+def _write(directory, *exports):
+    for name, contents in exports:
+        (directory / name).write_bytes(contents)
+
+
+def test_summaries_and_exit_code(tmp_path, capsys):
+    exports = tmp_path / "exports"
+    exports.mkdir()
+    _write(exports,
+           make_export([penance('a', Status='Completed', Progress=10), penance('b')], account_id='acct-1'),
+           make_export([penance('a')], account_id='acct-2'))
+    out = tmp_path / "out"
+    assert main([str(exports), "-o", str(out), "-j", "1"]) == 0
+    assert "wrote 2 account summary(ies)" in capsys.readouterr().out
+
+    doc = json.loads((out / "accounts" / "acct-1.json").read_text(encoding="utf-8"))
+    assert doc['exports'] == 1 and doc['latest']['completed'] == 1
+    assert sorted(pd.read_parquet(out / "accounts.parquet")['account_id']) == ['acct-1', 'acct-2']
+
+
+def test_no_exports(tmp_path, capsys):
+    assert main([str(tmp_path), "-o", str(tmp_path / "out")]) == 1
+    assert "no exports found" in capsys.readouterr().err
+
+
+def test_bad_file_is_skipped(tmp_path, capsys):
+    _write(tmp_path, make_export([penance('a')], account_id='acct-1'))
+    (tmp_path / "acct-2_20260101_120000.csv").write_bytes(b"# Darktide Penance Export\n\nnot,the,columns\n1,2,3\n")
+    assert main([str(tmp_path), "-o", str(tmp_path / "out"), "-j", "1", "--format", "json"]) == 1
+    assert "skipped acct-2_20260101_120000.csv" in capsys.readouterr().err
+    assert [p.name for p in (tmp_path / "out" / "accounts").iterdir()] == ["acct-1.json"]
+
+
+def test_history_failure_skips_only_that_file(tmp_path, capsys):
+    store = pc.HistoryStore(tmp_path / "history")
+    store.ingest(*reversed(make_export([penance('a')], account_id='acct-1', stamp='20260301_000000')))
+
+    exports = tmp_path / "exports"
+    exports.mkdir()
+    _write(exports,
+           make_export([penance('a')], account_id='acct-1', stamp='20260101_000000'),  # older than the store's
+           make_export([penance('a')], account_id='acct-2', stamp='20260201_000000'))
+    code = main([str(exports), "-o", str(tmp_path / "out"), "-j", "1", "--history", str(tmp_path / "history")])
+    assert code == 1
+    captured = capsys.readouterr()
+    assert "skipped acct-1_20260101_000000.csv for history" in captured.err
+    assert "added 1 new snapshot(s)" in captured.out
+    assert pc.HistoryStore(tmp_path / "history").latest('acct-2').stamp == '20260201_000000'
+
+
+def test_rarity_reads_only_new_files(tmp_path, monkeypatch, capsys):
+    exports = tmp_path / "exports"
+    exports.mkdir()
+    _write(exports, make_export([penance('a')], account_id='acct-1', stamp='20260101_000000'))
+    args = [str(exports), "-o", str(tmp_path / "out"), "-j", "1", "--rarity", str(tmp_path / "rarity")]
+    assert main(args) == 0
+
+    read = []
+    read_bytes = Path.read_bytes
+    monkeypatch.setattr(Path, "read_bytes", lambda self: read.append(self.name) or read_bytes(self))
+    _write(exports, make_export([penance('a')], account_id='acct-1', stamp='20260201_000000'))
+    assert main(args) == 0
+    assert read == ['acct-1_20260201_000000.csv']
+    assert "rarity index: 1 new export(s), 1 account(s)" in capsys.readouterr().out
+    assert pc.RarityIndex(tmp_path / "rarity").accounts == {'acct-1': '20260201_000000'}
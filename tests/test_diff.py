@@ -0,0 +1,43 @@
+import pandas as pd
+
+import penance_core as pc
+
+from .exports import make_export, penance
+
+
+def _read(rows, **kwargs):
+    return pc.read_export(make_export(rows, **kwargs)[1])
+
+
+def test_diff_exports():
+    old_meta, old = _read([penance('a', Progress=2), penance('b', Progress=5), penance('gone')],
+                          stamp='20260101_000000')
+    new_meta, new = _read([penance('a', Status='Completed', Progress=10, Score=25), penance('b', Progress=8),
+                           penance('new')], stamp='20260201_000000')
+    diff = pc.diff_exports(old, new, old_meta, new_meta)
+
+    assert diff.newly_completed['Achievement_ID'].tolist() == ['a'] and diff.score_gained == 25
+    # Sorted by how much progress was made
+    assert diff.progress['Achievement_ID'].tolist() == ['a', 'b']
+    assert diff.progress.set_index('Achievement_ID').loc['b', 'Progress_Delta'] == 3
+    assert diff.added['Achievement_ID'].tolist() == ['new']
+    assert diff.removed['Achievement_ID'].tolist() == ['gone']
+    assert diff.mastery.empty and not diff.is_empty
+
+
+def test_identical_exports_are_empty():
+    meta, df = _read([penance('a', Progress=2), penance('b', Status='Completed', Progress=10)])
+    diff = pc.diff_exports(df, df.copy(), meta, meta)
+    assert diff.is_empty and diff.score_gained == 0
+
+
+def test_header_and_character_changes():
+    old = pc.ExportMetadata(account_level=10, characters=[pc.CharacterInfo(1, 'Rudge', 'Veteran', 29)])
+    new = pc.ExportMetadata(account_level=11, characters=[pc.CharacterInfo(1, 'Rudge', 'Veteran', 30),
+                                                          pc.CharacterInfo(2, 'Zek', 'Hive Scum', 1)])
+    empty = pd.DataFrame(columns=['Achievement_ID'])
+    diff = pc.diff_exports(empty, empty, old, new)
+    assert diff.header == {'account_level': (10, 11)}
+    assert diff.characters[['name', 'level_old', 'level_new']].values.tolist()[0] == ['Rudge', 29, 30]
+    # A new character counts as changed (no previous level)
+    assert diff.characters['name'].tolist() == ['Rudge', 'Zek']
@@ -0,0 +1,72 @@
+import pandas as pd
+import pytest
+
+import penance_core as pc
+
+from .exports import SAMPLE_CSV, make_export, penance
+
+
+def test_parse_header_reads_account_and_characters():
+    contents = SAMPLE_CSV.read_bytes()
+    meta = pc.parse_header(contents[:pc.split_export(contents)])
+    assert meta.account == 'John Darktide'
+    assert meta.account_id == '00000000-0000-0000-0000-000000000000'
+    assert meta.account_level == 150
+    assert meta.completion_rate == 86.0
+    assert meta.export_date == '2026-01-26 16:12:01'
+    assert len(meta.characters) == meta.num_characters == 5
+    assert meta.characters[0] == pc.CharacterInfo(1, 'Bonk', 'Ogryn', 30, 103, 6)
+
+
+def test_parse_header_without_true_level():
+    meta = pc.parse_header(b"# All Characters:\n#   2. Zek (Hive Scum) - Level 30\n# Account Level: n/a\n")
+    assert meta.characters == [pc.CharacterInfo(2, 'Zek', 'Hive Scum', 30)]
+    assert meta.account_level is None
+
+
+def test_metadata_round_trips_through_dict():
+    meta = pc.read_metadata(SAMPLE_CSV.read_bytes())
+    assert pc.ExportMetadata.from_dict(meta.to_dict()) == meta
+
+
+def test_export_key_prefers_filename_then_header():
+    filename, contents = make_export([penance('a')], account_id='acct-9', stamp='20260102_030405')
+    meta = pc.read_metadata(contents)
+    assert pc.export_key(meta, filename) == pc.ExportKey('acct-9', '20260102_030405')
+    assert pc.export_key(meta, 'renamed.csv') == pc.ExportKey('acct-9', '20260102_030405')
+    assert pc.export_key(pc.ExportMetadata(), 'renamed.csv') is None
+    assert pc.parse_export_filename('acct-9_20260102_030405.csv').timestamp == pd.Timestamp('2026-01-02 03:04:05')
+
+
+def test_export_key_rejects_unsafe_account_ids():
+    _, contents = make_export([penance('a')], account_id='../../etc', stamp='20260102_030405')
+    assert pc.export_key(pc.read_metadata(contents), 'renamed.csv') is None
+    assert pc.parse_export_filename('a.b_20260102_030405.csv') is None
+    with pytest.raises(ValueError, match='invalid account ID'):
+        pc.check_account_id('..')
+
+
+def test_read_export_types_columns():
+    _, contents = make_export([penance('a', Progress=5), penance('b', Status='Completed', Progress=10)])
+    meta, df = pc.read_export(contents)
+    assert meta.account_id == 'acct-1'
+    assert list(df['Achievement_ID']) == ['a', 'b']
+    assert list(df['Progress_Percentage']) == [0.5, 1.0]
+    assert df['Completion_Time'].iloc[1] == pd.Timestamp('2026-01-01 10:00:00')
+    assert isinstance(df['Status'].dtype, pd.CategoricalDtype)
+
+
+def test_read_export_rejects_other_csvs():
+    with pytest.raises(ValueError, match='missing columns'):
+        pc.read_export(b"a,b\n1,2\n")
+
+
+def test_export_file_parses_lazily():
+    filename, contents = make_export([penance('a'), penance('b')], account_id='acct-2', stamp='20260102_030405')
+    export = pc.ExportFile(filename, contents)
+    assert export.key == pc.ExportKey('acct-2', '20260102_030405')
+    assert not export.parsed
+    assert export.table.equals(pc.read_export_table(contents)[1])
+    assert export.parsed
+    assert pc.export_file((filename, contents)).key == export.key
+    assert pc.export_file(export) is export
@@ -0,0 +1,28 @@
+import numpy as np
+import pandas as pd
+
+import penance_core as pc
+
+
+def _frame():
+    return pd.DataFrame({
+        'Title': list('abcde'),
+        'Status': pd.Categorical(['Completed', 'In Progress', 'Completed', 'In Progress', 'Completed']),
+        'Penance_Category': ['Classes', 'Classes', 'Weapons', 'Weapons', 'Classes'],
+        'Penance_Class': ['Ogryn', 'Zealot', 'General', 'General', 'Ogryn'],
+    })
+
+
+def test_mask_matches_boolean_filtering():
+    df = _frame()
+    index = pc.FilterIndex(df)
+    expected = (df['Status'] == 'Completed') & (df['Penance_Category'] == 'Classes')
+    assert (index.mask(Status='Completed', Penance_Category='Classes', Penance_Class='All') == expected.to_numpy()).all()
+    assert not index.mask(Penance_Class='Psyker').any()
+
+
+def test_counts_and_select():
+    index = pc.FilterIndex(_frame())
+    assert index.counts('Penance_Class', Status='Completed') == {'Ogryn': 2, 'Zealot': 0, 'General': 1}
+    picked = index.select(['Title'], order=np.array([4, 1, 0]), Penance_Category='Classes', Status='Completed')
+    assert list(picked['Title']) == ['e', 'a']
@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+
+import penance_core as pc
+
+from .exports import make_export, penance
+
+
+def _rows(*rows):
+    return pd.DataFrame(rows, columns=['Achievement_ID', 'Status', 'Progress', 'Goal'])
+
+
+def test_rate_and_eta():
+    old = _rows(('a', 'In Progress', 2, 10), ('b', 'In Progress', 5, 10), ('c', 'In Progress', 1, 10))
+    new = _rows(('a', 'In Progress', 6, 10), ('b', 'In Progress', 5, 10), ('c', 'Completed', 10, 10), ('d', 'In Progress', 3, 10))
+    eta = pc.forecast_eta(old, new, '2026-01-01', '2026-01-03')
+    assert list(eta.columns) == pc.ETA_COLUMNS and list(eta.index) == ['a', 'b', 'd']
+    assert eta.loc['a', 'Rate_Per_Day'] == 2 and eta.loc['a', 'ETA_Days'] == 2
+    assert eta.loc['a', 'ETA'] == pd.Timestamp('2026-01-05')
+    # No progress, or no previous row: no ETA
+    assert np.isnan(eta.loc['b', 'ETA_Days']) and pd.isna(eta.loc['b', 'ETA'])
+    assert np.isnan(eta.loc['d', 'Rate_Per_Day'])
+
+
+def test_distant_eta_is_left_out():
+    eta = pc.forecast_eta(_rows(('a', 'In Progress', 0, 10**9)), _rows(('a', 'In Progress', 1, 10**9)),
+                          '2026-01-01', '2026-01-02')
+    assert eta.loc['a', 'ETA_Days'] > pc.forecast.MAX_ETA_DAYS and pd.isna(eta.loc['a', 'ETA'])
+
+
+def _ingest(store, stamp, progress):
+    name, contents = make_export([penance('a', Progress=progress)], stamp=stamp)
+    store.ingest(contents, name)
+
+
+def test_store_forecast_uses_shown_snapshot(tmp_path):
+    store = pc.HistoryStore(tmp_path)
+    _ingest(store, '20260101_000000', 1)
+    _ingest(store, '20260102_000000', 3)
+    _ingest(store, '20260103_000000', 4)
+    assert store.forecast('acct-1').loc['a', 'Rate_Per_Day'] == 1
+    assert store.forecast('acct-1', '20260102_000000').loc['a', 'Rate_Per_Day'] == 2
+    # Not a snapshot (e.g. an export that wasn't ingested), or nothing before it
+    assert store.forecast('acct-1', '20260102_120000').empty
+    assert store.forecast('acct-1', '20260101_000000').empty
@@ -0,0 +1,112 @@
+import pandas as pd
+import pytest
+
+import penance_core as pc
+
+from .exports import make_export, penance
+
+
+def _export(stamp, rows, account_id='acct-1'):
+    return make_export(rows, account_id=account_id, stamp=stamp)
+
+
+def _rows(df):
+    return df[pc.ROW_COLUMNS].sort_values('Achievement_ID').reset_index(drop=True)
+
+
+def test_delta_round_trip(tmp_path):
+    first = _export('20260101_000000', [penance('a', Progress=1), penance('b', Progress=2), penance('c')])
+    second = _export('20260102_000000', [penance('a', Progress=5), penance('b', Progress=2), penance('d')])
+    store = pc.HistoryStore(tmp_path)
+    added, skipped = store.ingest_many([second, first])
+    assert added == [pc.ExportKey('acct-1', s) for s in ('20260101_000000', '20260102_000000')]
+    assert skipped == []
+
+    snapshots = store.snapshots('acct-1')
+    assert list(snapshots['rows']) == [3, 3]
+    # a changed, d is new, c was dropped
+    assert list(snapshots['changed']) == [3, 2]
+    assert list(snapshots['deleted']) == [0, 1]
+
+    # A fresh store replays the deltas from disk
+    reopened = pc.HistoryStore(tmp_path)
+    for stamp, (_, contents) in (('20260101_000000', first), ('20260102_000000', second)):
+        expected = pc.read_export(contents)[1]
+        pd.testing.assert_frame_equal(_rows(reopened.load('acct-1', stamp)), _rows(expected),
+                                      check_categorical=False, check_dtype=False)
+
+
+def test_duplicates_are_skipped(tmp_path):
+    export = _export('20260101_000000', [penance('a')])
+    store = pc.HistoryStore(tmp_path)
+    assert store.ingest(export[1], export[0]) is not None
+    assert store.ingest(export[1], export[0]) is None
+    assert store.ingest(export[1], 'renamed.csv') is None
+    assert len(store.snapshots('acct-1')) == 1
+
+
+def test_duplicates_are_not_parsed(tmp_path):
+    name, contents = _export('20260101_000000', [penance('a')])
+    store = pc.HistoryStore(tmp_path)
+    store.ingest(contents, name)
+    export = pc.ExportFile(name, contents)
+    assert store.ingest_file(export) is None
+    assert not export.parsed
+
+
+def test_parsed_table_is_reused(tmp_path):
+    name, contents = _export('20260101_000000', [penance('a')])
+    export = pc.ExportFile(name, contents)
+    table = export.table
+    pc.HistoryStore(tmp_path).ingest_file(export)
+    pc.RarityIndex(tmp_path / 'rarity').update([export])
+    assert pc.leaderboard_table([export]).num_rows == 1
+    assert export.table is table
+
+
+def test_older_export_is_rejected(tmp_path):
+    store = pc.HistoryStore(tmp_path)
+    newer = _export('20260301_000000', [penance('a')])
+    older = _export('20250101_000000', [penance('a')])
+    store.ingest(newer[1], newer[0])
+    with pytest.raises(ValueError, match='older than the latest snapshot'):
+        store.ingest(older[1], older[0])
+
+
+def test_older_export_does_not_abort_batch(tmp_path):
+    store = pc.HistoryStore(tmp_path)
+    store.ingest(*reversed(_export('20260201_000000', [penance('a')])))
+    older = _export('20250101_000000', [penance('a')])
+    newer = _export('20260301_000000', [penance('a', Progress=3)])
+    added, skipped = store.ingest_many([older, newer])
+    assert added == [pc.ExportKey('acct-1', '20260301_000000')]
+    assert [name for name, _ in skipped] == [older[0]]
+    assert 'older than the latest snapshot' in skipped[0][1]
+
+
+def test_unsafe_account_id_is_rejected(tmp_path):
+    store = pc.HistoryStore(tmp_path / 'store')
+    contents = make_export([penance('a')], account_id='../../outside')[1]
+    with pytest.raises(ValueError, match='cannot identify'):
+        store.ingest(contents, 'renamed.csv')
+    assert store.snapshots('../outside').empty
+    with pytest.raises(KeyError, match='no snapshots'):
+        store.load('../outside')
+    assert not (tmp_path / 'outside').exists() and not (tmp_path / 'store').exists()
+
+
+def test_load_without_delta_files(tmp_path):
+    store = pc.HistoryStore(tmp_path)
+    name, contents = _export('20260101_000000', [])
+    store.ingest(contents, name)
+    rows = pc.HistoryStore(tmp_path).load('acct-1')
+    assert rows.empty and list(rows.columns) == pc.ROW_COLUMNS
+
+
+def test_export_columns_are_restored(tmp_path):
+    store = pc.HistoryStore(tmp_path)
+    name, contents = _export('20260101_000000', [penance('a')])
+    store.ingest(contents, name)
+    rows = pc.HistoryStore(tmp_path).load('acct-1')
+    assert rows['Export_Account'].iloc[0] == 'Tester'
+    assert store.metadata('acct-1').account_id == 'acct-1'
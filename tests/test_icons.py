@@ -0,0 +1,36 @@
+import penance_core as pc
+
+INDEX = {
+    'cell': 64,
+    'sheets': [{'avif': 'achievements_00.avif', 'webp': 'achievements_00.webp', 'width': 128, 'height': 64}],
+    'icons': {pc.FALLBACK_ICON: [0, 0, 0], 'achievement_icon_0042': [0, 1, 0]},
+}
+
+
+def test_icon_name_is_last_path_segment():
+    assert pc.icon_name('content/ui/textures/icons/achievements/achievement_icon_0042') == 'achievement_icon_0042'
+    assert pc.icon_name(None) == '' and pc.icon_name('') == ''
+
+
+def test_without_index_icons_are_lazy_images():
+    atlas = pc.IconAtlas('public/')
+    markup = atlas.html('content/ui/achievement_icon_0042', size=32, title='"Quoted" <title>')
+    assert 'src="public/icons/achievements/achievement_icon_0042.png"' in markup
+    assert 'loading="lazy"' in markup and 'width="32"' in markup
+    assert 'alt="&quot;Quoted&quot; &lt;title&gt;"' in markup
+    assert f"public/icons/achievements/{pc.FALLBACK_ICON}.png" in markup  # onerror fallback
+    assert 'achievement_icon_0042' not in atlas
+
+
+def test_with_index_icons_are_sprites():
+    atlas = pc.IconAtlas('public', INDEX)
+    assert 'content/ui/achievement_icon_0042' in atlas
+    markup = atlas.html('content/ui/achievement_icon_0042', size=32)
+    assert markup.startswith('<div role="img"')
+    assert "public/icons/atlas/achievements_00.avif" in markup
+    assert 'background-size: 64px 32px' in markup and 'background-position: -32px -0px' in markup
+
+
+def test_unknown_icon_uses_fallback_cell():
+    markup = pc.IconAtlas('public', INDEX).html('content/ui/missing', size=64)
+    assert 'background-position: -0px -0px' in markup
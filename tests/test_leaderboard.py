@@ -0,0 +1,44 @@
+import penance_core as pc
+
+from .exports import make_export, penance
+
+
+def _done(aid):
+    return penance(aid, Status='Completed', Progress=10)
+
+
+def test_accounts_are_grouped_by_id_under_their_latest_name():
+    exports = [
+        make_export([_done('a'), penance('b')], account_id='acct-1', account='Same', stamp='20260101_000000'),
+        make_export([_done('a'), _done('b')], account_id='acct-1', account='Renamed', stamp='20260201_000000'),
+        make_export([penance('a'), penance('b')], account_id='acct-2', account='Same'),
+        make_export([_done('a'), penance('b')], account_id='acct-3', account='Same'),
+    ]
+    table = pc.leaderboard_table(exports)
+    assert table.num_rows == 6
+
+    board = pc.leaderboard(table)
+    assert list(board['Account ID']) == ['acct-1', 'acct-3', 'acct-2']
+    assert list(board['Account']) == ['Renamed', 'Same', 'Same']
+    assert list(board['Completed']) == [2, 1, 0]
+    assert list(board['Rank']) == [1, 2, 3]
+
+
+def test_penance_rarity_counts_accounts_by_id():
+    exports = [
+        make_export([_done('a'), penance('b')], account_id='acct-1', account='Same'),
+        make_export([penance('a'), penance('b')], account_id='acct-2', account='Same'),
+    ]
+    rarity = pc.penance_rarity(pc.leaderboard_table(exports)).set_index('Achievement_ID')
+    assert rarity.loc['a', 'Rarity'] == 0.5 and rarity.loc['b', 'Rarity'] == 0
+
+
+def test_empty_table():
+    table = pc.leaderboard_table([])
+    assert table.num_rows == 0 and 'Account_ID' in table.column_names
+
+
+def test_unreadable_export_is_left_out():
+    bad = ('acct-2_20260101_000000.csv', b"# Darktide Penance Export\n\nnot,the,columns\n1,2,3\n")
+    table = pc.leaderboard_table([make_export([_done('a')], account_id='acct-1'), bad])
+    assert table.column('Account_ID').unique().to_pylist() == ['acct-1']
@@ -0,0 +1,33 @@
+import penance_core as pc
+
+from .exports import make_export, penance
+
+
+def _index(rows):
+    return pc.PenanceIndex(pc.read_export(make_export(rows)[1])[1])
+
+
+def test_lookup_keeps_order_and_reports_unknown_ids():
+    index = _index([penance('a'), penance('b'), penance('c')])
+    rows, missing = index.lookup(['c', 'gone', 'a', 'c'])
+    assert rows['Achievement_ID'].tolist() == ['c', 'a']
+    assert missing == ['gone']
+    assert 'a' in index and 'gone' not in index and len(index) == 3
+
+
+def test_only_unknown_ids():
+    records, missing = _index([penance('a')]).records(['x', 'y'])
+    assert records == [] and missing == ['x', 'y']
+
+
+def test_duplicate_rows_keep_the_first():
+    index = _index([penance('a', Title='first'), penance('a', Title='second')])
+    assert len(index) == 1
+    assert index.records(['a'])[0][0]['Title'] == 'first'
+
+
+def test_weakest_sub_stat_is_cached():
+    index = _index([penance('multi', Stats_Detail='kills: 3/10; wins: 5/5'), penance('plain')])
+    weakest = index.weakest
+    assert weakest.loc['multi', 'Weakest_Stat'] == 'kills' and 'plain' not in weakest.index
+    assert index.weakest is weakest
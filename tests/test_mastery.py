@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+
+import penance_core as pc
+
+from .exports import make_export, penance
+
+
+def _weapon(pattern, level, xp, next_xp, percent):
+    return penance(f'mastery_complete_{pattern}', Title=f'{pattern.title()} Mastery', Category=pc.mastery.MASTERY_CATEGORY,
+                   Mastery_Level=level, Mastery_XP=xp, Mastery_XP_Next_Level=next_xp, Mastery_Progress_Percent=percent)
+
+
+def _table(rows):
+    return pc.mastery_table(pc.read_export(make_export(rows)[1])[1])
+
+
+def test_mastery_table():
+    table = _table([
+        _weapon('axe_p1', 5, 30000, 40000, 50),
+        _weapon('sword_p1', pc.MASTERY_MAX_LEVEL, 300000, 300000, 100),
+        _weapon('gun_p1', 5, 38000, 40000, 80),
+        penance('not_a_weapon'),
+    ])
+    assert list(table.columns) == pc.MASTERY_COLUMNS
+    # Highest level first, then furthest into the level
+    assert table.index.tolist() == ['sword_p1', 'gun_p1', 'axe_p1']
+    assert table.loc['axe_p1', 'Weapon'] == 'Axe_P1'
+    assert table.loc['axe_p1', 'XP_To_Next'] == 10000 and table.loc['axe_p1', 'Levels_To_Max'] == 15
+    assert table.loc['sword_p1', 'XP_To_Next'] == 0 and table.loc['sword_p1', 'Level_Progress'] == 1.0
+
+
+def test_mastery_rates():
+    old = _table([_weapon('axe_p1', 5, 30000, 40000, 50), _weapon('gun_p1', 5, 38000, 40000, 80)])
+    new = _table([_weapon('axe_p1', 5, 34000, 40000, 70), _weapon('gun_p1', 5, 38000, 40000, 80),
+                  _weapon('new_p1', 1, 100, 5850, 2)])
+    rates = pc.mastery_rates(old, new, '2026-01-01', '2026-01-03')
+    assert list(rates.columns) == pc.MASTERY_COLUMNS + pc.RATE_COLUMNS
+    assert rates.loc['axe_p1', 'XP_Per_Day'] == 2000 and rates.loc['axe_p1', 'Days_To_Next'] == 3
+    # No XP gained, or not in the older snapshot: no estimate
+    assert rates.loc['gun_p1', 'XP_Per_Day'] == 0 and np.isnan(rates.loc['gun_p1', 'Days_To_Next'])
+    assert np.isnan(rates.loc['new_p1', 'XP_Per_Day'])
+
+
+def test_rates_without_elapsed_time():
+    table = _table([_weapon('axe_p1', 5, 30000, 40000, 50)])
+    rates = pc.mastery_rates(table, table, '2026-01-01', pd.NaT)
+    assert rates['XP_Per_Day'].isna().all()
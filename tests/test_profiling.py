@@ -0,0 +1,43 @@
+import json
+
+import pytest
+
+import penance_core as pc
+
+
+def test_cell_records_rows_and_time(tmp_path):
+    profiler = pc.CellProfiler(True, tmp_path / 'profile.json')
+    with profiler.cell('load') as run:
+        data = list(range(10000))
+        run.rows = len(data)
+    assert run.run.cell == 'load' and run.run.rows == 10000
+    assert run.run.peak_bytes > 0
+    summary = profiler.summary()
+    assert summary.loc['load', 'Runs'] == 1
+    assert json.loads((tmp_path / 'profile.json').read_text())['runs'][0]['cell'] == 'load'
+
+
+def test_cell_is_recorded_when_the_body_raises():
+    profiler = pc.CellProfiler(True)
+    with pytest.raises(RuntimeError):
+        with profiler.cell('chart') as run:
+            raise RuntimeError('stopped')
+    assert run.run is not None and run.run.rows is None
+    assert list(profiler.records()['cell']) == ['chart']
+
+
+def test_disabled_profiler_records_nothing():
+    profiler = pc.CellProfiler(False)
+    with profiler.cell('load') as run:
+        run.rows = 1
+    assert run.run is None and profiler.records().empty
+
+
+def test_from_env(monkeypatch):
+    monkeypatch.delenv('PENANCE_HUNTER_PROFILE', raising=False)
+    assert not pc.CellProfiler.from_env().enabled
+    assert pc.CellProfiler.from_env('').enabled
+    assert not pc.CellProfiler.from_env('0').enabled
+    monkeypatch.setenv('PENANCE_HUNTER_PROFILE', '/tmp/profile.json')
+    profiler = pc.CellProfiler.from_env()
+    assert profiler.enabled and str(profiler.path) == '/tmp/profile.json'
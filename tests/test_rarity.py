@@ -0,0 +1,90 @@
+import numpy as np
+import pandas as pd
+
+import penance_core as pc
+
+from .exports import make_export, penance
+
+
+def _done(aid, when='2026-01-01 10:00:00'):
+    return penance(aid, Status='Completed', Progress=10, Completion_Time=when)
+
+
+def test_counters_across_accounts(tmp_path):
+    index = pc.RarityIndex(tmp_path)
+    used, skipped = index.update([
+        make_export([_done('a'), penance('b')], account_id='acct-1'),
+        make_export([_done('a'), _done('b')], account_id='acct-2'),
+    ])
+    assert used == 2 and skipped == []
+    frame = index.frame()
+    assert frame.loc['a', 'Accounts'] == 2 and frame.loc['a', 'Completed'] == 2
+    assert frame.loc['b', 'Completed'] == 1
+    assert frame.loc['a', 'Rarity'] == 100.0 and frame.loc['b', 'Rarity'] == 50.0
+
+
+def test_newer_export_replaces_contribution(tmp_path):
+    index = pc.RarityIndex(tmp_path)
+    index.update([make_export([_done('a'), penance('b')], stamp='20260101_000000')])
+    assert index.update([make_export([_done('a'), penance('b')], stamp='20250101_000000')]) == (0, [])
+    index.update([make_export([_done('a'), _done('b')], stamp='20260201_000000')])
+    frame = pc.RarityIndex(tmp_path).frame()
+    assert frame.loc['b', 'Completed'] == 1
+    assert frame['Accounts'].tolist() == [1, 1]
+
+
+def test_median_days(tmp_path):
+    index = pc.RarityIndex(tmp_path)
+    # Time-to-complete counts from each account's first completion
+    index.update([
+        make_export([_done('first', '2026-01-01 00:00:00'), _done('x', '2026-01-11 00:00:00')], account_id='acct-1'),
+        make_export([_done('first', '2026-01-01 00:00:00'), _done('x', '2026-01-11 00:00:00')], account_id='acct-2'),
+    ])
+    median = index.frame().loc['x', 'Median_Days']
+    assert np.isclose(median, 10, rtol=0.1)
+
+
+def test_remove_drops_account_contribution(tmp_path):
+    index = pc.RarityIndex(tmp_path)
+    index.update([
+        make_export([_done('a'), penance('b')], account_id='acct-1'),
+        make_export([_done('a'), _done('b')], account_id='acct-2'),
+    ])
+    assert index.remove('acct-2')
+    assert not index.remove('acct-2')
+    frame = pc.RarityIndex(tmp_path).frame()
+    assert frame.loc['b', 'Completed'] == 0
+    assert frame.loc['a', 'Rarity'] == 100.0 and list(frame['Accounts']) == [1, 1]
+
+
+def test_bad_export_is_skipped_and_rest_saved(tmp_path):
+    index = pc.RarityIndex(tmp_path)
+    index.update([make_export([_done('a')], account_id='acct-1', stamp='20260101_000000')])
+    bad = ('acct-1_20260201_000000.csv', b"# Darktide Penance Export\n\nnot,the,columns\n1,2,3\n")
+    used, skipped = index.update([bad, make_export([penance('a'), penance('c')], account_id='acct-2')])
+    assert used == 1 and [name for name, _ in skipped] == [bad[0]]
+    reloaded = pc.RarityIndex(tmp_path)
+    assert reloaded.accounts == {'acct-1': '20260101_000000', 'acct-2': '20260101_120000'}
+    assert reloaded.frame().loc['a', 'Completed'] == 1 and reloaded.frame().loc['c', 'Accounts'] == 1
+
+
+def test_failed_write_rolls_back(tmp_path, monkeypatch):
+    index = pc.RarityIndex(tmp_path)
+    index.update([make_export([_done('a')], account_id='acct-1', stamp='20260101_000000')])
+    before = index.frame()
+
+    def fail(src, dst):
+        raise OSError("disk full")
+    monkeypatch.setattr(pc.rarity.os, 'replace', fail)
+    used, skipped = index.update([make_export([penance('a'), _done('new')], account_id='acct-1', stamp='20260201_000000')])
+    assert used == 0 and skipped[0][1] == "disk full"
+    pd.testing.assert_frame_equal(index.frame(), before)
+    assert index.accounts == {'acct-1': '20260101_000000'}
+
+
+def test_unsafe_account_id_is_skipped(tmp_path):
+    index = pc.RarityIndex(tmp_path / 'rarity')
+    contents = make_export([_done('a')], account_id='../../outside')[1]
+    used, skipped = index.update([('renamed.csv', contents)])
+    assert used == 0 and 'cannot identify' in skipped[0][1]
+    assert not (tmp_path / 'outside.parquet').exists()
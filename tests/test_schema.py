@@ -0,0 +1,25 @@
+import pyarrow as pa
+
+import penance_core as pc
+from penance_core.schema import _parse_percentage
+
+from .exports import make_export, penance
+
+
+def test_parse_percentage():
+    column = pa.chunked_array([['50%', '200%', '', None, '0%', '12.5']])
+    assert _parse_percentage(column).to_pylist() == [0.5, 2.0, None, None, 0.0, 0.125]
+
+
+def test_older_exports_get_null_mastery_columns():
+    columns = [c for c in pc.CSV_COLUMNS if not c.startswith('Mastery_')]
+    _, contents = make_export([penance('a')], columns=columns)
+    _, table = pc.read_export_table(contents)
+    assert table.schema == pc.EXPORT_SCHEMA
+    assert table.column('Mastery_Level').null_count == 1
+
+
+def test_multiline_descriptions():
+    _, contents = make_export([penance('a', Description='line one\nline two'), penance('b')])
+    _, table = pc.read_export_table(contents)
+    assert table.column('Description').to_pylist() == ['line one\nline two', 'Do the thing.']
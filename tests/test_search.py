@@ -0,0 +1,31 @@
+import pandas as pd
+
+import penance_core as pc
+
+
+def _frame():
+    return pd.DataFrame({
+        'Title': ['Volley Fire Master', 'Grenadier', 'Long Bomb'],
+        'Achievement_ID': ['veteran_volley_fire', 'veteran_grenade_kills', 'veteran_unbounced_grenade_kills'],
+        'Description': ['Kill enemies', 'Throw a grenade at a volley of enemies', 'Hit enemies with a grenade'],
+    })
+
+
+def test_tokenize():
+    assert pc.tokenize('Volley_Fire: 10x!') == ['volley', 'fire', '10x']
+
+
+def test_title_hits_rank_first():
+    index = pc.SearchIndex(_frame())
+    assert list(index.search('volley')) == [0, 1]
+
+
+def test_prefix_and_and_semantics():
+    index = pc.SearchIndex(_frame())
+    assert set(index.search('gren')) == {1, 2}
+    assert list(index.search('grenade long')) == [2]
+    assert list(index.search('nothing')) == []
+
+
+def test_empty_query_returns_every_row():
+    assert list(pc.SearchIndex(_frame()).search('  ')) == [0, 1, 2]
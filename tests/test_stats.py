@@ -0,0 +1,38 @@
+import penance_core as pc
+
+from .exports import make_export, penance
+
+
+def _stats(rows):
+    return pc.stats_table(pc.read_export(make_export(rows)[1])[1])
+
+
+def test_stats_table_explodes_stats_detail():
+    stats = _stats([
+        penance('multi', Stats_Detail='Kill: Poxwalkers: 30/50; wins: 2/2'),
+        penance('plain'),
+        penance('negative', Stats_Detail='balance: -3/10'),
+    ])
+    assert list(stats.columns) == pc.STATS_COLUMNS
+    assert stats.values.tolist() == [
+        ['multi', 'Kill: Poxwalkers', 30, 50],
+        ['multi', 'wins', 2, 2],
+        ['negative', 'balance', -3, 10],
+    ]
+
+
+def test_stats_table_without_any_detail():
+    stats = _stats([penance('plain')])
+    assert stats.empty and list(stats.columns) == pc.STATS_COLUMNS
+
+
+def test_weakest_stats():
+    weakest = pc.weakest_stats(_stats([
+        penance('multi', Stats_Detail='a: 9/10; b: 1/4; c: 5/5'),
+        penance('done', Stats_Detail='a: 12/10; b: 0/0'),
+    ]))
+    assert list(weakest.columns) == pc.WEAKEST_COLUMNS
+    assert weakest.loc['multi', 'Weakest_Stat'] == 'b' and weakest.loc['multi', 'Weakest_Progress'] == 0.25
+    assert weakest.loc['multi', ['Stats_Done', 'Stats_Total']].tolist() == [1, 3]
+    # Overshooting and zero targets both count as done
+    assert weakest.loc['done', 'Weakest_Progress'] == 1.0 and weakest.loc['done', 'Stats_Done'] == 2
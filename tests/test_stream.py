@@ -0,0 +1,64 @@
+import io
+
+import pyarrow as pa
+
+import penance_core as pc
+
+from .exports import make_export, penance
+
+
+def _concatenated():
+    first = make_export([penance('a'), penance('b')], account_id='acct-1', stamp='20260101_000000')
+    second = make_export([penance('c')], account_id='acct-2', stamp='20260102_000000')
+    return first, second, first[1] + b'\n' + second[1]
+
+
+def test_export_parts_splits_concatenated_files():
+    first, second, contents = _concatenated()
+    parts = pc.export_parts(contents, 'both.csv')
+    assert [name for name, _ in parts] == ['both.csv', second[0]]
+    assert parts[1][1] == second[1]
+    assert pc.export_parts(first[1], first[0]) == [first]
+
+
+def test_iter_exports_streams_each_export():
+    first, second, contents = _concatenated()
+    seen = []
+    for part in pc.iter_exports(io.BytesIO(contents), block_size=1024):
+        table = pa.Table.from_batches(list(part.batches))
+        seen.append((part.key(), table.column('Achievement_ID').to_pylist()))
+    assert seen == [
+        (pc.ExportKey('acct-1', '20260101_000000'), ['a', 'b']),
+        (pc.ExportKey('acct-2', '20260102_000000'), ['c']),
+    ]
+
+
+def test_part_digest_matches_file_digest(tmp_path):
+    first, second, contents = _concatenated()
+    store = pc.HistoryStore(tmp_path)
+    assert len(store.ingest_stream(io.BytesIO(contents))) == 2
+    # The same exports uploaded as single files are duplicates
+    assert store.ingest_many([first, second]) == ([], [])
+
+
+def test_hash_lines_inside_quoted_descriptions_stay_in_the_body(tmp_path):
+    description = 'Kill 10 enemies.\n# not a header, "quoted" text\n#2 neither'
+    first = make_export([penance('a', Description=description), penance('b')], account_id='acct-1',
+                        stamp='20260101_000000')
+    second = make_export([penance('c', Description=description)], account_id='acct-2', stamp='20260102_000000')
+    contents = first[1] + second[1]
+
+    parts = pc.export_parts(contents, first[0])
+    assert [part for _, part in parts] == [first[1], second[1]]
+    assert pc.read_export_table(parts[0][1])[1].column('Description').to_pylist()[0] == description
+
+    for block_size in (1024, 4096, 1 << 20):
+        seen = []
+        for part in pc.iter_exports(io.BytesIO(contents), block_size=block_size):
+            table = pa.Table.from_batches(list(part.batches))
+            seen.append((part.key(first[0]), table.column('Description').to_pylist()))
+        assert seen == [
+            (pc.ExportKey('acct-1', '20260101_000000'), [description, 'Do the thing.']),
+            (pc.ExportKey('acct-2', '20260102_000000'), [description]),
+        ]
+    assert len(pc.HistoryStore(tmp_path).ingest_stream(io.BytesIO(contents), first[0])) == 2
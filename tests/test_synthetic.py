@@ -0,0 +1,27 @@
+from datetime import timedelta
+
+import pandas as pd
+
+import penance_core as pc
+from benchmarks.synthetic import generate, scaled_export
+
+
+def test_scaled_export_round_trips():
+    filename, contents = scaled_export(1500, account=3, stamp='20260102_030405')
+    meta, df = pc.read_export(contents)
+    assert len(df) == 1500 and list(df.columns[:len(pc.CSV_COLUMNS)]) == list(pc.CSV_COLUMNS)
+    assert df['Achievement_ID'].is_unique
+    assert meta.total_penances == 1500 and len(meta.characters) == 5
+    assert pc.export_key(meta, filename) == pc.ExportKey(meta.account_id, '20260102_030405')
+    # The header's export date is the filename timestamp minus the exporter's lag
+    assert pd.Timestamp(meta.export_date) < pc.parse_export_filename(filename).timestamp
+    assert (df['Category'] == pc.mastery.MASTERY_CATEGORY).any()
+
+
+def test_generated_exports_are_monotonic_snapshots(tmp_path):
+    paths = list(generate(tmp_path, accounts=1, penances=300, exports=3, cadence=timedelta(days=30)))
+    assert all(pc.parse_export_filename(p.name) for p in paths)
+    frames = [pc.read_export(p.read_bytes())[1].set_index('Achievement_ID') for p in sorted(paths)]
+    for old, new in zip(frames, frames[1:]):
+        assert (new['Progress'] >= old['Progress'].reindex(new.index)).all()
+        assert (new['Status'] == 'Completed').sum() >= (old['Status'] == 'Completed').sum()
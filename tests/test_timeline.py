@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+
+import penance_core as pc
+
+
+def test_lttb_keeps_endpoints_and_threshold():
+    x = np.arange(1000, dtype=float)
+    y = np.sin(x / 50)
+    picked = pc.lttb(x, y, 100)
+    assert len(picked) == 100
+    assert picked[0] == 0 and picked[-1] == 999
+    assert (np.diff(picked) > 0).all()
+
+
+def test_lttb_keeps_spikes():
+    x = np.arange(500, dtype=float)
+    y = np.zeros(500)
+    y[250] = 100
+    assert 250 in pc.lttb(x, y, 20)
+
+
+def test_lttb_small_inputs_pass_through():
+    x = np.arange(10, dtype=float)
+    assert list(pc.lttb(x, x, 50)) == list(range(10))
+    assert list(pc.lttb(x, x, 2)) == list(range(10))
+
+
+def _completed():
+    times = pd.to_datetime(['2026-01-01', '2026-01-03', '2026-01-02', '2026-01-05', '2026-01-04'])
+    return pd.DataFrame({
+        'Penance_Class': pd.Categorical(['Ogryn', 'Ogryn', 'Psyker', 'Ogryn', 'Psyker']),
+        'Completion_Time': times,
+        'Title': list('abcde'),
+        'Score': [1] * 5,
+    })
+
+
+def test_window_rebases_counts():
+    timeline = pc.Timeline(_completed())
+    window, last = timeline.window(start='2026-01-02', end='2026-01-05')
+    ogryn = window[window['Penance_Class'] == 'Ogryn']
+    assert list(ogryn['Title']) == ['b', 'd']
+    assert list(ogryn[pc.COUNT_COLUMN]) == [1, 2]
+    assert set(last['Title']) == {'d', 'e'}
+
+
+def test_chart_points_within_budget():
+    n = 5000
+    df = pd.DataFrame({
+        'Penance_Class': pd.Categorical(['Ogryn'] * n),
+        'Completion_Time': pd.date_range('2026-01-01', periods=n, freq='h'),
+        'Title': ['t'] * n,
+        'Score': [1] * n,
+    })
+    window, _ = pc.Timeline(df).window()
+    points = pc.chart_points(window, max_points=300)
+    assert len(points) <= 300
+    assert points[pc.COUNT_COLUMN].iloc[0] == 1 and points[pc.COUNT_COLUMN].iloc[-1] == n
@@ -0,0 +1,40 @@
+import numpy as np
+import pandas as pd
+
+import penance_core as pc
+
+
+def _frame(n=100):
+    return pd.DataFrame({
+        'Title': [f't{i}' for i in range(n)],
+        'Status': pd.Categorical(np.where(np.arange(n) % 3, 'In Progress', 'Completed')),
+        'Score': np.arange(n),
+        'PROGRESS_DIFF': np.arange(n)[::-1].astype(float),
+    })
+
+
+def test_view_takes_rows_in_order_with_derived_columns():
+    df = _frame()
+    views = pc.ExportViews(df).add(
+        'table', rows=(df['Status'] == 'Completed').to_numpy(),
+        order=df['PROGRESS_DIFF'].to_numpy().argsort(kind='stable'),
+        derived={'DOUBLE': df['Score'] * 2},
+    )
+    out = views.view('table', columns=['Title', 'DOUBLE'])
+    expected = df[df['Status'] == 'Completed'].sort_values('PROGRESS_DIFF')
+    assert list(out.index) == list(expected.index)
+    assert list(out['DOUBLE']) == list(expected['Score'] * 2)
+
+
+def test_sizes_split_owned_and_shared_bytes():
+    df = _frame()
+    views = pc.ExportViews(df).add('completed', rows=(df['Status'] == 'Completed').to_numpy())
+    completed = views.view('completed', columns=['Title', 'Score'])
+    sizes = views.sizes({'completed': completed, 'projection': df[['Score']]}, canonical=True)
+    assert list(sizes) == [pc.views.CANONICAL, 'completed', 'projection']
+    assert sizes['completed']['Rows'] == 34 and sizes['completed']['Position_Bytes'] == 34 * 4
+    assert sizes['completed']['Owned_Bytes'] > 0
+
+    table = pc.memory_table(sizes, views.sizes({'other': completed}))
+    assert list(table.columns) == pc.VIEW_MEMORY_COLUMNS
+    assert list(table.index) == [pc.views.CANONICAL, 'completed', 'projection', 'other']